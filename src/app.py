@@ -1,30 +1,103 @@
 """
 Main entry point for the Flask application.
 
-This module initializes the Flask app, sets up the database, 
-registers routes, and starts the application.
+This module provides the `create_app` factory, which initializes the Flask app,
+sets up the database and registers routes, and starts the application when run
+as a script. Nothing is initialized at import time, and the machine learning
+stack is only imported by the warm-up or the first prediction.
+
+Unless MODEL_WARMUP=0, the model is loaded and exercised by a warm-up that runs
+in the background after start-up; /readyz reports ready once it finished.
+
+Set APP_STARTUP_PROFILE=1 to print a start-up timing report (per-module import
+cost, database initialization and model load) to standard error. The warm-up
+then runs before the report instead of in the background.
 """
 
-from flask import Flask
-from flask_cors import CORS
-from flask_smorest import Api
-from database.db_setup import init_db
-from routes import register_routes
+import os
+import sys
+from typing import Any, Dict, Optional
+
+from startup_profile import StartupProfile
+
+STARTUP_PROFILE = os.environ.get('APP_STARTUP_PROFILE', '0').lower() in ('1', 'true', 'yes')
+
+
+def create_app(config: Optional[Dict[str, Any]] = None):
+    """
+    Create and initialize the Flask application.
+
+    Every call returns an independent application, with its own database and
+    write-behind writer; the prediction batcher and the shadow scorer hold no
+    application state and are shared by the applications of the process.
+
+    Args:
+        config (Optional[Dict[str, Any]]): Configuration values applied before
+        the initialization, e.g. SQLALCHEMY_DATABASE_URI.
+
+    Returns:
+        Flask: The initialized application.
+    """
+
+    profile = StartupProfile(STARTUP_PROFILE)
+    profile.start()
+    try:
+        with profile.stage('import web stack'):
+            from flask import Flask
+            from flask_cors import CORS
+            from flask_smorest import Api
+            from database.db_setup import init_db
+            from business.passenger_writer import init_passenger_writer
+            from business.passenger_stats import init_passenger_stats, rebuild_stats_command
+            from business.prediction_batcher import init_prediction_batcher
+            from business.shadow_scorer import init_shadow_scorer
+            from business.warmup import init_warmup
+            from business.metrics import init_metrics
+            from routes import register_routes
+
+        with profile.stage('create application'):
+            app = Flask(__name__)
+            CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
+            app.config['API_TITLE'] = 'Titanic Survival Prediction'
+            app.config['API_VERSION'] = '1.0'
+            app.config['OPENAPI_VERSION'] = '3.0.2'
+            app.config['OPENAPI_URL_PREFIX'] = '/api/docs'
+            app.config['OPENAPI_SWAGGER_UI_PATH'] = '/swagger-ui'
+            app.config['OPENAPI_SWAGGER_UI_URL'] = 'https://cdn.jsdelivr.net/npm/swagger-ui-dist/'
+            app.config.update(config or {})
+
+            api = Api(app)
+            init_metrics(app)
+
+        with profile.stage('initialize database'):
+            init_db(app)
+
+        with profile.stage('initialize passenger statistics'):
+            init_passenger_stats(app)
+
+        app.cli.add_command(rebuild_stats_command)
+
+        with profile.stage('start background workers'):
+            init_passenger_writer(app)
+            init_prediction_batcher()
+            init_shadow_scorer()
+
+        with profile.stage('register routes'):
+            register_routes(api)
 
-app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
-app.config['API_TITLE'] = 'Titanic Survival Prediction'
-app.config['API_VERSION'] = '1.0'
-app.config['OPENAPI_VERSION'] = '3.0.2'
-app.config['OPENAPI_URL_PREFIX'] = '/api/docs'
-app.config['OPENAPI_SWAGGER_UI_PATH'] = '/swagger-ui'
-app.config['OPENAPI_SWAGGER_UI_URL'] = 'https://cdn.jsdelivr.net/npm/swagger-ui-dist/'
+        with profile.stage('warm up'):
+            warmup = init_warmup(app, background=not profile.enabled)
+    finally:
+        # Restores the import hook even when a stage fails.
+        profile.stop()
 
-api = Api(app)
+    if profile.enabled:
+        profile.stages.extend((f'warm up: {name}', seconds)
+                              for name, seconds in warmup.steps.items())
+        print(profile.report(), file=sys.stderr)
 
-init_db(app)
+    return app
 
-register_routes(api)
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,289 @@
+"""
+ASGI entry point of the application.
+
+`create_asgi_app` wraps the Flask application built by `create_app` in an ASGI
+application. POST /passenger, the hot path, is handled on the event loop: the
+payload is validated in place, the prediction runs in a pool of
+ASGI_INFERENCE_WORKERS threads and the passenger is written through an asyncio
+database driver (aiosqlite for SQLite). Every other request is passed to the
+Flask application, run in a pool of ASGI_WSGI_THREADS threads, and so are the
+POST /passenger requests the native path does not answer exactly like Flask:
+invalid payloads, cross-origin requests, requests with an Idempotency-Key and
+databases without an asyncio driver.
+
+Usage:
+    uvicorn --app-dir src --factory asgi:create_asgi_app --workers 4
+"""
+
+import asyncio
+import io
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from marshmallow import ValidationError
+
+from app import create_app
+from business.metrics import current_endpoint, stage_metrics
+from business.passenger_business import create_passenger_async
+from business.passenger_writer import WriteQueueFullError, get_passenger_writer
+from database.async_db import create_async_db_engine
+from schemas.passenger_dataclass import PassengerData
+from schemas.passenger_schema import PassengerSchema, PassengerViewSchema
+
+ASGI_INFERENCE_WORKERS = int(os.environ.get('ASGI_INFERENCE_WORKERS', os.cpu_count() or 1))
+ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', 32))
+
+ADD_PASSENGER_ENDPOINT = 'Passenger.add_passenger'
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+Response = Tuple[int, List[Tuple[bytes, bytes]], bytes]
+
+
+class AsgiApp:
+    """
+    ASGI application serving POST /passenger natively and the rest through Flask.
+
+    Args:
+        app (Flask): The Flask application.
+        inference_workers (int): Threads running the predictions.
+        wsgi_threads (int): Threads running the requests passed to Flask.
+    """
+
+    def __init__(self, app, inference_workers: int = ASGI_INFERENCE_WORKERS,
+                 wsgi_threads: int = ASGI_WSGI_THREADS):
+        self.app = app
+        self.inference_executor = ThreadPoolExecutor(inference_workers,
+                                                     thread_name_prefix='inference')
+        self.wsgi_executor = ThreadPoolExecutor(wsgi_threads, thread_name_prefix='wsgi')
+        self.passenger_schema = PassengerSchema()
+        self.passenger_view_schema = PassengerViewSchema()
+        self._engine: Any = _UNSET
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        body = await self._read_body(receive)
+        if body is None:
+            return
+
+        if scope['method'] == 'POST' and scope['path'] == '/passenger':
+            response = await self._add_passenger(scope, body)
+            if response is not None:
+                await self._send_response(send, *response)
+                return
+
+        await self._call_wsgi(scope, body, send)
+
+    @property
+    def engine(self):
+        """
+        Asynchronous engine of the application's database, or None without driver.
+        """
+
+        if self._engine is _UNSET:
+            self._engine = create_async_db_engine(self.app.config['SQLALCHEMY_DATABASE_URI'])
+        return self._engine
+
+    async def close(self):
+        """
+        Dispose of the asynchronous engine and stop the thread pools.
+        """
+
+        if self._engine not in (_UNSET, None):
+            await self._engine.dispose()
+        self._engine = _UNSET
+        self.inference_executor.shutdown(wait=True)
+        self.wsgi_executor.shutdown(wait=True)
+
+    async def _lifespan(self, receive: Callable, send: Callable):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def _read_body(receive: Callable) -> Optional[bytes]:
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                return b''.join(chunks)
+
+    async def _add_passenger(self, scope: Dict[str, Any], body: bytes) -> Optional[Response]:
+        """
+        Handle POST /passenger, or return None to leave the request to Flask.
+        """
+
+        headers = dict(scope['headers'])
+        content_type = headers.get(b'content-type', b'').split(b';')[0].strip()
+        if (b'origin' in headers or b'idempotency-key' in headers
+                or content_type != b'application/json'):
+            return None
+        writer = get_passenger_writer(self.app)
+        if writer is None and self.engine is None:
+            return None
+
+        started = time.perf_counter()
+        token = current_endpoint.set(ADD_PASSENGER_ENDPOINT)
+        try:
+            try:
+                with stage_metrics.stage('validation'):
+                    passenger_data = self.passenger_schema.load(json.loads(body))
+            except (ValueError, ValidationError):
+                return None
+
+            try:
+                passenger = await create_passenger_async(PassengerData(**passenger_data),
+                                                         self.inference_executor, self.engine,
+                                                         writer)
+                response = self._json_response(HTTPStatus.CREATED,
+                                               self.passenger_view_schema.dump(passenger))
+            except WriteQueueFullError as error:
+                response = self._json_response(HTTPStatus.SERVICE_UNAVAILABLE,
+                                               {'message': str(error)})
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to create a passenger.')
+                response = self._json_response(HTTPStatus.INTERNAL_SERVER_ERROR)
+
+            if stage_metrics.enabled:
+                stage_metrics.observe('total', time.perf_counter() - started)
+            return response
+        finally:
+            current_endpoint.reset(token)
+
+    def _json_response(self, status: HTTPStatus, payload: Optional[Dict[str, Any]] = None,
+                       ) -> Response:
+        # Serialized by the application's JSON provider, like Flask responses;
+        # errors take the payload shape of flask-smorest's error handler.
+        if status >= 400:
+            payload = {'code': status.value, 'status': status.phrase, **(payload or {})}
+        response = self.app.json.response(payload)
+        body = response.get_data()
+        return status.value, [(b'content-type', response.mimetype.encode('latin-1')),
+                              (b'content-length', str(len(body)).encode('latin-1'))], body
+
+    @staticmethod
+    async def _send_response(send: Callable, status: int, headers: List[Tuple[bytes, bytes]],
+                             body: bytes):
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _call_wsgi(self, scope: Dict[str, Any], body: bytes, send: Callable):
+        """
+        Run the request through the Flask application in the WSGI thread pool.
+
+        The response is sent chunk by chunk as the application produces it, so
+        streamed responses (such as the passenger export) stay streamed.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        def send_sync(message: Dict[str, Any]):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        await loop.run_in_executor(self.wsgi_executor, self._run_wsgi,
+                                   wsgi_environ(scope, body), send_sync)
+
+    def _run_wsgi(self, environ: Dict[str, Any], send_sync: Callable):
+        response_start: Dict[str, Any] = {}
+
+        def start_response(status: str, headers, exc_info=None):
+            if exc_info is not None and response_start.get('sent'):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response_start.update(status=int(status.split(' ', 1)[0]), headers=[
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers])
+
+        def send_body(chunk: bytes, more_body: bool):
+            if not response_start.get('sent'):
+                send_sync({'type': 'http.response.start', 'status': response_start['status'],
+                           'headers': response_start['headers']})
+                response_start['sent'] = True
+            send_sync({'type': 'http.response.body', 'body': chunk, 'more_body': more_body})
+
+        result = self.app(environ, start_response)
+        try:
+            for chunk in result:
+                if chunk:
+                    send_body(chunk, True)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        send_body(b'', False)
+
+
+def wsgi_environ(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+    """
+    Build the WSGI environment of an ASGI HTTP request (PEP 3333).
+
+    Args:
+        scope (dict): The ASGI connection scope.
+        body (bytes): The complete request body.
+
+    Returns:
+        dict: The WSGI environment.
+    """
+
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'], environ['REMOTE_PORT'] = scope['client'][0], str(scope['client'][1])
+
+    for name, value in scope['headers']:
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_LENGTH':
+            continue
+        key = name if name == 'CONTENT_TYPE' else f'HTTP_{name}'
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+def create_asgi_app(config: Optional[Dict[str, Any]] = None) -> AsgiApp:
+    """
+    Create the Flask application and wrap it in the ASGI application.
+
+    Args:
+        config (Optional[Dict[str, Any]]): Configuration values passed to `create_app`.
+
+    Returns:
+        AsgiApp: The ASGI application.
+    """
+
+    return AsgiApp(create_app(config))
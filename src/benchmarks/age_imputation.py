@@ -0,0 +1,97 @@
+"""
+Benchmark for the age imputation step of the preprocessor.
+
+Compares the vectorized `PreProcessor.impute_age` with the original row-wise
+`df.apply` implementation on samples of `data/train.csv` of increasing size.
+
+Usage (from the `src` directory):
+    python -m benchmarks.age_imputation [--sizes 1 1000 1000000]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from ml.preprocessor import PreProcessor
+from ml.registry import model_registry
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'data', 'train.csv')
+
+
+def row_wise_impute_age(df, pp):
+    """
+    Original row-wise age imputation, kept as the baseline.
+    """
+
+    def fill_age(row):
+        val = pp['age_medians'].get(
+            (row['Sex'], row['Pclass'], row['Title'],
+             row['SibSp'], row['Parch']),
+            np.nan
+        )
+        if pd.isnull(val):
+            val = pp['age_medians_overall'].get(
+                (row['Sex'], row['Pclass']), np.nan)
+        return row['Age'] if not pd.isnull(row['Age']) else val
+
+    return df.apply(fill_age, axis=1)
+
+
+def sample(size: int) -> pd.DataFrame:
+    """
+    Build a DataFrame of `size` rows sampled with replacement from the training data.
+
+    Args:
+        size (int): Number of rows.
+
+    Returns:
+        pd.DataFrame: Sampled rows with the extracted 'Title' column.
+    """
+
+    df = pd.read_csv(DATA_PATH)
+    df = df.sample(n=size, replace=True, random_state=0).reset_index(drop=True)
+    df['Title'] = df['Name'].str.extract(r' ([A-Za-z]+)\.', expand=False)
+    return df
+
+
+def best_of(function, repeat: int) -> float:
+    """
+    Return the best wall-clock time of `repeat` calls to `function`.
+    """
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    """
+    Run the benchmark and print one line per sample size.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 1000, 1000000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    pp = model_registry.get().preprocessor
+    preprocessor = PreProcessor()
+
+    print(f"{'rows':>10} {'row-wise (s)':>14} {'vectorized (s)':>15} {'speedup':>9}")
+    for size in args.sizes:
+        df = sample(size)
+        repeat = 1 if size >= 100000 else args.repeat
+        row_wise = best_of(lambda: row_wise_impute_age(df, pp), repeat)
+        vectorized = best_of(lambda: preprocessor.impute_age(df, pp), repeat)
+        print(f'{size:>10} {row_wise:>14.6f} {vectorized:>15.6f} {row_wise / vectorized:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark for loading the model bundle in worker processes.
+
+Starts several fresh worker processes per bundle format, each loading the bundle
+the way a web worker would, and reports the cold-start time (interpreter start
+to bundle ready) and the per-worker memory: RSS, and PSS, which splits shared
+pages between the processes mapping them. The directory bundle is measured
+twice: as a regular bundle and in lean mode (no scikit-learn or pandas).
+
+Usage (from the `src` directory):
+    python -m benchmarks.bundle_load [--workers 4] [--directory PATH]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PICKLE_PATH = os.path.join(SRC_DIR, 'ml', 'titanic_model_bundle.pkl')
+
+
+def memory_kb() -> dict:
+    """
+    Return the RSS and PSS of the current process, in kB.
+    """
+
+    usage = {}
+    with open('/proc/self/smaps_rollup', encoding='utf-8') as file:
+        for line in file:
+            key, _, value = line.partition(':')
+            if key in ('Rss', 'Pss'):
+                usage[key.lower()] = int(value.split()[0])
+    return usage
+
+
+def child(path: str, started: float):
+    """
+    Load a bundle, report readiness and, once asked to, report its measurements.
+    """
+
+    from ml.registry import ModelRegistry
+
+    bundle = ModelRegistry(path).get()
+    ready = time.time() - started
+
+    print('ready', flush=True)
+    sys.stdin.readline()
+    print(json.dumps({'cold_start': ready, 'load': bundle.load_seconds, **memory_kb()}),
+          flush=True)
+
+
+def run_workers(path: str, workers: int, lean: bool = False) -> list:
+    """
+    Start `workers` processes loading the bundle at `path` and collect their reports.
+    """
+
+    env = {**os.environ, 'TITANIC_LEAN': '1' if lean else '0'}
+    processes = [
+        subprocess.Popen([sys.executable, '-m', 'benchmarks.bundle_load',
+                          '--child', path, '--started', repr(time.time())],
+                         cwd=SRC_DIR, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                         text=True)
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.stdout.readline()
+
+    reports = []
+    for process in processes:
+        process.stdin.write('\n')
+        process.stdin.flush()
+        reports.append(json.loads(process.stdout.readline()))
+        process.stdin.close()
+    for process in processes:
+        process.wait()
+    return reports
+
+
+def main():
+    """
+    Run the benchmark and print one line per bundle format.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--directory', help='directory bundle (converted if missing)')
+    parser.add_argument('--child')
+    parser.add_argument('--started', type=float)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.started)
+        return
+
+    from ml.artifacts import export_bundle
+    from ml.pipeline import Pipeline
+
+    directory = args.directory or tempfile.mkdtemp(prefix='titanic_bundle_')
+    if not os.path.exists(os.path.join(directory, 'manifest.json')):
+        export_bundle(Pipeline().load_pipeline(PICKLE_PATH), directory)
+
+    print(f"{'format':>10} {'cold start (s)':>15} {'load (s)':>9} "
+          f"{'RSS/worker (kB)':>16} {'PSS/worker (kB)':>16}")
+    for name, path, lean in (('pickle', PICKLE_PATH, False), ('directory', directory, False),
+                             ('lean', directory, True)):
+        reports = run_workers(path, args.workers, lean)
+
+        def mean(key, reports=reports):
+            return sum(report[key] for report in reports) / len(reports)
+
+        print(f"{name:>10} {mean('cold_start'):>15.3f} {mean('load'):>9.4f} "
+              f"{mean('rss'):>16.0f} {mean('pss'):>16.0f}")
+
+
+if __name__ == '__main__':
+    main()
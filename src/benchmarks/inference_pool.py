@@ -0,0 +1,53 @@
+"""
+Benchmark for the multi-process inference pool.
+
+Runs client threads that each score passengers one at a time, as concurrent
+POST /passenger requests would, through the in-process `PredictionBatcher` and
+then through `InferencePool`s of increasing size, and reports the throughput
+and latency percentiles of each, with the speed-up over the batcher.
+
+Usage (from the `src` directory):
+    python -m benchmarks.inference_pool [--clients 64] [--seconds 5]
+        [--processes 1 2 4]
+"""
+
+import argparse
+import os
+
+from benchmarks.prediction_batching import load_passengers, run
+from business.inference_pool import InferencePool
+from business.prediction_batcher import PredictionBatcher
+
+
+def main():
+    """
+    Run the benchmark and print one line per pool size.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    passengers = load_passengers()
+    print(f'{os.cpu_count()} CPUs, {args.clients} clients')
+    print(f"{'mode':>12} {'predictions/s':>14} {'p50 (ms)':>9} {'p99 (ms)':>9} {'speed-up':>9}")
+
+    baseline = None
+    for processes in [0] + args.processes:
+        pool = PredictionBatcher() if processes == 0 else InferencePool(processes)
+        pool.start()
+        try:
+            result = run(pool.predict, passengers, args.clients, args.seconds)
+        finally:
+            pool.stop()
+
+        baseline = baseline or result['throughput']
+        name = 'in-process' if processes == 0 else f'{processes} workers'
+        print(f"{name:>12} {result['throughput']:>14.0f} {result['p50']:>9.2f} "
+              f"{result['p99']:>9.2f} {result['throughput'] / baseline:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
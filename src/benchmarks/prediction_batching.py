@@ -0,0 +1,105 @@
+"""
+Benchmark for the micro-batching prediction scheduler.
+
+Runs client threads that each score passengers one at a time, as concurrent
+POST /passenger requests would, first calling the model directly and then
+through the `PredictionBatcher`, and reports the throughput, the latency
+percentiles and the batch-size distribution.
+
+Usage (from the `src` directory):
+    python -m benchmarks.prediction_batching [--clients 32] [--seconds 5]
+        [--max-wait 0.002] [--max-batch-size 64]
+"""
+
+import argparse
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from business.prediction_batcher import PredictionBatcher
+from ml.registry import model_registry
+from schemas.passenger_dataclass import PassengerData
+
+TRAIN_PATH = 'data/train.csv'
+
+
+def load_passengers() -> list:
+    """
+    Read the training passengers as `PassengerData`.
+    """
+
+    dataset = pd.read_csv(TRAIN_PATH).astype(object)
+    dataset = dataset.where(dataset.notna(), None)
+    return [PassengerData(name=row.Name, ticket_class=row.Pclass, sex=row.Sex, age=row.Age,
+                          number_siblings_spouses=row.SibSp,
+                          number_parents_children=row.Parch, ticket=row.Ticket,
+                          fare=row.Fare, cabin=row.Cabin, embarked=row.Embarked)
+            for row in dataset.itertuples()]
+
+
+def run(predict, passengers: list, clients: int, seconds: float) -> dict:
+    """
+    Score passengers from `clients` threads for `seconds` and time every call.
+    """
+
+    bundle = model_registry.get()
+    latencies = [[] for _ in range(clients)]
+    deadline = time.monotonic() + seconds
+
+    def client(position):
+        index = position
+        while time.monotonic() < deadline:
+            features = bundle.feature_builder.build(passengers[index % len(passengers)])
+            started = time.perf_counter()
+            predict(bundle, features)
+            latencies[position].append(time.perf_counter() - started)
+            index += clients
+
+    threads = [threading.Thread(target=client, args=(position,)) for position in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    timings = np.concatenate([np.asarray(values) for values in latencies]) * 1000
+    return {
+        'throughput': len(timings) / seconds,
+        'p50': np.percentile(timings, 50),
+        'p99': np.percentile(timings, 99),
+    }
+
+
+def main():
+    """
+    Run the benchmark and print one line per mode.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--max-wait', type=float, default=0.002)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    args = parser.parse_args()
+
+    passengers = load_passengers()
+
+    def direct(bundle, features):
+        return bool(bundle.model.predict(features)[0])
+
+    batcher = PredictionBatcher(args.max_wait, args.max_batch_size)
+    batcher.start()
+
+    print(f"{'mode':>8} {'predictions/s':>14} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for name, predict in (('direct', direct), ('batched', batcher.predict)):
+        result = run(predict, passengers, args.clients, args.seconds)
+        print(f"{name:>8} {result['throughput']:>14.0f} {result['p50']:>9.2f} "
+              f"{result['p99']:>9.2f}")
+
+    batcher.stop()
+    print(f"batch sizes: {batcher.stats()['batch_sizes']}")
+
+
+if __name__ == '__main__':
+    main()
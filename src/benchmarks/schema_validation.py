@@ -0,0 +1,107 @@
+"""
+Benchmark for the compiled fast paths of the passenger schemas.
+
+Loads and dumps passengers with the compiled schemas and with plain marshmallow,
+then sends POST /passenger and GET /passengers requests through Flask's test
+client with the fast paths enabled and disabled, and reports the throughput of
+each.
+
+Usage (from the `src` directory):
+    python -m benchmarks.schema_validation [--seconds 2]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from marshmallow import Schema
+
+from schemas.compiled_schema import CompiledDumpSchema, CompiledLoadSchema
+from schemas.passenger_schema import PassengerSchema, PassengerViewSchema
+
+PASSENGER = {
+    'name': 'Snyder, Mrs. John Pillsbury (Nelle Stevenson)', 'ticket_class': 1,
+    'sex': 'female', 'age': 23.0, 'number_siblings_spouses': 1,
+    'number_parents_children': 0, 'ticket': '21228', 'fare': 82.2667,
+    'cabin': 'B45', 'embarked': 'Cherbourg',
+}
+
+
+@contextmanager
+def marshmallow_only():
+    """
+    Disable the compiled fast paths for the duration of the block.
+    """
+
+    originals = (CompiledLoadSchema.load, CompiledLoadSchema.validate, CompiledDumpSchema.dump)
+    CompiledLoadSchema.load = Schema.load
+    CompiledLoadSchema.validate = Schema.validate
+    CompiledDumpSchema.dump = Schema.dump
+    try:
+        yield
+    finally:
+        CompiledLoadSchema.load, CompiledLoadSchema.validate, CompiledDumpSchema.dump = originals
+
+
+def throughput(function, seconds: float) -> float:
+    """
+    Call `function` repeatedly for `seconds` and return the calls per second.
+    """
+
+    function()
+    calls = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        function()
+        calls += 1
+    return calls / (time.perf_counter() - started)
+
+
+def main():
+    """
+    Run the benchmark and print the throughput with and without the fast paths.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    os.environ.setdefault('MODEL_WARMUP', '0')
+    from app import create_app
+
+    load_schema = PassengerSchema()
+    dump_schema = PassengerViewSchema()
+    row = {**load_schema.load(PASSENGER), 'id': 1, 'survived': True}
+    page = [dict(row, id=position) for position in range(100)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app({'SQLALCHEMY_DATABASE_URI':
+                          f"sqlite:///{os.path.join(directory, 'benchmark.db')}"})
+        client = app.test_client()
+        counter = iter(range(10 ** 9))
+
+        def post_passenger():
+            # A different fare every call, so the prediction cache never hits.
+            client.post('/passenger', json={**PASSENGER, 'fare': 7.0 + next(counter) * 1e-4})
+
+        benchmarks = (
+            ('PassengerSchema.load', lambda: load_schema.load(PASSENGER)),
+            ('PassengerViewSchema.dump', lambda: dump_schema.dump(row)),
+            ('PassengerViewSchema.dump[100]', lambda: dump_schema.dump(page, many=True)),
+            ('POST /passenger', post_passenger),
+            ('GET /passengers?limit=100', lambda: client.get('/passengers?limit=100')),
+        )
+
+        print(f"{'benchmark':<32} {'marshmallow/s':>14} {'compiled/s':>12} {'speed-up':>9}")
+        for name, function in benchmarks:
+            with marshmallow_only():
+                baseline = throughput(function, args.seconds)
+            compiled = throughput(function, args.seconds)
+            print(f'{name:<32} {baseline:>14.0f} {compiled:>12.0f} {compiled / baseline:>8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""
+Load test comparing the WSGI and the ASGI serving modes.
+
+Starts the application in a subprocess, first with Werkzeug's threaded WSGI
+server (as `app.run`) and then with uvicorn and the ASGI application, waits for
+/readyz, and has 1, 16 and 128 concurrent clients send POST /passenger requests
+for a fixed time. Reports the throughput, the latency percentiles and the
+number of failed requests of each mode and concurrency level.
+
+Usage (from the `src` directory):
+    python -m benchmarks.serving_load [--seconds 10] [--clients 1 16 128]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+PASSENGER = {
+    'name': 'Snyder, Mrs. John Pillsbury (Nelle Stevenson)', 'ticket_class': 1,
+    'sex': 'female', 'age': 23.0, 'number_siblings_spouses': 1,
+    'number_parents_children': 0, 'ticket': '21228', 'fare': 82.2667,
+    'cabin': 'B45', 'embarked': 'Cherbourg',
+}
+MODES = ('wsgi', 'asgi')
+
+
+def serve(mode: str, port: int):
+    """
+    Run the application on `port` in the given serving mode (in the subprocess).
+    """
+
+    if mode == 'wsgi':
+        from werkzeug.serving import run_simple
+        from app import create_app
+
+        run_simple('127.0.0.1', port, create_app(), threaded=True)
+    else:
+        import uvicorn
+        from asgi import create_asgi_app
+
+        uvicorn.run(create_asgi_app(), host='127.0.0.1', port=port, log_level='warning')
+
+
+def free_port() -> int:
+    """
+    Return a free local TCP port.
+    """
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def send_request(port: int, method: str, path: str, body: bytes = b'') -> int:
+    """
+    Send one HTTP/1.1 request on a new connection and return the status code.
+    """
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(f'{method} {path} HTTP/1.1\r\nHost: localhost\r\n'
+                     f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n'
+                     f'Connection: close\r\n\r\n'.encode('latin-1') + body)
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    return int(response.split(b' ', 2)[1])
+
+
+async def wait_ready(port: int, timeout: float = 120.0):
+    """
+    Wait until the application answers /readyz with 200.
+    """
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if await send_request(port, 'GET', '/readyz') == 200:
+                return
+        except (OSError, IndexError, ValueError):
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError('The application did not become ready.')
+
+
+async def load(port: int, clients: int, seconds: float) -> dict:
+    """
+    Send POST /passenger from `clients` concurrent clients for `seconds`.
+    """
+
+    latencies, failures = [], 0
+    deadline = time.monotonic() + seconds
+    counter = iter(range(10 ** 9))
+
+    async def client():
+        nonlocal failures
+        while time.monotonic() < deadline:
+            # A different fare every request, so the prediction cache never hits.
+            body = json.dumps({**PASSENGER, 'fare': 7.0 + next(counter) * 1e-4}).encode()
+            started = time.perf_counter()
+            try:
+                status = await send_request(port, 'POST', '/passenger', body)
+            except (OSError, IndexError, ValueError):
+                status = None
+            if status == 201:
+                latencies.append(time.perf_counter() - started)
+            else:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests_per_second': len(latencies) / elapsed,
+        'p50': float(np.percentile(latencies_ms, 50)) if latencies else float('nan'),
+        'p99': float(np.percentile(latencies_ms, 99)) if latencies else float('nan'),
+        'failures': failures,
+    }
+
+
+def main():
+    """
+    Run the load test for each serving mode and print the results.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 16, 128])
+    parser.add_argument('--serve', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    print(f"{'mode':<6} {'clients':>8} {'requests/s':>11} {'p50 (ms)':>9} {'p99 (ms)':>9} "
+          f"{'failed':>7}")
+    for mode in MODES:
+        with tempfile.TemporaryDirectory() as directory:
+            port = free_port()
+            env = {**os.environ,
+                   'DATABASE_URL': f"sqlite:///{os.path.join(directory, 'load.db')}"}
+            server = subprocess.Popen(
+                [sys.executable, '-m', 'benchmarks.serving_load', '--serve', mode,
+                 '--port', str(port)], env=env, stderr=subprocess.DEVNULL)
+            try:
+                asyncio.run(wait_ready(port))
+                for clients in args.clients:
+                    result = asyncio.run(load(port, clients, args.seconds))
+                    print(f"{mode:<6} {clients:>8} {result['requests_per_second']:>11.1f} "
+                          f"{result['p50']:>9.1f} {result['p99']:>9.1f} "
+                          f"{result['failures']:>7}", flush=True)
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark for concurrent reads and writes on the SQLite database.
+
+Runs reader threads (paging through the passenger table) and writer threads
+(inserting and committing one passenger at a time) against a temporary database
+file, first with SQLite's defaults and then with the tuned engine used by the
+application (WAL journal, pragmas and connection pool), and reports the read
+and write throughput and the number of failed operations.
+
+Usage (from the `src` directory):
+    python -m benchmarks.sqlite_concurrency [--readers 8] [--writers 2] [--seconds 5]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import OperationalError
+
+from database.db_setup import configure_engine, engine_options
+from database.models.passenger import Passenger
+
+PASSENGER = {
+    'name': 'Snyder, Mrs. John Pillsbury (Nelle Stevenson)', 'ticket_class': 1,
+    'sex': 'female', 'age': 23.0, 'number_siblings_spouses': 1,
+    'number_parents_children': 0, 'ticket': '21228', 'fare': 82.2667,
+    'cabin': 'B45', 'embarked': 'Cherbourg', 'survived': True,
+}
+
+
+def build_engine(path: str, tuned: bool):
+    """
+    Create an engine on the database file, either tuned or with the defaults.
+    """
+
+    url = f'sqlite:///{path}'
+    if not tuned:
+        return create_engine(url)
+
+    engine = create_engine(url, **engine_options(url))
+    configure_engine(engine)
+    return engine
+
+
+def run(engine, readers: int, writers: int, seconds: float, seed_rows: int) -> dict:
+    """
+    Run the readers and writers for `seconds` and count their operations.
+    """
+
+    Passenger.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Passenger), [PASSENGER] * seed_rows)
+
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def count(key):
+        with lock:
+            counts[key] += 1
+
+    def reader():
+        cursor = 0
+        query = select(Passenger.id, Passenger.name, Passenger.survived)
+        while time.monotonic() < deadline:
+            try:
+                with engine.connect() as connection:
+                    rows = connection.execute(query.where(Passenger.id > cursor)
+                                              .order_by(Passenger.id).limit(100)).all()
+                cursor = rows[-1].id if len(rows) == 100 else 0
+                count('reads')
+            except OperationalError:
+                count('errors')
+
+    def writer():
+        while time.monotonic() < deadline:
+            try:
+                with engine.begin() as connection:
+                    connection.execute(insert(Passenger), PASSENGER)
+                count('writes')
+            except OperationalError:
+                count('errors')
+
+    threads = ([threading.Thread(target=reader) for _ in range(readers)]
+               + [threading.Thread(target=writer) for _ in range(writers)])
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    engine.dispose()
+    return {key: value / seconds if key != 'errors' else value
+            for key, value in counts.items()}
+
+
+def main():
+    """
+    Run the benchmark and print one line per configuration.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--seed-rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'engine':>8} {'reads/s':>10} {'writes/s':>10} {'errors':>8}")
+    for tuned in (False, True):
+        with tempfile.TemporaryDirectory() as directory:
+            engine = build_engine(os.path.join(directory, 'benchmark.db'), tuned)
+            result = run(engine, args.readers, args.writers, args.seconds, args.seed_rows)
+        print(f"{'tuned' if tuned else 'default':>8} {result['reads']:>10.0f} "
+              f"{result['writes']:>10.0f} {result['errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,311 @@
+"""
+Benchmark suite for the preprocessing, prediction, API and database paths.
+
+Measures `PreProcessor.preprocess_new_data` and `model.predict` at several batch
+sizes, the bundle load time, POST /passenger and GET /passengers through Flask's
+test client at several table sizes, and the passenger insert throughput. Each
+benchmark is run a fixed number of times after a warm-up run and its timings
+are summarized (median, minimum, mean). Results are saved as JSON; given a
+previous result file, benchmarks whose median got slower by more than the
+threshold are reported as regressions and the exit status is 1.
+
+Usage (from the `src` directory):
+    python -m benchmarks.suite [--output results.json] [--compare baseline.json]
+        [--threshold 0.2] [--quick] [--filter predict]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(SRC_DIR, 'data', 'train.csv')
+PICKLE_PATH = os.path.join(SRC_DIR, 'ml', 'titanic_model_bundle.pkl')
+
+BATCH_SIZES = (1, 100, 1000, 10000)
+TABLE_SIZES = (1000, 10000, 100000)
+QUICK_BATCH_SIZES = (1, 100, 1000)
+QUICK_TABLE_SIZES = (1000, 10000)
+
+PASSENGER = {
+    'name': 'Snyder, Mrs. John Pillsbury (Nelle Stevenson)', 'ticket_class': 1,
+    'sex': 'female', 'age': 23.0, 'number_siblings_spouses': 1,
+    'number_parents_children': 0, 'ticket': '21228', 'fare': 82.2667,
+    'cabin': 'B45', 'embarked': 'Cherbourg',
+}
+
+
+class Suite:
+    """
+    Collector running the benchmarks and keeping their summaries.
+    """
+
+    def __init__(self, runs: int, name_filter: Optional[str] = None):
+        self.runs = runs
+        self.name_filter = name_filter
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def selected(self, name: str) -> bool:
+        """
+        Tell whether a benchmark passes the name filter.
+        """
+
+        return self.name_filter is None or self.name_filter in name
+
+    def measure(self, name: str, function: Callable[[], Any], items: int = 1,
+                runs: Optional[int] = None):
+        """
+        Time `function` after one warm-up call and record the summary.
+
+        Args:
+            name (str): Name of the benchmark.
+            function (Callable): Code to be timed.
+            items (int): Items processed per call, to report a throughput.
+            runs (Optional[int]): Number of timed calls (defaults to the suite's).
+        """
+
+        if not self.selected(name):
+            return
+
+        function()
+
+        timings = []
+        for _ in range(runs or self.runs):
+            started = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started)
+
+        median = statistics.median(timings)
+        self.results[name] = {
+            'median': median,
+            'min': min(timings),
+            'mean': statistics.fmean(timings),
+            'runs': len(timings),
+            'items': items,
+            'items_per_second': items / median if median else None,
+        }
+        print(f'{name:<48} {median * 1000:>11.3f} ms {items / median:>14.0f} items/s',
+              flush=True)
+
+
+def passenger_rows(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Sample `count` training passengers as column dictionaries of the passenger table.
+    """
+
+    dataset = pd.read_csv(DATA_PATH).sample(count, replace=True, random_state=seed)
+    dataset = dataset.astype(object).where(dataset.notna(), None)
+    return [{'name': row.Name, 'ticket_class': int(row.Pclass), 'sex': row.Sex,
+             'age': row.Age, 'number_siblings_spouses': int(row.SibSp),
+             'number_parents_children': int(row.Parch), 'ticket': row.Ticket,
+             'fare': row.Fare, 'cabin': row.Cabin, 'embarked': None,
+             'survived': bool(row.Survived)}
+            for row in dataset.itertuples()]
+
+
+def benchmark_model(suite: Suite, batch_sizes):
+    """
+    Benchmark the preprocessing and the prediction at several batch sizes.
+    """
+
+    from ml.artifacts import export_bundle, load_bundle
+    from ml.pipeline import Pipeline
+    from ml.preprocessor import PreProcessor
+
+    bundle = Pipeline().load_pipeline(PICKLE_PATH)
+    preprocessor = PreProcessor()
+    dataset = pd.read_csv(DATA_PATH)
+
+    with tempfile.TemporaryDirectory() as directory:
+        export_bundle(bundle, directory)
+        scorer = load_bundle(directory, mmap=False)['model']
+
+    for size in batch_sizes:
+        batch = dataset.sample(size, replace=True, random_state=size).reset_index(drop=True)
+        suite.measure(f'preprocess_new_data[{size}]',
+                      lambda batch=batch: preprocessor.preprocess_new_data(
+                          batch, bundle['preprocessor']),
+                      items=size)
+
+        X = preprocessor.preprocess_new_data(batch, bundle['preprocessor'])
+        suite.measure(f'predict.sklearn[{size}]', lambda X=X: bundle['model'].predict(X),
+                      items=size)
+        suite.measure(f'predict.numpy[{size}]', lambda X=X: scorer.predict(X), items=size)
+
+
+def benchmark_bundle_load(suite: Suite):
+    """
+    Benchmark loading the pickled and the directory bundle with a fresh registry.
+    """
+
+    from ml.artifacts import export_bundle
+    from ml.pipeline import Pipeline
+    from ml.registry import ModelRegistry
+
+    with tempfile.TemporaryDirectory() as directory:
+        export_bundle(Pipeline().load_pipeline(PICKLE_PATH), directory)
+        for name, path in (('pickle', PICKLE_PATH), ('directory', directory)):
+            suite.measure(f'bundle_load.{name}', lambda path=path: ModelRegistry(path).get(),
+                          runs=max(3, suite.runs // 5))
+
+
+def benchmark_api(suite: Suite, table_sizes):
+    """
+    Benchmark the API endpoints and the insert throughput on a temporary database.
+
+    The list endpoints are measured first, on tables grown to each size; the
+    inserts and POST /passenger then run on the largest table.
+    """
+
+    from app import create_app
+    from business.passenger_business import create_passenger, create_passengers
+    from database.db_setup import db
+    from repositories.passenger_repository import insert_passengers
+    from repositories.passenger_stats_repository import increment_passenger_stats
+    from schemas.passenger_dataclass import PassengerData
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app({'SQLALCHEMY_DATABASE_URI':
+                          f"sqlite:///{os.path.join(directory, 'benchmark.db')}"})
+        client = app.test_client()
+
+        for size in table_sizes:
+            with app.app_context():
+                missing = size - db.session.query(db.func.count()).select_from(
+                    db.metadata.tables['passenger']).scalar()
+                if missing > 0:
+                    rows = passenger_rows(missing, seed=size)
+                    insert_passengers(rows, returning_ids=False)
+                    increment_passenger_stats(rows)
+                    db.session.commit()
+                last_id = db.session.query(db.func.max(
+                    db.metadata.tables['passenger'].c.id)).scalar()
+
+            for name, url in (('first_page', '/passengers?limit=100'),
+                              ('deep_page', f'/passengers?limit=100&cursor={last_id - 150}'),
+                              ('filtered', '/passengers?limit=100&sex=female&ticket_class=1'),
+                              ('stats', '/passengers/stats')):
+                suite.measure(f'api.get_passengers.{name}[{size}]',
+                              lambda url=url: client.get(url).get_data())
+
+        with app.app_context():
+            batch = [PassengerData(**{key: value for key, value in row.items()
+                                      if key != 'survived'})
+                     for row in passenger_rows(1000)]
+            suite.measure('insert.create_passengers[1000]',
+                          lambda: create_passengers(batch), items=len(batch))
+            suite.measure('insert.create_passenger',
+                          lambda: create_passenger(batch[len(batch) // 2]))
+
+        counter = iter(range(10 ** 9))
+
+        def post_passenger():
+            # A different fare every call, so the prediction cache never hits.
+            payload = {**PASSENGER, 'fare': 7.0 + next(counter) * 1e-4}
+            response = client.post('/passenger', json=payload)
+            assert response.status_code == 201, response.get_data(as_text=True)
+
+        suite.measure('api.post_passenger', post_passenger)
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float) -> List[Dict[str, Any]]:
+    """
+    Compare the medians of two runs.
+
+    Args:
+        results (dict): Benchmark summaries of the current run.
+        baseline (dict): Benchmark summaries of the reference run.
+        threshold (float): Relative slowdown above which a benchmark regressed,
+        e.g. 0.2 for 20 %.
+
+    Returns:
+        List[dict]: One entry per benchmark present in both runs, with the
+        baseline and current medians, their ratio and the regression flag.
+    """
+
+    comparison = []
+    for name in sorted(results.keys() & baseline.keys()):
+        before, after = baseline[name]['median'], results[name]['median']
+        ratio = after / before if before else float('inf')
+        comparison.append({'name': name, 'baseline': before, 'current': after,
+                           'ratio': ratio, 'regression': ratio > 1 + threshold})
+    return comparison
+
+
+def metadata() -> Dict[str, Any]:
+    """
+    Describe the environment of the run.
+    """
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def main(argv=None) -> int:
+    """
+    Run the suite, save the results and compare them with a baseline.
+
+    Returns:
+        int: 1 when a regression was found, 0 otherwise.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help='results of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown flagged as a regression (default: 0.2)')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--quick', action='store_true', help='smaller batches and tables')
+    parser.add_argument('--filter', help='only run benchmarks whose name contains this')
+    args = parser.parse_args(argv)
+
+    suite = Suite(args.runs, args.filter)
+    benchmark_model(suite, QUICK_BATCH_SIZES if args.quick else BATCH_SIZES)
+    benchmark_bundle_load(suite)
+    benchmark_api(suite, QUICK_TABLE_SIZES if args.quick else TABLE_SIZES)
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump({'metadata': metadata(), 'results': suite.results}, file, indent=2)
+    print(f'Results saved to {args.output}')
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare, encoding='utf-8') as file:
+        baseline = json.load(file)['results']
+
+    comparison = compare(suite.results, baseline, args.threshold)
+    print(f"\n{'benchmark':<48} {'baseline (ms)':>14} {'current (ms)':>13} {'ratio':>7}")
+    for entry in comparison:
+        flag = '  REGRESSION' if entry['regression'] else ''
+        print(f"{entry['name']:<48} {entry['baseline'] * 1000:>14.3f} "
+              f"{entry['current'] * 1000:>13.3f} {entry['ratio']:>7.2f}{flag}")
+
+    regressions = [entry['name'] for entry in comparison if entry['regression']]
+    if regressions:
+        print(f'\n{len(regressions)} regression(s) above {args.threshold:.0%}: '
+              f"{', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+In-memory cache module.
+
+This module provides a thread-safe `LRUCache` with bounded size, optional
+time-to-live and hit/miss/eviction counters.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with optional expiration.
+
+    Once `maxsize` entries are stored, adding a new one evicts the least recently
+    used entry. Entries older than `ttl` seconds are treated as missing and
+    dropped when looked up. A `maxsize` of 0 disables the cache.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value cached under `key`.
+
+        Args:
+            key (Hashable): Cache key.
+            default (Any): Value returned when the key is missing or expired.
+
+        Returns:
+            Any: The cached value, or `default`.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Cache `value` under `key`, evicting the least recently used entries if needed.
+
+        Args:
+            key (Hashable): Cache key.
+            value (Any): Value to be cached.
+        """
+
+        if self.maxsize <= 0:
+            return
+
+        expires_at = self._clock() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """
+        Remove every cached entry.
+        """
+
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: Size, capacity, hits, misses, evictions and expirations.
+        """
+
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
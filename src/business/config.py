@@ -0,0 +1,33 @@
+"""
+Configuration module for the business layer.
+"""
+
+import os
+
+PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', 10000))
+PREDICTION_CACHE_TTL = float(os.environ.get('PREDICTION_CACHE_TTL', 3600))
+PASSENGER_WRITE_BEHIND = os.environ.get('PASSENGER_WRITE_BEHIND', '0').lower() in ('1', 'true', 'yes')
+PASSENGER_WRITE_BATCH_SIZE = int(os.environ.get('PASSENGER_WRITE_BATCH_SIZE', 500))
+PASSENGER_WRITE_FLUSH_INTERVAL = float(os.environ.get('PASSENGER_WRITE_FLUSH_INTERVAL', 0.05))
+PASSENGER_WRITE_QUEUE_SIZE = int(os.environ.get('PASSENGER_WRITE_QUEUE_SIZE', 10000))
+PASSENGER_WRITE_QUEUE_TIMEOUT = float(os.environ.get('PASSENGER_WRITE_QUEUE_TIMEOUT', 1.0))
+PASSENGER_WRITE_RETRIES = int(os.environ.get('PASSENGER_WRITE_RETRIES', 3))
+PASSENGER_WRITE_RETRY_BACKOFF = float(os.environ.get('PASSENGER_WRITE_RETRY_BACKOFF', 0.05))
+# JSON Lines file keeping the queued passengers that could not be written.
+PASSENGER_WRITE_DEAD_LETTER_PATH = os.environ.get(
+    'PASSENGER_WRITE_DEAD_LETTER_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 'database', 'passenger_dead_letter.jsonl'))
+PREDICTION_BATCHING = os.environ.get('PREDICTION_BATCHING', '0').lower() in ('1', 'true', 'yes')
+PREDICTION_BATCH_MAX_WAIT = float(os.environ.get('PREDICTION_BATCH_MAX_WAIT', 0.002))
+PREDICTION_BATCH_MAX_SIZE = int(os.environ.get('PREDICTION_BATCH_MAX_SIZE', 64))
+PREDICTION_BATCH_TIMEOUT = float(os.environ.get('PREDICTION_BATCH_TIMEOUT', 5.0))
+INFERENCE_POOL_PROCESSES = int(os.environ.get('INFERENCE_POOL_PROCESSES', 0))
+MODEL_WARMUP = os.environ.get('MODEL_WARMUP', '1').lower() in ('1', 'true', 'yes')
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1').lower() in ('1', 'true', 'yes')
+SHADOW_SCORING_WORKERS = int(os.environ.get('SHADOW_SCORING_WORKERS', 1))
+SHADOW_SCORING_QUEUE_SIZE = int(os.environ.get('SHADOW_SCORING_QUEUE_SIZE', 1000))
+SHADOW_SCORING_MAX_BATCH_SIZE = int(os.environ.get('SHADOW_SCORING_MAX_BATCH_SIZE', 64))
+IDEMPOTENCY_KEY_TTL = float(os.environ.get('IDEMPOTENCY_KEY_TTL', 86400))
+IDEMPOTENCY_CACHE_SIZE = int(os.environ.get('IDEMPOTENCY_CACHE_SIZE', 10000))
+IDEMPOTENCY_PURGE_INTERVAL = float(os.environ.get('IDEMPOTENCY_PURGE_INTERVAL', 3600))
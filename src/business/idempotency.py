@@ -0,0 +1,154 @@
+"""
+Business module for the `Idempotency-Key` request deduplication.
+
+A request sent with an idempotency key stores its response under the key, in
+the same transaction as the passenger it created. A retry with the same key
+and payload is answered with the stored response, looked up first in a bounded
+in-memory cache and then in the `idempotency_key` table, without scoring or
+inserting the passenger again. Keys expire after IDEMPOTENCY_KEY_TTL seconds.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from business.cache import LRUCache
+from business.config import (
+    IDEMPOTENCY_CACHE_SIZE,
+    IDEMPOTENCY_KEY_TTL,
+    IDEMPOTENCY_PURGE_INTERVAL,
+)
+from business.metrics import stage_metrics
+from repositories.idempotency_repository import (
+    delete_expired_idempotency_keys,
+    get_idempotency_key,
+)
+from schemas.passenger_dataclass import PASSENGER_DATA_FIELDS, PassengerData
+
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+idempotency_cache = LRUCache(IDEMPOTENCY_CACHE_SIZE, IDEMPOTENCY_KEY_TTL)
+
+_purge_lock = threading.Lock()
+_next_purge = 0.0
+
+
+class IdempotencyKeyConflictError(Exception):
+    """
+    Raised when an idempotency key is reused with a different request payload.
+    """
+
+
+def request_hash(data: PassengerData) -> str:
+    """
+    Computes the digest identifying the payload of a passenger request.
+
+    Args:
+        data (PassengerData): Information about the passenger.
+
+    Returns:
+        str: SHA-256 hex digest of the passenger fields.
+    """
+
+    values = [getattr(data, field) for field in PASSENGER_DATA_FIELDS]
+    return hashlib.sha256(json.dumps(values).encode()).hexdigest()
+
+
+def find_response(key: str, payload_hash: str) -> Optional[Dict[str, Any]]:
+    """
+    Looks up the response stored under an idempotency key.
+
+    An expired key is treated as not stored. It is left in the table, and
+    replaced in the transaction that stores the key again (see
+    `claim_idempotency_keys`).
+
+    Args:
+        key (str): The idempotency key.
+        payload_hash (str): Digest of the payload of the current request.
+
+    Returns:
+        Optional[Dict[str, Any]]: The stored response, or None if the key is
+        not stored or expired.
+
+    Raises:
+        IdempotencyKeyConflictError: If the key was used with another payload.
+    """
+
+    with stage_metrics.stage('idempotency'):
+        now = utcnow()
+        entry = idempotency_cache.get(key)
+        if entry is None or entry['expires_at'] <= now:
+            entry = get_idempotency_key(key)
+            if entry is None or entry['expires_at'] <= now:
+                return None
+            entry = {**entry, 'response': json.loads(entry['response'])}
+            idempotency_cache.set(key, entry)
+
+    if entry['request_hash'] != payload_hash:
+        raise IdempotencyKeyConflictError(
+            f'{IDEMPOTENCY_KEY_HEADER} {key!r} was already used with a different passenger.')
+    return entry['response']
+
+
+def idempotency_row(key: str, payload_hash: str, response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds the column values storing a response under an idempotency key.
+
+    Args:
+        key (str): The idempotency key.
+        payload_hash (str): Digest of the request payload.
+        response (Dict[str, Any]): The response to be returned to retries.
+
+    Returns:
+        Dict[str, Any]: Column values of the idempotency key table.
+    """
+
+    now = utcnow()
+    return {
+        'key': key,
+        'request_hash': payload_hash,
+        'response': json.dumps(response),
+        'created_at': now,
+        'expires_at': now + timedelta(seconds=IDEMPOTENCY_KEY_TTL),
+    }
+
+
+def remember_response(row: Dict[str, Any], response: Dict[str, Any]):
+    """
+    Caches a stored response once its transaction is committed (or queued).
+
+    Args:
+        row (Dict[str, Any]): Column values built by `idempotency_row`.
+        response (Dict[str, Any]): The stored response.
+    """
+
+    idempotency_cache.set(row['key'], {'request_hash': row['request_hash'],
+                                       'response': response,
+                                       'expires_at': row['expires_at']})
+
+
+def purge_expired_keys_if_due():
+    """
+    Deletes the expired keys in the current transaction, at most once every
+    IDEMPOTENCY_PURGE_INTERVAL seconds per process.
+    """
+
+    global _next_purge
+
+    with _purge_lock:
+        if time.monotonic() < _next_purge:
+            return
+        _next_purge = time.monotonic() + IDEMPOTENCY_PURGE_INTERVAL
+    delete_expired_idempotency_keys(utcnow())
+
+
+def utcnow() -> datetime:
+    """
+    Returns the current time in UTC, without time zone, as stored in the table.
+    """
+
+    return datetime.now(timezone.utc).replace(tzinfo=None)
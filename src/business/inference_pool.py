@@ -0,0 +1,236 @@
+"""
+Multi-process inference pool for single-passenger predictions.
+
+The SVM prediction holds the GIL for most of its work, so the threads of one
+web process cannot score on more than about one core. This module provides an
+`InferencePool`, a `PredictionBatcher` whose batches are scored by worker
+processes: each worker loads the model bundle once (directory bundles are
+memory-mapped, so the workers share one copy of the arrays in the page cache)
+and receives the stacked feature rows of a batch over a pipe.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import struct
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+from business.config import (
+    PREDICTION_BATCH_MAX_SIZE,
+    PREDICTION_BATCH_MAX_WAIT,
+    PREDICTION_BATCH_TIMEOUT,
+)
+from business.prediction_batcher import _STOP, PredictionBatcher
+from ml.config import MODEL_BUNDLE_PATH, MODEL_LEAN
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from ml.registry import ModelBundle
+
+logger = logging.getLogger(__name__)
+
+# Request: model version (SHA-256 hex digest), number of rows and of columns,
+# followed by the float64 feature matrix in C order.
+_REQUEST_HEADER = struct.Struct('<64sII')
+# Reply: status, followed by one byte per prediction or by an error message.
+_OK, _ERROR, _VERSION_MISMATCH = b'\x00', b'\x01', b'\x02'
+
+
+def _worker_main(connection, path: str, lean: bool):
+    """
+    Score the batches received on `connection` until an empty message arrives.
+
+    Runs in the worker processes. The worker's registry checks the bundle on
+    every batch, so a reloaded model is picked up by the next batch; batches
+    built with another model version are answered with a version mismatch.
+    """
+
+    import numpy as np
+
+    from ml.registry import ModelRegistry
+
+    registry = ModelRegistry(path, check_interval=0, lean=lean)
+    registry.get()
+    connection.send_bytes(_OK)
+
+    while True:
+        try:
+            message = connection.recv_bytes()
+        except EOFError:
+            return
+        if not message:
+            return
+
+        version, rows, columns = _REQUEST_HEADER.unpack_from(message)
+        try:
+            bundle = registry.get()
+            if bundle.version.encode('ascii') != version:
+                connection.send_bytes(_VERSION_MISMATCH)
+                continue
+            features = np.frombuffer(message, dtype=np.float64, count=rows * columns,
+                                     offset=_REQUEST_HEADER.size).reshape(rows, columns)
+            predictions = bundle.model.predict(features).astype(np.uint8)
+            connection.send_bytes(_OK + predictions.tobytes())
+        except Exception as error:  # pylint: disable=broad-except
+            connection.send_bytes(_ERROR + f'{type(error).__name__}: {error}'.encode())
+
+
+class InferencePool(PredictionBatcher):
+    """
+    Prediction batcher scoring its batches in `processes` worker processes.
+
+    One feeder thread per worker takes batches from the shared queue, sends
+    them to its worker and resolves the callers' futures with the replies, so
+    up to `processes` batches are scored in parallel. Groups built with a model
+    version the worker has not loaded yet, and the vectors still queued when
+    the pool stops, are scored in the web process. A worker that dies is
+    restarted and its batch fails.
+    """
+
+    def __init__(self, processes: int,
+                 max_wait: float = PREDICTION_BATCH_MAX_WAIT,
+                 max_batch_size: int = PREDICTION_BATCH_MAX_SIZE,
+                 path: str = MODEL_BUNDLE_PATH, lean: bool = MODEL_LEAN,
+                 timeout: float = PREDICTION_BATCH_TIMEOUT):
+        super().__init__(max_wait, max_batch_size, timeout)
+        self.processes = processes
+        self.path = path
+        self.lean = lean
+        # Spawned rather than forked: the web process already runs threads.
+        self._context = multiprocessing.get_context('spawn')
+        self._workers: List[Tuple[Any, Any]] = []
+        self._threads: List[threading.Thread] = []
+        self._remote_batches = 0
+
+    def start(self):
+        """
+        Start the worker processes, wait for their model loads, then start feeding them.
+        """
+
+        self._workers = [self._spawn() for _ in range(self.processes)]
+        for position, (_, connection) in enumerate(self._workers):
+            connection.recv_bytes()
+            self._threads.append(threading.Thread(
+                target=self._feed, args=(position,), name=f'inference-feeder-{position}',
+                daemon=True))
+
+        with self._running_lock:
+            self._running = True
+        for thread in self._threads:
+            thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """
+        Stop the feeders and the workers, then score the queued vectors in process.
+        """
+
+        if not self._close():
+            return
+        for thread in self._threads:
+            thread.join()
+
+        for process, connection in self._workers:
+            try:
+                connection.send_bytes(b'')
+            except OSError:
+                pass
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+            connection.close()
+        self._workers = []
+        self._threads = []
+
+        self._score(self._drain())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the batcher counters, with the number of worker processes and of
+        batches they scored.
+        """
+
+        stats = super().stats()
+        with self._stats_lock:
+            stats['processes'] = self.processes
+            stats['remote_batches'] = self._remote_batches
+        return stats
+
+    def _spawn(self) -> Tuple[Any, Any]:
+        connection, worker_connection = self._context.Pipe()
+        process = self._context.Process(target=_worker_main,
+                                        args=(worker_connection, self.path, self.lean),
+                                        name='inference-worker', daemon=True)
+        process.start()
+        worker_connection.close()
+        return process, connection
+
+    def _feed(self, position: int):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if stopping:
+                # The stop marker was consumed: pass it on to the next feeder.
+                self._queue.put(_STOP)
+            if batch:
+                self._score_remote(position, batch)
+
+    def _score_remote(self, position: int, batch: List[Tuple['ModelBundle', 'np.ndarray', Future]]):
+        import numpy as np
+
+        groups: Dict[str, List[Tuple['ModelBundle', 'np.ndarray', Future]]] = {}
+        for item in batch:
+            groups.setdefault(item[0].version, []).append(item)
+
+        for version, items in groups.items():
+            features = np.ascontiguousarray(
+                np.vstack([features for _, features, _ in items]), dtype=np.float64)
+            try:
+                reply = self._request(position, _REQUEST_HEADER.pack(
+                    version.encode('ascii'), *features.shape) + features.tobytes())
+            except (EOFError, OSError) as error:
+                logger.exception('Inference worker %d failed; restarting it.', position)
+                self._restart(position)
+                for _, _, future in items:
+                    future.set_exception(error)
+                continue
+
+            status, payload = reply[:1], reply[1:]
+            if status == _VERSION_MISMATCH:
+                self._score(items)
+                continue
+            if status == _ERROR:
+                error = RuntimeError(payload.decode(errors='replace'))
+                logger.error('Failed to score a batch of %d passengers: %s', len(items), error)
+                for _, _, future in items:
+                    future.set_exception(error)
+                continue
+
+            for (_, _, future), prediction in zip(items, payload):
+                future.set_result(bool(prediction))
+
+            with self._stats_lock:
+                self._batches += 1
+                self._remote_batches += 1
+                self._predictions += len(items)
+                self._batch_sizes[len(items)] += 1
+
+    def _request(self, position: int, message: bytes) -> bytes:
+        connection = self._workers[position][1]
+        connection.send_bytes(message)
+        return connection.recv_bytes()
+
+    def _restart(self, position: int):
+        process, connection = self._workers[position]
+        connection.close()
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        try:
+            self._workers[position] = self._spawn()
+            self._workers[position][1].recv_bytes()
+        except (EOFError, OSError):
+            logger.exception('Failed to restart inference worker %d.', position)
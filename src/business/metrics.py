@@ -0,0 +1,405 @@
+"""
+Metrics module for the application.
+
+This module times the stages of the request hot path (validation,
+preprocessing, prediction, database) per endpoint, aggregates the timings into
+fixed-bucket histograms and renders them, together with the counters of the
+caches, the model registry and the background workers, in the Prometheus text
+exposition format.
+"""
+
+import bisect
+import math
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from flask import Flask, g, has_request_context, request
+
+from business.config import METRICS_ENABLED
+
+DURATION_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+NO_ENDPOINT = 'none'
+
+_NULL_STAGE = nullcontext()
+
+# Endpoint of the request being handled outside of a Flask request context (by
+# the ASGI application); copied into the executor threads working for it.
+current_endpoint: ContextVar[Optional[str]] = ContextVar('current_endpoint', default=None)
+
+
+class Histogram:
+    """
+    Thread-safe histogram of observations over fixed bucket upper bounds.
+
+    Quantiles are estimated by linear interpolation inside the bucket holding
+    the requested rank, like Prometheus' `histogram_quantile`.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DURATION_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """
+        Add an observation.
+
+        Args:
+            value (float): The observed value.
+        """
+
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[position] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self) -> Tuple[List[int], int, float]:
+        """
+        Return a consistent copy of the bucket counts, total count and sum.
+
+        Returns:
+            tuple: Per-bucket (non-cumulative) counts, the last one for values
+            above every bound, the number of observations and their sum.
+        """
+
+        with self._lock:
+            return list(self.counts), self.count, self.sum
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile of the observations.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimated quantile, NaN without observations. Ranks
+            falling above the last bound return the last bound.
+        """
+
+        counts, count, _ = self.snapshot()
+        if count == 0:
+            return math.nan
+
+        rank = q * count
+        cumulative = 0
+        for position, bucket_count in enumerate(counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if position == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[position - 1] if position else 0.0
+                upper = self.buckets[position]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+
+class StageMetrics:
+    """
+    Duration histograms keyed by endpoint and stage.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def stage(self, name: str):
+        """
+        Time a stage of the current request.
+
+        Args:
+            name (str): Name of the stage.
+
+        Returns:
+            A context manager timing its block, or a shared no-op one when
+            metrics are disabled.
+        """
+
+        if not self.enabled:
+            return _NULL_STAGE
+        return _StageTimer(self, name)
+
+    def start(self, name: str):
+        """
+        Mark the start of a stage that ends in a different call (see `finish`).
+
+        Args:
+            name (str): Name of the stage.
+        """
+
+        if self.enabled:
+            self._started()[name] = time.perf_counter()
+
+    def finish(self, name: str):
+        """
+        Record a stage started with `start` in the same thread.
+
+        Args:
+            name (str): Name of the stage.
+        """
+
+        if self.enabled:
+            started = self._started().pop(name, None)
+            if started is not None:
+                self.observe(name, time.perf_counter() - started)
+
+    def observe(self, name: str, seconds: float, endpoint: Optional[str] = None):
+        """
+        Record the duration of a stage.
+
+        Args:
+            name (str): Name of the stage.
+            seconds (float): Duration of the stage.
+            endpoint (Optional[str]): Endpoint the stage belongs to; defaults to
+            the endpoint of the current request.
+        """
+
+        if endpoint is None:
+            endpoint = _current_endpoint()
+        key = (endpoint, name)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        histogram.observe(seconds)
+
+    def histograms(self) -> Dict[Tuple[str, str], Histogram]:
+        """
+        Return the histograms, keyed by (endpoint, stage).
+
+        Returns:
+            dict: The histograms, sorted by key.
+        """
+
+        with self._lock:
+            return dict(sorted(self._histograms.items()))
+
+    def clear(self):
+        """
+        Drop every recorded timing.
+        """
+
+        with self._lock:
+            self._histograms.clear()
+
+    def _started(self) -> Dict[str, float]:
+        started = getattr(self._local, 'started', None)
+        if started is None:
+            started = self._local.started = {}
+        return started
+
+
+class _StageTimer:
+    __slots__ = ('metrics', 'name', 'started')
+
+    def __init__(self, metrics: StageMetrics, name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, time.perf_counter() - self.started)
+
+
+stage_metrics = StageMetrics()
+
+
+def _current_endpoint() -> str:
+    endpoint = current_endpoint.get()
+    if endpoint is not None:
+        return endpoint
+    if has_request_context():
+        return request.endpoint or NO_ENDPOINT
+    return NO_ENDPOINT
+
+
+def init_metrics(app: Flask):
+    """
+    Time every request of the application as its 'total' stage.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+
+    if not stage_metrics.enabled:
+        return
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.teardown_request
+    def observe_request_timer(_error=None):
+        started = g.pop('request_started', None)
+        if started is not None:
+            stage_metrics.observe('total', time.perf_counter() - started)
+
+
+def render_metrics() -> str:
+    """
+    Render the metrics in the Prometheus text exposition format (version 0.0.4).
+
+    Returns:
+        str: The stage duration histograms and quantile estimates, and the
+        counters of the prediction cache, the model registry and versions, the
+        shadow scorer, the prediction batcher and the passenger writer, when
+        they are in use.
+    """
+
+    lines: List[str] = []
+    _render_stages(lines, stage_metrics.histograms())
+
+    from business.passenger_business import prediction_cache
+    from business.passenger_writer import get_passenger_writer
+    from business.prediction_batcher import get_prediction_batcher
+    from business.shadow_scorer import get_shadow_scorer
+
+    cache = prediction_cache.stats()
+    _render_value(lines, 'titanic_prediction_cache_entries', 'gauge',
+                  'Entries in the prediction cache.', cache['size'])
+    for name in ('hits', 'misses', 'evictions', 'expirations'):
+        _render_value(lines, f'titanic_prediction_cache_{name}_total', 'counter',
+                      f'Prediction cache {name}.', cache[name])
+
+    registry = sys.modules.get('ml.registry')
+    if registry is not None:
+        model = registry.model_registry.stats()
+        if model['version'] is not None:
+            _render_value(lines, 'titanic_model_info', 'gauge',
+                          'Version of the loaded model.', 1, {'version': model['version']})
+            _render_value(lines, 'titanic_model_load_seconds', 'gauge',
+                          'Duration of the last model load.', model['last_load_seconds'])
+        _render_value(lines, 'titanic_model_loads_total', 'counter',
+                      'Model bundle loads.', model['loads'])
+
+    versions = sys.modules.get('ml.versions')
+    if versions is not None:
+        stats = versions.model_versions.stats()
+        _render_values(lines, 'titanic_model_traffic_percentage', 'gauge',
+                       'Share of the passengers routed to the model version.',
+                       [({'version': version}, version_stats['traffic_percentage'])
+                        for version, version_stats in stats.items()])
+        _render_values(lines, 'titanic_model_routed_total', 'counter',
+                       'Passengers routed to the model version.',
+                       [({'version': version}, version_stats['routed'])
+                        for version, version_stats in stats.items()])
+
+    scorer = get_shadow_scorer()
+    if scorer is not None:
+        stats = scorer.stats()
+        labels = {'version': stats['version']}
+        _render_value(lines, 'titanic_shadow_queue_depth', 'gauge',
+                      'Passengers waiting for the shadow model.', stats['queued'], labels)
+        for name in ('scored', 'disagreements', 'dropped', 'failed'):
+            _render_value(lines, f'titanic_shadow_{name}_total', 'counter',
+                          f'Shadow model {name}.', stats[name], labels)
+
+    batcher = get_prediction_batcher()
+    if batcher is not None:
+        stats = batcher.stats()
+        _render_value(lines, 'titanic_prediction_batcher_queue_depth', 'gauge',
+                      'Predictions waiting for a batch.', stats['queue_depth'])
+        _render_value(lines, 'titanic_prediction_batcher_max_queue_depth', 'gauge',
+                      'Largest number of predictions seen waiting for a batch.',
+                      stats['max_queue_depth'])
+        _render_batch_sizes(lines, stats['batch_sizes'], batcher.max_batch_size)
+
+    writer = get_passenger_writer()
+    if writer is not None:
+        stats = writer.stats()
+        _render_value(lines, 'titanic_passenger_writer_queue_depth', 'gauge',
+                      'Passengers waiting to be written.', stats['queued'])
+        for name in ('written', 'failed', 'batches'):
+            _render_value(lines, f'titanic_passenger_writer_{name}_total', 'counter',
+                          f'Passenger writer {name}.', stats[name])
+
+    return '\n'.join(lines) + '\n'
+
+
+def _render_stages(lines: List[str], histograms: Dict[Tuple[str, str], Histogram]):
+    name = 'titanic_stage_duration_seconds'
+    lines.append(f'# HELP {name} Duration of the request stages, per endpoint.')
+    lines.append(f'# TYPE {name} histogram')
+    for (endpoint, stage), histogram in histograms.items():
+        labels = {'endpoint': endpoint, 'stage': stage}
+        counts, count, total = histogram.snapshot()
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{_labels({**labels, 'le': _number(bound)})} {cumulative}")
+        lines.append(f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {count}")
+        lines.append(f'{name}_sum{_labels(labels)} {_number(total)}')
+        lines.append(f'{name}_count{_labels(labels)} {count}')
+
+    quantile_name = 'titanic_stage_duration_quantile_seconds'
+    lines.append(f'# HELP {quantile_name} Estimated quantiles of the request stage '
+                 'durations, per endpoint.')
+    lines.append(f'# TYPE {quantile_name} gauge')
+    for (endpoint, stage), histogram in histograms.items():
+        for q in QUANTILES:
+            labels = {'endpoint': endpoint, 'stage': stage, 'quantile': _number(q)}
+            lines.append(f'{quantile_name}{_labels(labels)} {_number(histogram.quantile(q))}')
+
+
+def _render_batch_sizes(lines: List[str], batch_sizes: Dict[int, int], max_batch_size: int):
+    name = 'titanic_prediction_batch_size'
+    bounds = [2 ** power for power in range(max(max_batch_size, 1).bit_length())]
+    if bounds[-1] < max_batch_size:
+        bounds.append(max_batch_size)
+
+    lines.append(f'# HELP {name} Number of predictions per model call of the batcher.')
+    lines.append(f'# TYPE {name} histogram')
+    for bound in bounds:
+        cumulative = sum(count for size, count in batch_sizes.items() if size <= bound)
+        lines.append(f"{name}_bucket{_labels({'le': _number(bound)})} {cumulative}")
+    lines.append(f"{name}_bucket{_labels({'le': '+Inf'})} {sum(batch_sizes.values())}")
+    lines.append(f'{name}_sum {sum(size * count for size, count in batch_sizes.items())}')
+    lines.append(f'{name}_count {sum(batch_sizes.values())}')
+
+
+def _render_value(lines: List[str], name: str, kind: str, description: str, value,
+                  labels: Optional[Dict[str, str]] = None):
+    _render_values(lines, name, kind, description, [(labels or {}, value)])
+
+
+def _render_values(lines: List[str], name: str, kind: str, description: str,
+                   samples: List[Tuple[Dict[str, str], Any]]):
+    lines.append(f'# HELP {name} {description}')
+    lines.append(f'# TYPE {name} {kind}')
+    for labels, value in samples:
+        lines.append(f'{name}{_labels(labels)} {_number(value)}')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    escaped = (f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return '{' + ','.join(escaped) + '}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _number(value) -> str:
+    if value is None:
+        return 'NaN'
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(int(value)) if value.is_integer() and abs(value) < 1e15 else repr(value)
@@ -2,69 +2,343 @@
 Business module for Passenger entities.
 """
 
-from ml.pipeline import Pipeline
-from ml.preprocessor import PreProcessor
-from schemas.passenger_dataclass import PassengerData
+import asyncio
+import contextvars
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
+from business.cache import LRUCache
+from business.config import PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL
+from business.idempotency import (
+    find_response,
+    idempotency_row,
+    purge_expired_keys_if_due,
+    remember_response,
+    request_hash,
+)
+from business.metrics import stage_metrics
+from business.passenger_writer import PassengerWriter, get_passenger_writer
+from business.prediction_batcher import get_prediction_batcher
+from business.shadow_scorer import get_shadow_scorer
+from ml import get_model_versions
+from ml.config import MODEL_LEAN
+from schemas.passenger_dataclass import PASSENGER_DATA_FIELDS, PassengerData
 from database.models.passenger import Passenger
 from database.db_setup import db
+from repositories.idempotency_repository import (
+    delete_expired_idempotency_keys,
+    insert_idempotency_keys,
+)
+from repositories.passenger_repository import insert_passenger_async, insert_passengers
+from repositories.passenger_stats_repository import increment_passenger_stats
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
 
-def create_passenger(data: PassengerData) -> Passenger:
+prediction_cache = LRUCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL)
+# Bundle digest last cached for each model version ID.
+_prediction_cache_digests: Dict[str, str] = {}
+
+
+def create_passenger(data: PassengerData,
+                     idempotency_key: Optional[str] = None) -> Dict[str, Any]:
     """
     Creates a new passenger and determines if he/she survived the collision.
 
+    The passenger is scored by the model version chosen by the traffic split,
+    which is recorded on the passenger, and queued for the shadow model, if any.
+    The passenger statistics counters are updated in the same transaction.
+    When write-behind is enabled, the passenger is queued to be written by the
+    background writer and returned right away, without an identifier.
+
+    With an idempotency key, the created passenger is stored under the key in
+    the same transaction, and a request repeating the key gets the stored
+    passenger back without being scored or inserted again.
+
     Args:
         data (PassengerData): Information about the passenger.
+        idempotency_key (Optional[str]): Key identifying retries of the request.
 
     Returns:
-        Passenger: Created passenger with survival outcome.
+        Dict[str, Any]: Created passenger with identifier and survival outcome.
+
+    Raises:
+        WriteQueueFullError: If write-behind is enabled and its queue is full.
+        IdempotencyKeyConflictError: If the key was used with another passenger.
     """
 
-    survived = get_passenger_survival_prediction(data)
+    payload_hash = None
+    if idempotency_key is not None:
+        payload_hash = request_hash(data)
+        stored = find_response(idempotency_key, payload_hash)
+        if stored is not None:
+            return stored
+
+    survived, model_version = score_passenger(data)
 
-    passenger = Passenger(name=data.name,
-                          ticket_class=data.ticket_class,
-                          sex=data.sex,
-                          age=data.age,
-                          number_siblings_spouses=data.number_siblings_spouses,
-                          number_parents_children=data.number_parents_children,
-                          ticket=data.ticket,
-                          fare=data.fare,
-                          cabin=data.cabin,
-                          embarked=data.embarked,
-                          survived=survived)
+    row = passenger_row(data, survived, model_version)
+
+    writer = get_passenger_writer()
+    if writer is not None:
+        response = {**row, 'id': None}
+        key_row = None
+        if idempotency_key is not None:
+            key_row = idempotency_row(idempotency_key, payload_hash, response)
+        with stage_metrics.stage('enqueue'):
+            writer.submit(row, key_row)
+        if key_row is not None:
+            remember_response(key_row, response)
+        return response
+
+    passenger = Passenger(**row)
 
     try:
-        db.session.add(passenger)
-        db.session.commit()
+        with stage_metrics.stage('database'):
+            db.session.add(passenger)
+            increment_passenger_stats([row])
+            db.session.flush()
+            # Read before the commit, which expires the instance.
+            response = {**row, 'id': passenger.id}
+            key_row = None
+            if idempotency_key is not None:
+                key_row = idempotency_row(idempotency_key, payload_hash, response)
+                # Replaces the key if it expired; a valid one fails the insert.
+                delete_expired_idempotency_keys(key_row['created_at'], [idempotency_key])
+                insert_idempotency_keys([key_row])
+                purge_expired_keys_if_due()
+            db.session.commit()
+    except IntegrityError as error:
+        db.session.rollback()
+        # A concurrent retry stored the key first: answer with its passenger.
+        stored = None
+        if idempotency_key is not None:
+            stored = find_response(idempotency_key, payload_hash)
+        if stored is None:
+            raise error
+        return stored
+    except Exception as error:
+        db.session.rollback()
+        raise error
+
+    if key_row is not None:
+        remember_response(key_row, response)
+    return response
+
+
+async def create_passenger_async(data: PassengerData, executor: Executor,
+                                 engine: 'AsyncEngine',
+                                 writer: Optional[PassengerWriter] = None) -> Dict[str, Any]:
+    """
+    Creates a new passenger without blocking the event loop.
+
+    The passenger is scored like in `create_passenger`, in `executor`, and the
+    passenger, together with the statistics counters, is written in one
+    transaction through the asynchronous `engine`. When a write-behind `writer`
+    is given, the passenger is queued instead.
+
+    Args:
+        data (PassengerData): Information about the passenger.
+        executor (Executor): Pool running the prediction.
+        engine (AsyncEngine): Engine of the application's database.
+        writer (Optional[PassengerWriter]): Write-behind writer of the application.
+
+    Returns:
+        Dict[str, Any]: Created passenger with identifier and survival outcome.
+
+    Raises:
+        WriteQueueFullError: If write-behind is enabled and its queue is full.
+    """
+
+    survived, model_version = await _run_in_executor(executor, score_passenger, data)
+
+    row = passenger_row(data, survived, model_version)
+
+    if writer is not None:
+        with stage_metrics.stage('enqueue'):
+            await _run_in_executor(executor, writer.submit, row)
+        return {**row, 'id': None}
+
+    with stage_metrics.stage('database'):
+        async with engine.begin() as connection:
+            passenger_id = await insert_passenger_async(connection, row)
+            await connection.run_sync(
+                lambda sync_connection: increment_passenger_stats([row], sync_connection))
+
+    return {**row, 'id': passenger_id}
+
+
+async def _run_in_executor(executor: Executor, function: Callable, *args):
+    # Run in a copy of the current context, like asyncio.to_thread, so that the
+    # stage timings are recorded for the endpoint being handled.
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, context.run, function, *args)
+
+
+def create_passengers(data: List[PassengerData]) -> List[Dict[str, Any]]:
+    """
+    Creates a batch of passengers and determines their survival outcomes.
+
+    All passengers are scored by the primary model version with a single model
+    call and written with a single bulk insert (`COPY` on PostgreSQL) inside one
+    transaction, which also updates the passenger statistics counters.
+
+    Args:
+        data (List[PassengerData]): Information about the passengers.
+
+    Returns:
+        List[Dict[str, Any]]: Created passengers with identifier and survival
+        outcome, in the same order as the input.
+    """
+
+    if not data:
+        return []
+
+    predictions = get_passengers_survival_predictions(data)
+    model_version = get_model_versions().primary
+
+    rows = [passenger_row(passenger, survived, model_version)
+            for passenger, survived in zip(data, predictions)]
 
-        return passenger
+    try:
+        with stage_metrics.stage('database'):
+            ids = insert_passengers(rows)
+            increment_passenger_stats(rows)
+            db.session.commit()
     except Exception as error:
         db.session.rollback()
         raise error
 
+    for row, passenger_id in zip(rows, ids):
+        row['id'] = passenger_id
+
+    return rows
+
+
+def passenger_row(data: PassengerData, survived: bool,
+                  model_version: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Builds the column values of a passenger.
+
+    Args:
+        data (PassengerData): Information about the passenger.
+        survived (bool): Survival outcome of the passenger.
+        model_version (Optional[str]): Version ID of the model that predicted it.
+
+    Returns:
+        Dict[str, Any]: Column values of the passenger table.
+    """
+
+    row = {field: getattr(data, field) for field in PASSENGER_DATA_FIELDS}
+    row['survived'] = survived
+    row['model_version'] = model_version
+    return row
+
+
+def score_passenger(data: PassengerData) -> Tuple[bool, str]:
+    """
+    Predicts the survival outcome of a passenger with the version chosen by the
+    traffic split, and queues it for the shadow model, if any.
+
+    Args:
+        data (PassengerData): Information about the passenger.
+
+    Returns:
+        Tuple[bool, str]: Survival outcome and version ID of the model used.
+    """
+
+    model_version = get_model_versions().route(data)
+    survived = get_passenger_survival_prediction(data, model_version)
+
+    scorer = get_shadow_scorer()
+    if scorer is not None:
+        scorer.submit(data, model_version, survived)
+
+    return survived, model_version
 
-def get_passenger_survival_prediction(data: PassengerData) -> bool:
+
+def get_passenger_survival_prediction(data: PassengerData,
+                                      model_version: Optional[str] = None) -> bool:
     """
     Utilizes a trained model to predict the passenger survival outcome.
 
+    Predictions are cached by model version and scaled feature vector, so
+    passengers that only differ in fields the model ignores (such as the ticket,
+    or a name with the same title) reuse a previous result. When prediction
+    batching is enabled, cache misses are scored together with the concurrent
+    requests.
+
     Args:
         data (PassengerData): Information about the passenger.
+        model_version (Optional[str]): Version ID of the model, or None for the
+        primary version.
 
     Returns:
         bool: Survival outcome of the provided passenger.
     """
 
-    pipeline = Pipeline()
-    preprocessor = PreProcessor()
+    versions = get_model_versions()
+    model_version = model_version or versions.primary
+    bundle = versions.registry(model_version).get()
+
+    with stage_metrics.stage('preprocessing'):
+        X_scaled = bundle.feature_builder.build(data)
+    key = (bundle.version, X_scaled.tobytes())
+
+    survived = prediction_cache.get(key)
+    if survived is None:
+        with stage_metrics.stage('predict'):
+            batcher = get_prediction_batcher()
+            if batcher is not None:
+                survived = batcher.predict(bundle, X_scaled)
+            else:
+                survived = bool(bundle.model.predict(X_scaled)[0])
+        _cache_prediction(model_version, bundle.version, key, survived)
+
+    return survived
+
+
+def _cache_prediction(model_version: str, digest: str, key, survived: bool):
+    # A reloaded bundle makes the cached predictions of its version stale.
+    previous = _prediction_cache_digests.get(model_version)
+    if digest != previous:
+        if previous is not None:
+            prediction_cache.clear()
+        _prediction_cache_digests[model_version] = digest
+    prediction_cache.set(key, survived)
+
+
+def get_passengers_survival_predictions(data: List[PassengerData]) -> List[bool]:
+    """
+    Utilizes a trained model to predict the survival outcome of many passengers.
+
+    The passengers are preprocessed together with pandas, or row by row with the
+    feature builder in lean mode.
+
+    Args:
+        data (List[PassengerData]): Information about the passengers.
+
+    Returns:
+        List[bool]: Survival outcomes, in the same order as the input.
+    """
+
+    bundle = get_model_versions().registry().get()
+
+    with stage_metrics.stage('preprocessing'):
+        if MODEL_LEAN:
+            import numpy as np
 
-    bundle = pipeline.load_pipeline("src/ml/titanic_model_bundle.pkl")
+            X_scaled = np.vstack([bundle.feature_builder.build(passenger)
+                                  for passenger in data])
+        else:
+            # Imported here so that lean workers never load pandas.
+            from ml.preprocessor import PreProcessor
 
-    model = bundle['model']
-    pp = bundle['preprocessor']
+            preprocessor = PreProcessor()
+            df = preprocessor.dataclasses_to_dataframe(data)
+            X_scaled = preprocessor.preprocess_new_data(df, bundle.preprocessor)
 
-    df = preprocessor.dataclass_to_dataframe(data)
-    X_scaled = preprocessor.preprocess_new_data(df, pp)
-    prediction = model.predict(X_scaled)
+    with stage_metrics.stage('predict'):
+        predictions = bundle.model.predict(X_scaled)
 
-    return prediction[0]
+    return [bool(prediction) for prediction in predictions]
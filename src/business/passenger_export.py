@@ -0,0 +1,74 @@
+"""
+Business module for exporting Passenger entities.
+"""
+
+import csv
+import io
+import json
+from itertools import islice
+from typing import Any, Dict, Iterator, Sequence
+from repositories.passenger_repository import stream_passengers
+
+EXPORT_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def export_passengers(export_format: str,
+                      fields: Sequence[str],
+                      filters: Dict[str, Any],
+                      chunk_size: int) -> Iterator[str]:
+    """
+    Serializes the registered passengers as a stream of NDJSON or CSV text.
+
+    Rows are read and written `chunk_size` at a time, and each chunk is yielded
+    as a single string, so the output can be sent to the client while the rest
+    of the table is still being read.
+
+    Args:
+        export_format (str): Output format, either 'ndjson' or 'csv'.
+        fields (Sequence[str]): Passenger fields to be exported, in order.
+        filters (Dict[str, Any]): Filters applied to the list.
+        chunk_size (int): Number of rows read and written at a time.
+
+    Returns:
+        Iterator[str]: Chunks of the serialized output.
+    """
+
+    rows = stream_passengers(fields, filters, chunk_size)
+
+    if export_format == 'csv':
+        return _to_csv(fields, rows, chunk_size)
+    return _to_ndjson(fields, rows, chunk_size)
+
+
+def _to_ndjson(fields, rows, chunk_size) -> Iterator[str]:
+    encoder = json.JSONEncoder(ensure_ascii=False)
+    for chunk in _chunks(rows, chunk_size):
+        yield ''.join(encoder.encode(dict(zip(fields, row))) + '\n' for row in chunk)
+
+
+def _to_csv(fields, rows, chunk_size) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield _drain(buffer)
+    for chunk in _chunks(rows, chunk_size):
+        writer.writerows(chunk)
+        yield _drain(buffer)
+
+
+def _chunks(rows, chunk_size) -> Iterator[list]:
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _drain(buffer: io.StringIO) -> str:
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return value
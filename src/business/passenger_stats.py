@@ -0,0 +1,90 @@
+"""
+Business module for the aggregate Passenger statistics.
+"""
+
+from typing import Any, Dict, Sequence
+import click
+from flask import Flask
+from flask.cli import with_appcontext
+from database.db_setup import db
+from database.models.passenger import Passenger
+from database.models.passenger_stats import PassengerStats
+from repositories.passenger_stats_repository import get_passenger_stats, rebuild_passenger_stats
+
+
+def get_passengers_stats(group_by: Sequence[str], filters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Computes the passenger counts and survival rates, overall and per group.
+
+    The counters are read from the summary table maintained on every insert,
+    so the cost does not depend on the number of registered passengers.
+
+    Args:
+        group_by (Sequence[str]): Columns among 'ticket_class', 'sex' and
+        'embarked' to group the statistics by.
+        filters (Dict[str, Any]): Filter values keyed by 'ticket_class', 'sex'
+        and 'embarked'.
+
+    Returns:
+        Dict[str, Any]: Overall 'total', 'survived' and 'survival_rate', and the
+        same counters per group in 'groups'.
+    """
+
+    groups = get_passenger_stats(group_by, filters)
+    for group in groups:
+        group['survival_rate'] = _rate(group['survived'], group['total'])
+
+    total = sum(group['total'] for group in groups)
+    survived = sum(group['survived'] for group in groups)
+
+    return {
+        'total': total,
+        'survived': survived,
+        'survival_rate': _rate(survived, total),
+        'groups': groups if group_by else [],
+    }
+
+
+def _rate(survived: int, total: int) -> float:
+    return survived / total if total else 0.0
+
+
+def rebuild_passengers_stats():
+    """
+    Recomputes the summary counters from scratch and commits them.
+    """
+
+    try:
+        rebuild_passenger_stats()
+        db.session.commit()
+    except Exception as error:
+        db.session.rollback()
+        raise error
+
+
+def init_passenger_stats(app: Flask):
+    """
+    Builds the summary counters of a database that has passengers but no counters.
+
+    This is the case the first time the application runs against a database
+    created before the summary table existed.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+
+    with app.app_context():
+        if (db.session.query(PassengerStats.total).first() is None
+                and db.session.query(Passenger.id).first() is not None):
+            rebuild_passengers_stats()
+
+
+@click.command('rebuild-stats')
+@with_appcontext
+def rebuild_stats_command():
+    """
+    Recompute the passenger statistics counters from the passenger table.
+    """
+
+    rebuild_passengers_stats()
+    click.echo('Passenger statistics rebuilt.')
@@ -0,0 +1,327 @@
+"""
+Write-behind module for Passenger entities.
+
+This module provides a `PassengerWriter` that decouples the passenger creation
+response from the database commit: rows are put in a bounded in-process queue
+and a background thread writes them in batches.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy.exc import OperationalError
+
+from business.config import (
+    PASSENGER_WRITE_BEHIND,
+    PASSENGER_WRITE_BATCH_SIZE,
+    PASSENGER_WRITE_DEAD_LETTER_PATH,
+    PASSENGER_WRITE_FLUSH_INTERVAL,
+    PASSENGER_WRITE_QUEUE_SIZE,
+    PASSENGER_WRITE_QUEUE_TIMEOUT,
+    PASSENGER_WRITE_RETRIES,
+    PASSENGER_WRITE_RETRY_BACKOFF,
+)
+from business.idempotency import purge_expired_keys_if_due
+from database.db_setup import db
+from repositories.idempotency_repository import claim_idempotency_keys
+from repositories.passenger_repository import insert_passengers
+from repositories.passenger_stats_repository import increment_passenger_stats
+
+logger = logging.getLogger(__name__)
+
+# A queued passenger row and the idempotency key row written with it, if any.
+_Item = Tuple[Dict[str, Any], Optional[Dict[str, Any]]]
+
+# Serializes the appends of the writers sharing a dead-letter file.
+_dead_letter_lock = threading.Lock()
+
+
+class WriteQueueFullError(Exception):
+    """
+    Raised when the write-behind queue stays full for longer than the put timeout.
+    """
+
+
+class PassengerWriter:
+    """
+    Background writer draining a bounded queue of passenger rows.
+
+    A batch is written as soon as `batch_size` rows are queued or `flush_interval`
+    seconds after its first row arrived, whichever comes first, with a single
+    `executemany` insert (`COPY` on PostgreSQL), one update of the statistics
+    counters and one commit. When the queue is full, `submit` blocks for up to
+    `put_timeout` seconds and then raises `WriteQueueFullError`, pushing back
+    on the callers. `stop` writes every queued row before returning.
+
+    A batch failing with a transient database error is retried up to `retries`
+    times with exponential backoff. A batch that still fails is written row by
+    row, so that one bad row does not drop the others, and the rows that fail
+    on their own are appended to the JSON Lines file at `dead_letter_path`
+    to be recovered.
+    """
+
+    def __init__(self, app: Flask,
+                 batch_size: int = PASSENGER_WRITE_BATCH_SIZE,
+                 flush_interval: float = PASSENGER_WRITE_FLUSH_INTERVAL,
+                 max_queue_size: int = PASSENGER_WRITE_QUEUE_SIZE,
+                 put_timeout: float = PASSENGER_WRITE_QUEUE_TIMEOUT,
+                 retries: int = PASSENGER_WRITE_RETRIES,
+                 retry_backoff: float = PASSENGER_WRITE_RETRY_BACKOFF,
+                 dead_letter_path: str = PASSENGER_WRITE_DEAD_LETTER_PATH):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.dead_letter_path = dead_letter_path
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._stopping = threading.Event()
+        # Guards the stopping check and the put in `submit` against `stop`, and
+        # wakes the callers waiting for room in the queue.
+        self._space = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self._written = 0
+        self._failed = 0
+        self._duplicates = 0
+        self._batches = 0
+
+    def start(self):
+        """
+        Start the background thread and register the final flush at exit.
+        """
+
+        self._thread = threading.Thread(target=self._run, name='passenger-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def submit(self, row: Dict[str, Any], idempotency_key: Optional[Dict[str, Any]] = None):
+        """
+        Queue a passenger row to be written.
+
+        Args:
+            row (Dict[str, Any]): Column values of the passenger.
+            idempotency_key (Optional[Dict[str, Any]]): Column values of the
+            idempotency key to be written with the passenger.
+
+        Raises:
+            WriteQueueFullError: If the queue stayed full for `put_timeout` seconds
+            or the writer is stopping.
+        """
+
+        deadline = time.monotonic() + self.put_timeout
+        with self._space:
+            while True:
+                if self._stopping.is_set():
+                    raise WriteQueueFullError('The passenger writer is stopping.')
+                try:
+                    self._queue.put_nowait((row, idempotency_key))
+                    return
+                except queue.Full as error:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise WriteQueueFullError('The passenger write queue is full.') from error
+                self._space.wait(remaining)
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop accepting rows, write the queued ones and stop the background thread.
+
+        Args:
+            timeout (Optional[float]): Maximum time to wait for the final flush.
+        """
+
+        # No row can be queued once the flag is set, so the final drain below
+        # writes every accepted row.
+        with self._space:
+            self._stopping.set()
+            self._space.notify_all()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+        if self._thread is None or not self._thread.is_alive():
+            self._flush_remaining()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the writer counters.
+
+        Returns:
+            dict: Queue depth and numbers of written rows, failed rows, rows
+            dropped as retries of a stored idempotency key, and batches.
+        """
+
+        with self._stats_lock:
+            return {
+                'queued': self._queue.qsize(),
+                'written': self._written,
+                'failed': self._failed,
+                'duplicates': self._duplicates,
+                'batches': self._batches,
+            }
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+        self._flush_remaining()
+
+    def _flush_remaining(self):
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            self._write(batch)
+
+    def _get(self, timeout: Optional[float] = None) -> _Item:
+        item = self._queue.get(timeout=timeout) if timeout is not None else self._queue.get_nowait()
+        with self._space:
+            self._space.notify()
+        return item
+
+    def _next_batch(self) -> List[_Item]:
+        try:
+            batch = [self._get(self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._get(remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self) -> List[_Item]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._get())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[_Item]):
+        for attempt in range(self.retries + 1):
+            try:
+                duplicates = self._commit(batch)
+            except OperationalError:
+                if attempt == self.retries:
+                    logger.exception('Failed to write a batch of %d passengers.', len(batch))
+                    break
+                logger.warning('Retrying a batch of %d passengers after a database error.',
+                               len(batch), exc_info=True)
+                time.sleep(self.retry_backoff * 2 ** attempt)
+            except Exception:
+                logger.exception('Failed to write a batch of %d passengers.', len(batch))
+                break
+            else:
+                with self._stats_lock:
+                    self._written += len(batch) - duplicates
+                    self._duplicates += duplicates
+                    self._batches += 1
+                return
+
+        written = failed = duplicates = 0
+        for item in batch:
+            try:
+                dropped = self._commit([item])
+                written += 1 - dropped
+                duplicates += dropped
+            except Exception as error:
+                logger.exception('Failed to write a queued passenger.')
+                self._dead_letter(item, error)
+                failed += 1
+
+        with self._stats_lock:
+            self._written += written
+            self._failed += failed
+            self._duplicates += duplicates
+            self._batches += 1
+
+    def _commit(self, batch: List[_Item]) -> int:
+        # Returns the number of rows dropped as retries of a stored key.
+        with self.app.app_context():
+            try:
+                # The keys are claimed first: a row whose key is held by a
+                # valid entry, stored by an earlier batch, another process or
+                # the synchronous path, is a retry already answered and is
+                # dropped. Within the batch, the first row of a key wins.
+                keys = list({key['key']: key for _, key in reversed(batch)
+                             if key is not None}.values())
+                claimed = claim_idempotency_keys(keys)
+                rows = []
+                for row, key in batch:
+                    if key is None:
+                        rows.append(row)
+                    elif key['key'] in claimed:
+                        claimed.discard(key['key'])
+                        rows.append(row)
+                insert_passengers(rows, returning_ids=False)
+                increment_passenger_stats(rows)
+                if keys:
+                    purge_expired_keys_if_due()
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+        return len(batch) - len(rows)
+
+    def _dead_letter(self, item: _Item, error: Exception):
+        row, key = item
+        line = json.dumps({'passenger': row, 'idempotency_key': key, 'error': str(error)},
+                          default=str)
+        try:
+            with _dead_letter_lock, open(self.dead_letter_path, 'a', encoding='utf-8') as file:
+                file.write(line + '\n')
+        except OSError:
+            logger.exception('Failed to keep a passenger in %s: %s', self.dead_letter_path, line)
+
+
+def init_passenger_writer(app: Flask):
+    """
+    Start the write-behind writer of an application when PASSENGER_WRITE_BEHIND
+    is enabled.
+
+    The writer is bound to the application and its database, so each
+    application gets its own, stored in `app.extensions['passenger_writer']`.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+
+    if PASSENGER_WRITE_BEHIND and 'passenger_writer' not in app.extensions:
+        writer = PassengerWriter(app)
+        writer.start()
+        app.extensions['passenger_writer'] = writer
+
+
+def get_passenger_writer(app: Optional[Flask] = None) -> Optional[PassengerWriter]:
+    """
+    Return the write-behind writer of an application, or None when write-behind
+    is disabled.
+
+    Args:
+        app (Optional[Flask]): The application; defaults to the current one.
+
+    Returns:
+        Optional[PassengerWriter]: The running writer.
+    """
+
+    if app is None:
+        if not has_app_context():
+            return None
+        app = current_app
+    return app.extensions.get('passenger_writer')
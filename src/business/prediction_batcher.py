@@ -0,0 +1,246 @@
+"""
+Micro-batching module for single-passenger predictions.
+
+This module provides a `PredictionBatcher` that groups the feature vectors of
+concurrent requests and scores each group with a single model call, since the
+kernel evaluation of the SVM costs far less per row on a batch than on a
+one-row matrix.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from business.config import (
+    INFERENCE_POOL_PROCESSES,
+    PREDICTION_BATCHING,
+    PREDICTION_BATCH_MAX_WAIT,
+    PREDICTION_BATCH_MAX_SIZE,
+    PREDICTION_BATCH_TIMEOUT,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from ml.registry import ModelBundle
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class PredictionBatcher:
+    """
+    Background scheduler scoring queued feature vectors in batches.
+
+    A batch is scored as soon as `max_batch_size` vectors are queued or
+    `max_wait` seconds after its first vector arrived, whichever comes first.
+    Vectors built from different model versions (during a reload) are scored
+    by their own model. Each caller blocks until its own result is ready, for
+    at most `timeout` seconds; when the batcher is not running, callers are
+    scored directly. Queuing a vector and stopping the batcher hold the same
+    lock, so no vector is queued after the final drain.
+    """
+
+    def __init__(self,
+                 max_wait: float = PREDICTION_BATCH_MAX_WAIT,
+                 max_batch_size: int = PREDICTION_BATCH_MAX_SIZE,
+                 timeout: float = PREDICTION_BATCH_TIMEOUT):
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self._queue: queue.Queue = queue.Queue()
+        self._running = False
+        self._running_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._predictions = 0
+        self._max_queue_depth = 0
+        self._batch_sizes: Counter = Counter()
+
+    def start(self):
+        """
+        Start the background thread and register its shutdown at exit.
+        """
+
+        with self._running_lock:
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name='prediction-batcher', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """
+        Score the queued vectors and stop the background thread.
+        """
+
+        if not self._close():
+            return
+        if self._thread is not None:
+            self._thread.join()
+        self._score(self._drain())
+
+    def predict(self, bundle: 'ModelBundle', features: 'np.ndarray') -> bool:
+        """
+        Predict the survival outcome of one passenger within a batch.
+
+        Args:
+            bundle (ModelBundle): Model bundle the features were built with.
+            features (np.ndarray): Scaled feature vector, of shape (1, n_features).
+
+        Returns:
+            bool: Survival outcome of the passenger.
+
+        Raises:
+            concurrent.futures.TimeoutError: If the batch is not scored within `timeout` seconds.
+        """
+
+        future: Future = Future()
+        with self._running_lock:
+            running = self._running
+            if running:
+                self._queue.put((bundle, features, future))
+        if not running:
+            return bool(bundle.model.predict(features)[0])
+
+        depth = self._queue.qsize()
+        if depth > self._max_queue_depth:
+            with self._stats_lock:
+                self._max_queue_depth = max(self._max_queue_depth, depth)
+
+        return future.result(timeout=self.timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the batcher counters.
+
+        Returns:
+            dict: Current and maximum queue depth, numbers of batches and
+            predictions, and the number of batches per batch size.
+        """
+
+        with self._stats_lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self._max_queue_depth,
+                'batches': self._batches,
+                'predictions': self._predictions,
+                'batch_sizes': dict(sorted(self._batch_sizes.items())),
+            }
+
+    def _close(self) -> bool:
+        # Mark the batcher stopped and queue the stop marker, atomically with
+        # respect to `predict`; returns False when it was already stopped.
+        with self._running_lock:
+            if not self._running:
+                return False
+            self._running = False
+            self._queue.put(_STOP)
+            return True
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._score(batch)
+
+    def _next_batch(self) -> Tuple[List[Tuple['ModelBundle', 'np.ndarray', Future]], bool]:
+        item = self._queue.get()
+        if item is _STOP:
+            return self._drain(), True
+
+        batch = [item]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 \
+                    else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch + self._drain(), True
+            batch.append(item)
+        return batch, False
+
+    def _drain(self) -> List[Tuple['ModelBundle', 'np.ndarray', Future]]:
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return batch
+            if item is not _STOP:
+                batch.append(item)
+
+    def _score(self, batch: List[Tuple['ModelBundle', 'np.ndarray', Future]]):
+        if not batch:
+            return
+
+        import numpy as np
+
+        groups: Dict[str, List[Tuple['ModelBundle', 'np.ndarray', Future]]] = {}
+        for item in batch:
+            groups.setdefault(item[0].version, []).append(item)
+
+        for items in groups.values():
+            model = items[0][0].model
+            try:
+                predictions = model.predict(np.vstack([features for _, features, _ in items]))
+            except Exception as error:
+                logger.exception('Failed to score a batch of %d passengers.', len(items))
+                for _, _, future in items:
+                    future.set_exception(error)
+                continue
+
+            for (_, _, future), prediction in zip(items, predictions):
+                future.set_result(bool(prediction))
+
+            with self._stats_lock:
+                self._batches += 1
+                self._predictions += len(items)
+                self._batch_sizes[len(items)] += 1
+
+
+_batcher: Optional[PredictionBatcher] = None
+
+
+def init_prediction_batcher():
+    """
+    Start the prediction batcher when PREDICTION_BATCHING is enabled, or the
+    multi-process inference pool when INFERENCE_POOL_PROCESSES is positive.
+
+    The batcher only holds model bundles, not application state, so it is
+    started once per process and shared by every application.
+    """
+
+    global _batcher
+
+    if _batcher is not None:
+        return
+    if INFERENCE_POOL_PROCESSES > 0:
+        from business.inference_pool import InferencePool
+
+        _batcher = InferencePool(INFERENCE_POOL_PROCESSES)
+        _batcher.start()
+    elif PREDICTION_BATCHING:
+        _batcher = PredictionBatcher()
+        _batcher.start()
+
+
+def get_prediction_batcher() -> Optional[PredictionBatcher]:
+    """
+    Return the prediction batcher, or None when batching is disabled.
+
+    Returns:
+        Optional[PredictionBatcher]: The running batcher or inference pool.
+    """
+
+    return _batcher
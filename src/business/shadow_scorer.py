@@ -0,0 +1,198 @@
+"""
+Shadow scoring module.
+
+This module provides a `ShadowScorer` that scores passengers again with the
+shadow model version, off the request path: the primary response only pays for
+putting the passenger in a bounded in-process queue, and background threads
+compare the shadow predictions with the primary ones and log disagreements.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from business.config import (
+    SHADOW_SCORING_MAX_BATCH_SIZE,
+    SHADOW_SCORING_QUEUE_SIZE,
+    SHADOW_SCORING_WORKERS,
+)
+from ml import get_model_versions
+from ml.config import MODEL_SHADOW_VERSION
+from schemas.passenger_dataclass import PassengerData
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class ShadowScorer:
+    """
+    Background scorer comparing the shadow model with the primary predictions.
+
+    `submit` never blocks: when the queue is full the passenger is dropped and
+    counted, so a slow shadow model bounds its own backlog instead of slowing
+    the requests down. The queued passengers are scored in batches of up to
+    `max_batch_size` with one model call. Passengers routed to the shadow
+    version itself are not scored again. `stop` scores the queued passengers
+    before returning.
+
+    Args:
+        version (str): Version ID of the shadow model.
+        workers (int): Number of background threads.
+        max_queue_size (int): Maximum number of passengers waiting to be scored.
+        max_batch_size (int): Maximum number of passengers scored per model call.
+    """
+
+    def __init__(self, version: str, workers: int = SHADOW_SCORING_WORKERS,
+                 max_queue_size: int = SHADOW_SCORING_QUEUE_SIZE,
+                 max_batch_size: int = SHADOW_SCORING_MAX_BATCH_SIZE):
+        self.version = version
+        self.workers = workers
+        self.max_batch_size = max_batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._threads: List[threading.Thread] = []
+        self._running = False
+        self._stats_lock = threading.Lock()
+        self._scored = 0
+        self._disagreements = 0
+        self._dropped = 0
+        self._failed = 0
+
+    def start(self):
+        """
+        Start the background threads and register their shutdown at exit.
+        """
+
+        self._running = True
+        self._threads = [threading.Thread(target=self._run, name=f'shadow-scorer-{position}',
+                                          daemon=True)
+                         for position in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """
+        Score the queued passengers and stop the background threads.
+        """
+
+        if not self._running:
+            return
+        self._running = False
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def submit(self, data: PassengerData, version: str, survived: bool):
+        """
+        Queue a scored passenger for the shadow model, without waiting.
+
+        Args:
+            data (PassengerData): Information about the passenger.
+            version (str): Version ID of the model that scored the passenger.
+            survived (bool): Survival outcome predicted by that model.
+        """
+
+        if not self._running or version == self.version:
+            return
+        try:
+            self._queue.put_nowait((data, version, survived))
+        except queue.Full:
+            with self._stats_lock:
+                self._dropped += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the shadow scoring counters.
+
+        Returns:
+            dict: Shadow version, queue depth and numbers of scored, disagreeing,
+            dropped and failed passengers.
+        """
+
+        with self._stats_lock:
+            return {
+                'version': self.version,
+                'queued': self._queue.qsize(),
+                'scored': self._scored,
+                'disagreements': self._disagreements,
+                'dropped': self._dropped,
+                'failed': self._failed,
+            }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # Score whatever else is queued with the same model call, so the
+            # shadow threads take the GIL from the requests as rarely as possible.
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = _STOP in batch
+            self._score([item for item in batch if item is not _STOP])
+        # Another worker's stop marker may have been taken along with this one.
+        for _ in range(batch.count(_STOP) - 1):
+            self._queue.put(_STOP)
+
+    def _score(self, batch: List[Tuple[PassengerData, str, bool]]):
+        if not batch:
+            return
+        try:
+            import numpy as np
+
+            bundle = get_model_versions().registry(self.version).get()
+            features = np.vstack([bundle.feature_builder.build(data) for data, _, _ in batch])
+            predictions = bundle.model.predict(features)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Shadow model %s failed to score %d passengers.',
+                             self.version, len(batch))
+            with self._stats_lock:
+                self._failed += len(batch)
+            return
+
+        disagreements = 0
+        for (data, version, survived), prediction in zip(batch, predictions):
+            if bool(prediction) != survived:
+                disagreements += 1
+                logger.info('Shadow model %s predicted survived=%s for passenger %r '
+                            '(ticket %s), model %s predicted survived=%s.', self.version,
+                            bool(prediction), data.name, data.ticket, version, survived)
+        with self._stats_lock:
+            self._scored += len(batch)
+            self._disagreements += disagreements
+
+
+_scorer: Optional[ShadowScorer] = None
+
+
+def init_shadow_scorer():
+    """
+    Start the shadow scorer when a shadow model version (MODEL_SHADOW_VERSION) is set.
+
+    Like the model versions it scores with, the scorer holds no application
+    state, so it is started once per process and shared by every application.
+    """
+
+    global _scorer
+
+    if MODEL_SHADOW_VERSION and _scorer is None:
+        _scorer = ShadowScorer(MODEL_SHADOW_VERSION)
+        _scorer.start()
+
+
+def get_shadow_scorer() -> Optional[ShadowScorer]:
+    """
+    Return the shadow scorer, or None when shadow scoring is disabled.
+
+    Returns:
+        Optional[ShadowScorer]: The running scorer.
+    """
+
+    return _scorer
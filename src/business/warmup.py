@@ -0,0 +1,170 @@
+"""
+Warm-up module for the application.
+
+This module provides a `WarmUp` that, at start-up, loads the model bundles, runs
+a synthetic passenger through both prediction paths and opens a database
+connection, so the first real requests do not pay for them. Its status backs
+the liveness and readiness endpoints.
+"""
+
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from flask import Flask
+from sqlalchemy import text
+
+from business.config import MODEL_WARMUP
+from business.passenger_business import (
+    get_passenger_survival_prediction,
+    get_passengers_survival_predictions,
+)
+from database.db_setup import db
+from ml import get_model_registry, get_model_versions
+from schemas.passenger_dataclass import PassengerData
+
+logger = logging.getLogger(__name__)
+
+WARMUP_PASSENGER = PassengerData(name='Snyder, Mrs. John Pillsbury (Nelle Stevenson)',
+                                 ticket_class=1, sex='female', number_siblings_spouses=1,
+                                 number_parents_children=0, ticket='21228', fare=82.2667,
+                                 cabin='B45', embarked='Cherbourg')
+
+
+class WarmUp:
+    """
+    Start-up warm-up of an application and its readiness status.
+
+    The application is ready once every warm-up step succeeded. A failed step
+    is logged and leaves the application not ready.
+    """
+
+    def __init__(self, app: Flask):
+        self.app = app
+        self.ready = False
+        self.error: Optional[str] = None
+        self.steps: Dict[str, float] = {}
+        self.seconds: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """
+        Run the warm-up in a background thread.
+        """
+
+        self._thread = threading.Thread(target=self.run, name='warm-up', daemon=True)
+        self._thread.start()
+
+    def run(self):
+        """
+        Run the warm-up steps and mark the application as ready.
+        """
+
+        started = time.perf_counter()
+        try:
+            with self._step('model'):
+                self._model_registry().get()
+                for registry in self._model_versions().registries.values():
+                    registry.get()
+            with self._step('prediction'):
+                get_passengers_survival_predictions([WARMUP_PASSENGER])
+                get_passenger_survival_prediction(WARMUP_PASSENGER)
+            with self._step('database'):
+                with self.app.app_context():
+                    db.session.execute(text('SELECT 1'))
+                    db.session.remove()
+        except Exception as error:
+            logger.exception('Warm-up failed.')
+            self.error = f'{type(error).__name__}: {error}'
+            return
+        finally:
+            self.seconds = time.perf_counter() - started
+
+        self.ready = True
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Return the readiness status.
+
+        Returns:
+            dict: Status ('ok', 'warming_up' or 'failed'), readiness, model
+            version and load time, warm-up duration per step, and the warm-up
+            error, if any.
+        """
+
+        # The model is only described once something imported the registry,
+        # so a status request never triggers the import itself.
+        registry = sys.modules.get('ml.registry')
+        model = registry.model_registry.stats() if registry is not None else {}
+
+        if self.ready:
+            status = 'ok'
+        elif self.error is not None:
+            status = 'failed'
+        else:
+            status = 'warming_up'
+
+        return {
+            'status': status,
+            'ready': self.ready,
+            'model_version': model.get('version'),
+            'model_load_seconds': model.get('last_load_seconds'),
+            'warmup_seconds': self.seconds,
+            'steps': dict(self.steps),
+            'error': self.error,
+        }
+
+    @contextmanager
+    def _step(self, name: str):
+        started = time.perf_counter()
+        yield
+        self.steps[name] = time.perf_counter() - started
+
+    _model_registry = staticmethod(get_model_registry)
+    _model_versions = staticmethod(get_model_versions)
+
+
+def init_warmup(app: Flask, background: bool = True) -> WarmUp:
+    """
+    Register the warm-up of an application and start it when MODEL_WARMUP is enabled.
+
+    When the warm-up is disabled, the application is ready right away and the
+    model is loaded by the first prediction.
+
+    Args:
+        app (Flask): The Flask application instance.
+        background (bool): Whether to run the warm-up in a background thread,
+        so the application can answer liveness probes meanwhile.
+
+    Returns:
+        WarmUp: The warm-up, also stored in `app.extensions['warmup']`.
+    """
+
+    warmup = WarmUp(app)
+    app.extensions['warmup'] = warmup
+
+    if not MODEL_WARMUP:
+        warmup.ready = True
+    elif background:
+        warmup.start()
+    else:
+        warmup.run()
+
+    return warmup
+
+
+def get_warmup_status(app: Flask) -> Dict[str, Any]:
+    """
+    Return the warm-up status of an application.
+
+    Args:
+        app (Flask): The Flask application instance.
+
+    Returns:
+        dict: The status returned by `WarmUp.status`.
+    """
+
+    return app.extensions['warmup'].status()
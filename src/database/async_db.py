@@ -0,0 +1,69 @@
+"""
+Asynchronous access to the database, for the ASGI serving mode.
+
+The application's database URL is mapped to an asyncio driver (aiosqlite for
+SQLite, asyncpg or psycopg 3 for PostgreSQL) and an `AsyncEngine` is created
+with the same pool settings and SQLite pragmas as the synchronous engine.
+"""
+
+import importlib.util
+from typing import Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from database.db_setup import configure_engine, engine_options
+
+# Asynchronous drivers per dialect, in order of preference.
+ASYNC_DRIVERS = {
+    'sqlite': ('aiosqlite',),
+    'postgresql': ('asyncpg', 'psycopg'),
+}
+
+
+def async_database_url(url: str) -> Optional[str]:
+    """
+    Map a database URL to the same database through an asyncio driver.
+
+    Args:
+        url (str): Database URL of the application.
+
+    Returns:
+        Optional[str]: The URL with an installed asynchronous driver, or None
+        when the dialect has none.
+    """
+
+    parsed = make_url(url)
+    for driver in ASYNC_DRIVERS.get(parsed.get_backend_name(), ()):
+        if importlib.util.find_spec(driver) is not None:
+            return parsed.set(drivername=f'{parsed.get_backend_name()}+{driver}') \
+                .render_as_string(hide_password=False)
+    return None
+
+
+def create_async_db_engine(url: str) -> Optional[AsyncEngine]:
+    """
+    Create an asynchronous engine for the application's database.
+
+    Args:
+        url (str): Database URL of the application.
+
+    Returns:
+        Optional[AsyncEngine]: The engine, or None when no asynchronous driver
+        is installed for the database.
+    """
+
+    async_url = async_database_url(url)
+    if async_url is None:
+        return None
+
+    options = engine_options(url)
+    if make_url(async_url).get_backend_name() == 'sqlite' and 'pool_size' in options:
+        # SQLite has a single writer: with one connection, concurrent
+        # transactions wait for it on the event loop instead of contending for
+        # the database lock until the busy timeout.
+        options.update(pool_size=1, max_overflow=0)
+
+    engine = create_async_engine(async_url, **options)
+    configure_engine(engine.sync_engine)
+    return engine
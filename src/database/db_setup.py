@@ -2,9 +2,20 @@
 Setup module for the database.
 """
 
+from typing import Any, Dict
 from flask_sqlalchemy import SQLAlchemy
 from flask import Flask
-from database.config import DATABASE_URI
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Engine, make_url
+from database.config import (
+    DATABASE_URI,
+    DATABASE_POOL_SIZE,
+    DATABASE_MAX_OVERFLOW,
+    DATABASE_POOL_TIMEOUT,
+    DATABASE_POOL_RECYCLE,
+    DATABASE_POOL_PRE_PING,
+    SQLITE_PRAGMAS,
+)
 
 db = SQLAlchemy()
 
@@ -13,12 +24,139 @@ def init_db(app: Flask):
     """
     Initialize database.
 
+    Connects to the database configured in the application (defaulting to
+    DATABASE_URL, or the local SQLite file), configures the connection pool,
+    applies the SQLite pragmas on every new connection, creates the missing
+    tables, columns and indexes.
+
     Args:
         app (Flask): The Flask application instance.
     """
-    app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URI
+    app.config.setdefault('SQLALCHEMY_DATABASE_URI', DATABASE_URI)
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS',
+                          engine_options(app.config['SQLALCHEMY_DATABASE_URI']))
     db.init_app(app)
 
     with app.app_context():
+        configure_engine(db.engine)
         db.create_all()
+        create_missing_columns(db.engine)
+        create_missing_indexes(db.engine)
+
+
+def engine_options(url: str = DATABASE_URI) -> Dict[str, Any]:
+    """
+    Build the engine options for the configured connection pool.
+
+    In-memory SQLite databases live in a single connection shared through a
+    `StaticPool`, which takes no pool size, overflow or timeout.
+
+    Args:
+        url (str): URL of the database.
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for `create_engine`.
+    """
+
+    options = {
+        'pool_recycle': DATABASE_POOL_RECYCLE,
+        'pool_pre_ping': DATABASE_POOL_PRE_PING,
+    }
+    if not is_sqlite_memory(url):
+        options.update({
+            'pool_size': DATABASE_POOL_SIZE,
+            'max_overflow': DATABASE_MAX_OVERFLOW,
+            'pool_timeout': DATABASE_POOL_TIMEOUT,
+        })
+    return options
+
+
+def is_sqlite_memory(url: str) -> bool:
+    """
+    Tell whether a database URL points to an in-memory SQLite database.
+
+    Args:
+        url (str): URL of the database.
+
+    Returns:
+        bool: True for `sqlite://`, `sqlite:///:memory:` and `mode=memory` URIs.
+    """
+
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and (
+        url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory')
+
+
+def configure_engine(engine: Engine):
+    """
+    Register the connection hooks of an engine.
+
+    For SQLite, the configured pragmas (WAL journal, synchronous level, cache and
+    mmap sizes, busy timeout) are applied to every new connection.
+
+    Args:
+        engine (Engine): The engine to be configured.
+    """
+
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', apply_sqlite_pragmas)
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Apply the configured pragmas to a new SQLite connection.
+
+    Args:
+        dbapi_connection: The raw sqlite3 connection.
+        connection_record: The pool's record of the connection.
+    """
+
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+    finally:
+        cursor.close()
+
+
+def create_missing_columns(engine: Engine):
+    """
+    Add the nullable columns declared on the models that do not exist yet.
+
+    `create_all` skips tables that already exist, so nullable columns added to an
+    existing model are created here with `ALTER TABLE ... ADD COLUMN`; their
+    value is NULL on the existing rows.
+
+    Args:
+        engine (Engine): The engine connected to the database.
+    """
+
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+    with engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                connection.execute(text(
+                    f'ALTER TABLE {preparer.format_table(table)} '
+                    f'ADD COLUMN {preparer.format_column(column)} '
+                    f'{column.type.compile(dialect=engine.dialect)}'))
+
+
+def create_missing_indexes(engine: Engine):
+    """
+    Create the indexes declared on the models that do not exist yet.
+
+    `create_all` skips tables that already exist, together with their indexes,
+    so indexes added to an existing model are created here.
+
+    Args:
+        engine (Engine): The engine connected to the database.
+    """
+
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
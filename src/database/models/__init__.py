@@ -1 +1,3 @@
 from .passenger import Passenger
+from .passenger_stats import PassengerStats
+from .idempotency_key import IdempotencyKey
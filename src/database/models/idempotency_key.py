@@ -0,0 +1,29 @@
+"""
+This module defines the IdempotencyKey model for the database.
+"""
+
+from database.db_setup import db
+
+
+class IdempotencyKey(db.Model):
+    """
+    Represents the stored outcome of a request sent with an `Idempotency-Key` header.
+
+    A retry carrying the same key is answered with the stored response instead
+    of being processed again, until the key expires.
+
+    Attributes:
+        key (str): The client-provided idempotency key.
+        request_hash (str): SHA-256 digest of the request payload the key was used with.
+        response (str): The JSON response body returned to the original request.
+        created_at (datetime): Timestamp when the original request was processed.
+        expires_at (datetime): Timestamp after which the key can be reused.
+    """
+
+    __tablename__ = 'idempotency_key'
+
+    key = db.Column(db.String(255), primary_key=True)
+    request_hash = db.Column(db.String(64), nullable=False)
+    response = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
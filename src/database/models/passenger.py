@@ -23,6 +23,7 @@ class Passenger(db.Model):
         cabin (str): Number of the cabin.
         embarked (str): Passenger's boarding port.
         survived (bool): The fate of the passenger after the collision.
+        model_version (str): Version ID of the model that predicted `survived`.
         created_at (datetime): Timestamp when the record was created.
         updated_at (datetime): Timestamp when the record was last updated.
     """
@@ -31,19 +32,21 @@ class Passenger(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
-    ticket_class = db.Column(db.Integer, nullable=False)
-    sex = db.Column(db.String(10), nullable=False)
+    ticket_class = db.Column(db.Integer, nullable=False, index=True)
+    sex = db.Column(db.String(10), nullable=False, index=True)
     age = db.Column(db.Float, nullable=True)
     number_siblings_spouses = db.Column(db.Integer, nullable=False)
     number_parents_children = db.Column(db.Integer, nullable=False)
     ticket = db.Column(db.String, nullable=False)
     fare = db.Column(db.Float, nullable=False)
-    cabin = db.Column(db.String(3), nullable=True)
+    cabin = db.Column(db.String, nullable=True)
     embarked = db.Column(db.String(11), nullable=True)
-    survived = db.Column(db.Boolean, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.now(timezone.utc))
+    survived = db.Column(db.Boolean, nullable=False, index=True)
+    model_version = db.Column(db.String(64), nullable=True, index=True)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
     updated_at = db.Column(
-        db.DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+        db.DateTime, default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc))
 
 
 def __init__(
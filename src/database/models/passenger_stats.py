@@ -0,0 +1,30 @@
+"""
+This module defines the PassengerStats model for the database.
+"""
+
+from database.db_setup import db
+
+
+class PassengerStats(db.Model):
+    """
+    Represents the passenger counters of one (ticket class, sex, port) group.
+
+    The counters are kept up to date on every passenger insert, so aggregate
+    statistics are read from this summary table instead of scanning the
+    passenger table.
+
+    Attributes:
+        ticket_class (int): Class of the ticket.
+        sex (str): Gender of the passengers.
+        embarked (str): Boarding port of the passengers ('' when unknown).
+        total (int): Number of passengers in the group.
+        survived (int): Number of surviving passengers in the group.
+    """
+
+    __tablename__ = 'passenger_stats'
+
+    ticket_class = db.Column(db.Integer, primary_key=True)
+    sex = db.Column(db.String(10), primary_key=True)
+    embarked = db.Column(db.String(11), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    survived = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,33 @@
+"""
+Machine learning package.
+
+The process-wide model registry and model versions are reached through the
+accessors below, which import them on first use, so that starting the
+application does not import NumPy and the model artifacts.
+"""
+
+
+def get_model_registry():
+    """
+    Return the process-wide model registry.
+
+    Returns:
+        ModelRegistry: The registry of the bundle at MODEL_BUNDLE_PATH.
+    """
+
+    from ml.registry import model_registry
+
+    return model_registry
+
+
+def get_model_versions():
+    """
+    Return the process-wide model versions.
+
+    Returns:
+        ModelVersions: The primary and candidate bundles, by version ID.
+    """
+
+    from ml.versions import model_versions
+
+    return model_versions
@@ -0,0 +1,131 @@
+"""
+Array-backed model module.
+
+This module provides NumPy-only equivalents of the fitted estimators stored in
+the model bundle: an RBF kernel SVM scorer, a label encoder and a standard
+scaler. They are rebuilt from plain arrays, so they can be loaded without
+unpickling and can use memory-mapped, read-only arrays.
+"""
+
+import numpy as np
+
+
+class RBFSVCScorer:
+    """
+    NumPy implementation of the `predict` method of a fitted binary RBF `SVC`.
+
+    The decision function is `dual_coef . exp(-gamma * ||x - sv||^2) + intercept`,
+    and samples with a positive decision value are assigned the second class.
+    """
+
+    def __init__(self, support_vectors, dual_coef, intercept, gamma, classes):
+        self.support_vectors = support_vectors
+        self.dual_coef = dual_coef
+        self.intercept = float(intercept)
+        self.gamma = float(gamma)
+        self.classes = np.asarray(classes)
+        self.support_norms = np.einsum('ij,ij->i', support_vectors, support_vectors)
+
+    def decision_function(self, X) -> np.ndarray:
+        """
+        Compute the signed distance of each sample to the separating hyperplane.
+
+        Args:
+            X (np.ndarray): Scaled feature array of shape (n_samples, n_features).
+
+        Returns:
+            np.ndarray: Decision values of shape (n_samples,).
+        """
+
+        X = np.asarray(X, dtype=float)
+        distances = np.einsum('ij,ij->i', X, X)[:, None] + self.support_norms[None, :]
+        distances -= 2 * (X @ self.support_vectors.T)
+        np.maximum(distances, 0, out=distances)
+        np.multiply(distances, -self.gamma, out=distances)
+        np.exp(distances, out=distances)
+        return distances @ self.dual_coef + self.intercept
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predict the class of each sample.
+
+        Args:
+            X (np.ndarray): Scaled feature array of shape (n_samples, n_features).
+
+        Returns:
+            np.ndarray: Predicted classes of shape (n_samples,).
+
+        Raises:
+            ValueError: If the input contains missing values.
+        """
+
+        X = np.asarray(X, dtype=float)
+        if np.isnan(X).any():
+            raise ValueError('Input X contains NaN.')
+        return self.classes[(self.decision_function(X) > 0).astype(int)]
+
+
+class ArrayLabelEncoder:
+    """
+    NumPy equivalent of a fitted `LabelEncoder`.
+    """
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes, dtype=object)
+
+    def transform(self, values) -> np.ndarray:
+        """
+        Encode labels as the position of each label in `classes_`.
+
+        Args:
+            values (array-like): Labels to be encoded.
+
+        Returns:
+            np.ndarray: Encoded labels.
+
+        Raises:
+            ValueError: If a label was not seen when the encoder was fitted.
+        """
+
+        values = np.asarray(values, dtype=object)
+        unseen = set(values.tolist()) - set(self.classes_.tolist())
+        if unseen:
+            raise ValueError(f'y contains previously unseen labels: {sorted(map(str, unseen))}')
+        return np.searchsorted(self.classes_, values)
+
+
+class ArrayStandardScaler:
+    """
+    NumPy equivalent of a fitted `StandardScaler`.
+    """
+
+    def __init__(self, mean, scale, feature_names=None):
+        self.mean_ = np.asarray(mean, dtype=float)
+        self.scale_ = np.asarray(scale, dtype=float)
+        self.feature_names_in_ = (np.asarray(feature_names, dtype=object)
+                                  if feature_names is not None else None)
+
+    def transform(self, X) -> np.ndarray:
+        """
+        Standardize features by removing the mean and scaling to unit variance.
+
+        Args:
+            X (array-like): Features of shape (n_samples, n_features). DataFrames
+            must have the columns the scaler was fitted with, in the same order.
+
+        Returns:
+            np.ndarray: Scaled feature array.
+
+        Raises:
+            ValueError: If the DataFrame columns do not match the fitted features.
+        """
+
+        columns = getattr(X, 'columns', None)
+        if (columns is not None and self.feature_names_in_ is not None
+                and list(columns) != list(self.feature_names_in_)):
+            raise ValueError(f'Unexpected feature names: {list(columns)}')
+
+        X = np.array(X, dtype=float)
+        X -= self.mean_
+        X /= self.scale_
+        return X
@@ -0,0 +1,223 @@
+"""
+Model artifact module.
+
+This module converts the pickled model bundle into a directory bundle made of a
+small JSON manifest, holding the scalar preprocessing artifacts, and `.npy`
+files for the SVM arrays. Directory bundles are loaded without unpickling and
+their arrays are memory-mapped read-only, so worker processes share the same
+pages instead of each keeping a private copy. Loaded in lean mode, a directory
+bundle only needs NumPy: neither scikit-learn nor pandas is imported.
+
+Usage (from the `src` directory):
+    python -m ml.artifacts SOURCE.pkl DESTINATION_DIRECTORY
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import tempfile
+from typing import Any, Dict
+
+import numpy as np
+
+from ml.array_model import ArrayLabelEncoder, ArrayStandardScaler, RBFSVCScorer
+from ml.pipeline import Pipeline
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+
+def export_bundle(bundle: Dict[str, Any], directory: str) -> str:
+    """
+    Write a model bundle as a directory bundle.
+
+    Array files are named after their content hash and the manifest is replaced
+    last, atomically, so a directory bundle can be updated in place while
+    workers are reading it.
+
+    Args:
+        bundle (dict): Model bundle with the fitted 'model' and 'preprocessor'.
+        directory (str): Destination directory, created if needed.
+
+    Returns:
+        str: Path to the written manifest.
+
+    Raises:
+        ValueError: If the model is not a binary SVM with an RBF kernel.
+    """
+
+    model = bundle['model']
+    pp = bundle['preprocessor']
+
+    if getattr(model, 'kernel', None) != 'rbf' or len(model.classes_) != 2:
+        raise ValueError('Only binary SVMs with an RBF kernel can be exported.')
+
+    os.makedirs(directory, exist_ok=True)
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'model': {
+            'type': 'rbf_svc',
+            'gamma': float(model._gamma),
+            'intercept': float(model.intercept_[0]),
+            'classes': model.classes_.tolist(),
+            'support_vectors': _save_array(directory, 'support_vectors',
+                                           model.support_vectors_),
+            'dual_coef': _save_array(directory, 'dual_coef', model.dual_coef_[0]),
+        },
+        'preprocessor': {
+            'age_medians': _series_to_table(pp['age_medians']),
+            'age_medians_overall': _series_to_table(pp['age_medians_overall']),
+            'embarked_mode_pclass1': pp['embarked_mode_pclass1'],
+            'sex_classes': pp['sex_encoder'].classes_.tolist(),
+            'embarked_cols': list(pp['embarked_cols']),
+            'scaler': {
+                'mean': pp['scaler'].mean_.tolist(),
+                'scale': pp['scaler'].scale_.tolist(),
+                'feature_names': [str(name) for name in
+                                  getattr(pp['scaler'], 'feature_names_in_', [])] or None,
+            },
+        },
+    }
+
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    write_atomically(manifest_path, json.dumps(manifest, indent=2).encode())
+    return manifest_path
+
+
+def load_bundle(directory: str, mmap: bool = True, lean: bool = False) -> Dict[str, Any]:
+    """
+    Load a directory bundle.
+
+    Args:
+        directory (str): Directory written by `export_bundle`.
+        mmap (bool): Whether to memory-map the arrays read-only instead of
+                     reading them into private memory.
+        lean (bool): Whether to load the age medians as plain dictionaries keyed
+                     by tuples instead of pandas Series, so pandas is not imported.
+                     Such a preprocessor only works with `FeatureVectorBuilder`.
+
+    Returns:
+        dict: Model bundle with the same 'model' and 'preprocessor' interface
+        as the pickled one.
+
+    Raises:
+        ValueError: If the manifest has an unsupported format version.
+    """
+
+    with open(os.path.join(directory, MANIFEST_NAME), 'rb') as file:
+        manifest = json.load(file)
+
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported bundle format version: {manifest.get('format_version')}")
+
+    mmap_mode = 'r' if mmap else None
+    table = _table_to_dict if lean else _table_to_series
+    model = manifest['model']
+    pp = manifest['preprocessor']
+
+    def array(entry):
+        return np.load(os.path.join(directory, entry['file']), mmap_mode=mmap_mode,
+                       allow_pickle=False)
+
+    return {
+        'model': RBFSVCScorer(support_vectors=array(model['support_vectors']),
+                              dual_coef=array(model['dual_coef']),
+                              intercept=model['intercept'],
+                              gamma=model['gamma'],
+                              classes=model['classes']),
+        'preprocessor': {
+            'age_medians': table(pp['age_medians']),
+            'age_medians_overall': table(pp['age_medians_overall']),
+            'embarked_mode_pclass1': pp['embarked_mode_pclass1'],
+            'sex_encoder': ArrayLabelEncoder(pp['sex_classes']),
+            'embarked_cols': pp['embarked_cols'],
+            'scaler': ArrayStandardScaler(pp['scaler']['mean'], pp['scaler']['scale'],
+                                          pp['scaler']['feature_names']),
+        },
+    }
+
+
+def write_atomically(path: str, data: bytes):
+    """
+    Replace the file at `path` with `data` in a single rename, so readers see
+    either the old or the new content, never a partial file.
+
+    Args:
+        path (str): Destination file.
+        data (bytes): New content of the file.
+    """
+
+    descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.')
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(temporary_path, 0o644)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def _save_array(directory: str, name: str, values: np.ndarray) -> Dict[str, str]:
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(values, dtype=float), allow_pickle=False)
+    data = buffer.getvalue()
+    digest = hashlib.sha256(data).hexdigest()
+
+    file_name = f'{name}.{digest[:16]}.npy'
+    path = os.path.join(directory, file_name)
+    if not os.path.exists(path):
+        write_atomically(path, data)
+    return {'file': file_name, 'sha256': digest}
+
+
+def _series_to_table(series) -> Dict[str, Any]:
+    import pandas as pd
+
+    return {
+        'names': list(series.index.names),
+        'rows': [[*_to_json(key), None if pd.isnull(value) else float(value)]
+                 for key, value in series.items()],
+    }
+
+
+def _table_to_series(table: Dict[str, Any]):
+    import pandas as pd
+
+    keys = [tuple(row[:-1]) for row in table['rows']]
+    values = [np.nan if row[-1] is None else row[-1] for row in table['rows']]
+    index = pd.MultiIndex.from_tuples(keys, names=table['names'])
+    return pd.Series(values, index=index, dtype=float, name='Age')
+
+
+def _table_to_dict(table: Dict[str, Any]) -> Dict[tuple, float]:
+    return {tuple(row[:-1]): np.nan if row[-1] is None else row[-1] for row in table['rows']}
+
+
+def _to_json(key) -> list:
+    return [value.item() if isinstance(value, np.generic) else value for value in key]
+
+
+def main(argv=None):
+    """
+    Convert a pickled model bundle into a directory bundle.
+    """
+
+    parser = argparse.ArgumentParser(
+        description='Convert a pickled model bundle into a memory-mappable directory bundle.')
+    parser.add_argument('source', help='pickled model bundle (.pkl)')
+    parser.add_argument('destination', help='directory for the converted bundle')
+    args = parser.parse_args(argv)
+
+    bundle = Pipeline().load_pipeline(args.source)
+    print(export_bundle(bundle, args.destination))
+
+
+if __name__ == '__main__':
+    main()
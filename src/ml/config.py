@@ -0,0 +1,32 @@
+"""
+Configuration module for the machine learning artifacts.
+"""
+
+import os
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+MODEL_BUNDLE_PATH = os.environ.get(
+    'TITANIC_MODEL_BUNDLE', os.path.join(BASE_DIR, 'titanic_model_bundle.pkl'))
+MODEL_CHECK_INTERVAL = float(os.environ.get('TITANIC_MODEL_CHECK_INTERVAL', 1.0))
+MODEL_LEAN = os.environ.get('TITANIC_LEAN', '0').lower() in ('1', 'true', 'yes')
+# Version ID of the bundle at MODEL_BUNDLE_PATH, recorded on the passengers it scores.
+MODEL_VERSION = os.environ.get('TITANIC_MODEL_VERSION', 'default')
+# Candidate bundles served side by side with it, as comma-separated `id=path` pairs.
+MODEL_CANDIDATES = os.environ.get('TITANIC_MODEL_CANDIDATES', '')
+# Percentage of the passengers scored by each candidate, as `id=percentage` pairs;
+# the remaining passengers are scored by MODEL_VERSION.
+MODEL_TRAFFIC_SPLIT = os.environ.get('TITANIC_MODEL_TRAFFIC_SPLIT', '')
+# Candidate scoring every passenger again in the background, or '' to disable.
+MODEL_SHADOW_VERSION = os.environ.get('TITANIC_MODEL_SHADOW', '')
+DATA_DIR = os.path.join(os.path.dirname(BASE_DIR), 'data')
+TRAIN_DATASET_PATH = os.path.join(DATA_DIR, 'train.csv')
+TEST_DATASET_PATH = os.path.join(DATA_DIR, 'test_dataset_titanic.csv')
+# Accuracy a model must reach on TEST_DATASET_PATH to be published, the gate of
+# tests/model_test.py. Not read from the environment, so it cannot weaken CI;
+# the training command takes --min-accuracy.
+MODEL_MIN_ACCURACY = 0.8
+# Split of the MVP notebook that held the rows of TEST_DATASET_PATH out of
+# train.csv; retraining reproduces it to leave those rows out of the fit.
+TEST_DATASET_SIZE = 0.2
+TEST_DATASET_SEED = 1
+TRAINING_CHUNK_SIZE = int(os.environ.get('TITANIC_TRAINING_CHUNK_SIZE', 10000))
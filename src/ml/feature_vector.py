@@ -0,0 +1,115 @@
+"""
+Feature vector builder module.
+
+This module provides a `FeatureVectorBuilder` class that turns a single passenger
+straight into a scaled NumPy feature row, without going through pandas. It uses
+the same preprocessing artifacts as `PreProcessor.preprocess_new_data` and
+produces the same values.
+"""
+
+import math
+import re
+
+import numpy as np
+
+TITLE_PATTERN = re.compile(r' ([A-Za-z]+)\.')
+BASE_FEATURES = ['Pclass', 'Sex', 'Age', 'SibSp', 'Parch', 'Fare', 'HasCabin']
+
+
+class FeatureVectorBuilder:
+    """
+    Builder for scaled feature rows of single passengers.
+
+    The lookup tables and scaler parameters are extracted from the preprocessing
+    artifacts once, when the builder is created, so building a row only costs a
+    few dictionary lookups and two array operations.
+    """
+
+    def __init__(self, pp):
+        """
+        Compile the preprocessing artifacts into lookup tables.
+
+        Args:
+            pp (dict): Dictionary containing pre-fitted encoders, scalers,
+                       and other preprocessing artifacts.
+
+        Raises:
+            ValueError: If the scaler was fitted on a different feature layout.
+        """
+
+        self.embarked_cols = list(pp['embarked_cols'])
+        self.features = BASE_FEATURES + self.embarked_cols
+
+        fitted_features = getattr(pp['scaler'], 'feature_names_in_', None)
+        if fitted_features is not None and list(fitted_features) != self.features:
+            raise ValueError(
+                f'Unexpected scaler features: {list(fitted_features)}')
+
+        self.age_medians = dict(pp['age_medians'].items())
+        self.age_medians_overall = dict(pp['age_medians_overall'].items())
+        self.embarked_mode_pclass1 = pp['embarked_mode_pclass1']
+        self.sex_codes = {sex: code for code, sex in enumerate(pp['sex_encoder'].classes_)}
+        self.embarked_positions = {col: len(BASE_FEATURES) + position
+                                   for position, col in enumerate(self.embarked_cols)}
+        self.mean = np.asarray(pp['scaler'].mean_, dtype=float)
+        self.scale = np.asarray(pp['scaler'].scale_, dtype=float)
+
+    def build(self, data) -> np.ndarray:
+        """
+        Build the scaled feature row of a passenger.
+
+        Args:
+            data (PassengerData): Information about the passenger.
+
+        Returns:
+            np.ndarray: A (1, n_features) array ready for prediction.
+
+        Raises:
+            ValueError: If the passenger's sex is unknown to the encoder.
+        """
+
+        row = np.zeros((1, len(self.features)))
+        values = row[0]
+
+        try:
+            sex_code = self.sex_codes[data.sex]
+        except KeyError as error:
+            raise ValueError(f'Unknown sex: {data.sex!r}') from error
+
+        values[0] = data.ticket_class
+        values[1] = sex_code
+        values[2] = self._age(data)
+        values[3] = data.number_siblings_spouses
+        values[4] = data.number_parents_children
+        values[5] = np.nan if data.fare is None else data.fare
+        values[6] = 0 if _is_null(data.cabin) else 1
+
+        embarked = data.embarked
+        if _is_null(embarked) and data.ticket_class == 1:
+            embarked = self.embarked_mode_pclass1
+        position = self.embarked_positions.get(f'Embarked_{embarked}')
+        if position is not None:
+            values[position] = 1
+
+        row -= self.mean
+        row /= self.scale
+
+        return row
+
+    def _age(self, data) -> float:
+        if not _is_null(data.age):
+            return data.age
+
+        match = TITLE_PATTERN.search(data.name)
+        title = match.group(1) if match else None
+
+        age = self.age_medians.get(
+            (data.sex, data.ticket_class, title,
+             data.number_siblings_spouses, data.number_parents_children), np.nan)
+        if _is_null(age):
+            age = self.age_medians_overall.get((data.sex, data.ticket_class), np.nan)
+        return age
+
+
+def _is_null(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
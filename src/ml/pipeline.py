@@ -33,3 +33,17 @@ class Pipeline:
         with open(path, 'rb') as file:
             self.pipeline = pickle.load(file)
         return self.pipeline
+
+    def load_pipeline_bytes(self, data: bytes):
+        """
+        Load a pre-trained model pipeline from the raw bytes of a pickle file.
+
+        Args:
+            data (bytes): Content of the pickled pipeline file.
+
+        Returns:
+            Any: The deserialized pipeline object.
+        """
+
+        self.pipeline = pickle.loads(data)
+        return self.pipeline
@@ -9,6 +9,8 @@ imputation, encoding, and scaling.
 import pandas as pd
 import numpy as np
 
+AGE_MEDIAN_KEYS = ['Sex', 'Pclass', 'Title', 'SibSp', 'Parch']
+
 
 class PreProcessor:
     """
@@ -33,18 +35,30 @@ class PreProcessor:
         Returns:
             pd.DataFrame: A single-row DataFrame with passenger details.
         """
-        df = pd.DataFrame([{
-            'Name': data.name,
-            'Pclass': data.ticket_class,
-            'Sex': data.sex,
-            'Age': data.age,
-            'SibSp': data.number_siblings_spouses,
-            'Parch': data.number_parents_children,
-            'Cabin': data.cabin,
-            'Ticket': data.ticket,
-            'Fare': data.fare,
-            'Embarked': data.embarked
-        }])
+        return self.dataclasses_to_dataframe([data])
+
+    def dataclasses_to_dataframe(self, data) -> pd.DataFrame:
+        """
+        Convert a list of PassengerData instances to a DataFrame.
+
+        Args:
+            data (List[PassengerData]): Information about the passengers.
+
+        Returns:
+            pd.DataFrame: A DataFrame with one row per passenger.
+        """
+        df = pd.DataFrame({
+            'Name': [passenger.name for passenger in data],
+            'Pclass': [passenger.ticket_class for passenger in data],
+            'Sex': [passenger.sex for passenger in data],
+            'Age': [passenger.age for passenger in data],
+            'SibSp': [passenger.number_siblings_spouses for passenger in data],
+            'Parch': [passenger.number_parents_children for passenger in data],
+            'Cabin': [passenger.cabin for passenger in data],
+            'Ticket': [passenger.ticket for passenger in data],
+            'Fare': [passenger.fare for passenger in data],
+            'Embarked': [passenger.embarked for passenger in data]
+        })
         return df
 
     def preprocess_new_data(self, df, pp):
@@ -73,26 +87,14 @@ class PreProcessor:
 
         df['Title'] = df['Name'].str.extract(r' ([A-Za-z]+)\.', expand=False)
 
-        def fill_age(row):
-            val = pp['age_medians'].get(
-                (row['Sex'], row['Pclass'], row['Title'],
-                 row['SibSp'], row['Parch']),
-                np.nan
-            )
-            if pd.isnull(val):
-                val = pp['age_medians_overall'].get(
-                    (row['Sex'], row['Pclass']), np.nan)
-            return row['Age'] if not pd.isnull(row['Age']) else val
-
-        df['Age'] = df.apply(fill_age, axis=1)
+        df['Age'] = self.impute_age(df, pp)
         df = df.drop('Title', axis=1)
         df.loc[df['Embarked'].isnull() & (df['Pclass'] == 1),
                'Embarked'] = pp['embarked_mode_pclass1']
         df['HasCabin'] = df['Cabin'].notnull().astype(int)
         df['Sex'] = pp['sex_encoder'].transform(df['Sex'])
 
-        embarked_dummies = pd.get_dummies(
-            df['Embarked'], prefix='Embarked', drop_first=True)
+        embarked_dummies = pd.get_dummies(df['Embarked'], prefix='Embarked')
         for col in pp['embarked_cols']:
             if col not in embarked_dummies:
                 embarked_dummies[col] = 0
@@ -110,6 +112,42 @@ class PreProcessor:
 
         return X_scaled
 
+    def impute_age(self, df, pp):
+        """
+        Fill missing ages from the pre-computed median tables.
+
+        The lookup is done with one keyed reindex per median table instead of a
+        row-wise apply. Missing ages take the median for
+        (Sex, Pclass, Title, SibSp, Parch), then the median for (Sex, Pclass);
+        ages already present are kept as they are.
+
+        Args:
+            df (pd.DataFrame): Passenger data with a 'Title' column.
+            pp (dict): Dictionary containing the 'age_medians' and
+                       'age_medians_overall' tables.
+
+        Returns:
+            pd.Series: Ages with missing values imputed.
+        """
+
+        age = pd.to_numeric(df['Age'], errors='coerce').astype(float)
+        missing = age.isnull().to_numpy()
+        if not missing.any():
+            return age
+
+        keys = df.loc[missing, AGE_MEDIAN_KEYS]
+        medians = self._lookup(pp['age_medians'], keys)
+        overall = self._lookup(pp['age_medians_overall'], keys[AGE_MEDIAN_KEYS[:2]])
+
+        age = age.copy()
+        age[missing] = np.where(np.isnan(medians), overall, medians)
+        return age
+
+    @staticmethod
+    def _lookup(table, keys):
+        index = pd.MultiIndex.from_frame(keys)
+        return table.reindex(index).to_numpy(dtype=float)
+
     def scale_data(self, X, pp):
         """
         Scale the input feature DataFrame using the provided scaler.
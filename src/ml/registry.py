@@ -0,0 +1,188 @@
+"""
+Model registry module.
+
+This module provides a process-wide `ModelRegistry` that loads the model bundle
+once per worker process, shares it across requests and reloads it when the
+bundle on disk is replaced. Both pickled bundles and directory bundles written
+by `ml.artifacts` are supported.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from ml.artifacts import MANIFEST_NAME, load_bundle
+from ml.config import MODEL_BUNDLE_PATH, MODEL_CHECK_INTERVAL, MODEL_LEAN
+from ml.feature_vector import FeatureVectorBuilder
+from ml.pipeline import Pipeline
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """
+    Represents a loaded model bundle.
+
+    Attributes:
+        model (Any): The trained estimator.
+        preprocessor (dict): Pre-fitted encoders, scalers and other
+        preprocessing artifacts.
+        version (str): SHA-256 digest of the bundle file (or of the manifest of
+        a directory bundle, which records the digest of every array file).
+        path (str): Path the bundle was loaded from.
+        load_seconds (float): Time spent reading and deserializing the bundle.
+        feature_builder (FeatureVectorBuilder): Single-row feature builder
+        compiled from the preprocessing artifacts.
+    """
+
+    model: Any
+    preprocessor: Dict[str, Any]
+    version: str
+    path: str
+    load_seconds: float
+    feature_builder: FeatureVectorBuilder
+
+
+class ModelRegistry:
+    """
+    Process-wide cache for the model bundle.
+
+    The bundle is loaded on first use and then served from memory. At most once
+    every `check_interval` seconds the file's mtime and size are compared with
+    the loaded ones; when they changed and the content hash differs, the new
+    bundle is loaded and swapped in with a single reference assignment, so
+    concurrent requests see either the old or the new bundle, never a mix.
+
+    When `path` is a directory bundle, its manifest is the watched file and the
+    arrays are memory-mapped. In lean mode only directory bundles are accepted
+    and they are loaded without pandas, so serving predictions never imports
+    scikit-learn or pandas.
+    """
+
+    def __init__(self, path: str, check_interval: float = MODEL_CHECK_INTERVAL,
+                 lean: bool = MODEL_LEAN):
+        self.path = path
+        self.check_interval = check_interval
+        self.lean = lean
+        self._bundle: Optional[ModelBundle] = None
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._loads = 0
+        self._total_load_seconds = 0.0
+
+    def get(self) -> ModelBundle:
+        """
+        Return the current model bundle, loading or reloading it if needed.
+
+        Returns:
+            ModelBundle: The loaded model bundle.
+
+        Raises:
+            ValueError: If lean mode is enabled and the bundle is not a
+            directory bundle.
+        """
+
+        bundle = self._bundle
+        if bundle is not None and time.monotonic() < self._next_check:
+            self._count_hit()
+            return bundle
+
+        with self._lock:
+            bundle = self._bundle
+            if bundle is not None and time.monotonic() < self._next_check:
+                self._count_hit()
+                return bundle
+
+            signature = self._stat()
+            self._next_check = time.monotonic() + self.check_interval
+            if bundle is not None and (signature is None or signature == self._signature):
+                self._count_hit()
+                return bundle
+
+            return self._load(signature)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the registry counters.
+
+        Returns:
+            dict: Hit, miss and load counters, load timings and the current
+            model version.
+        """
+
+        bundle = self._bundle
+        with self._stats_lock:
+            return {
+                'path': self.path,
+                'version': bundle.version if bundle else None,
+                'hits': self._hits,
+                'misses': self._misses,
+                'loads': self._loads,
+                'last_load_seconds': bundle.load_seconds if bundle else None,
+                'total_load_seconds': self._total_load_seconds,
+            }
+
+    def _load(self, signature: Optional[Tuple[int, int, int]]) -> ModelBundle:
+        with self._stats_lock:
+            self._misses += 1
+
+        start = time.perf_counter()
+        with open(self._watched_path(), 'rb') as file:
+            data = file.read()
+        version = hashlib.sha256(data).hexdigest()
+
+        current = self._bundle
+        if current is not None and current.version == version:
+            self._signature = signature
+            return current
+
+        if os.path.isdir(self.path):
+            content = load_bundle(self.path, lean=self.lean)
+        elif self.lean:
+            raise ValueError(
+                f'Lean mode requires a directory bundle, got {self.path!r}. '
+                'Convert it with `python -m ml.artifacts`.')
+        else:
+            content = Pipeline().load_pipeline_bytes(data)
+        feature_builder = FeatureVectorBuilder(content['preprocessor'])
+        load_seconds = time.perf_counter() - start
+
+        bundle = ModelBundle(model=content['model'],
+                             preprocessor=content['preprocessor'],
+                             version=version,
+                             path=self.path,
+                             load_seconds=load_seconds,
+                             feature_builder=feature_builder)
+        self._bundle = bundle
+        self._signature = signature
+
+        with self._stats_lock:
+            self._loads += 1
+            self._total_load_seconds += load_seconds
+
+        return bundle
+
+    def _watched_path(self) -> str:
+        if os.path.isdir(self.path):
+            return os.path.join(self.path, MANIFEST_NAME)
+        return self.path
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self._watched_path())
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _count_hit(self):
+        with self._stats_lock:
+            self._hits += 1
+
+
+model_registry = ModelRegistry(MODEL_BUNDLE_PATH)
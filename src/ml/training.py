@@ -0,0 +1,446 @@
+"""
+Model training module.
+
+This module retrains the survival model from the union of the Kaggle training
+set and the labeled passengers stored in the database, following the MVP
+notebook. The rows of train.csv that the notebook held out as the test dataset
+are left out, so that the accuracy gate scores passengers the model was not
+trained on. The preprocessing artifacts (age medians, embarked mode, sex encoder,
+embarked columns and scaler) are rebuilt with vectorized group-bys, an RBF SVM
+is fitted with the hyperparameters of the published model, and the new bundle
+is checked against the accuracy gate of `tests/model_test.py` before being
+published.
+
+The `survived` column of the passengers registered through the API holds the
+serving model's own prediction, not an observed outcome: training on those rows
+would only reinforce the model's mistakes. Only passengers without a
+`model_version`, i.e. loaded with a real outcome, are read unless
+`include_predicted` is set. Passengers registered before the `model_version`
+column existed carry no version although their outcome was predicted; set one
+on them (or leave the database out) before retraining.
+
+Publishing replaces the bundle atomically (a single rename, or the manifest of a
+directory bundle last), so the running workers' `ModelRegistry` picks it up on
+its next check without a restart.
+
+Usage (from the `src` directory):
+    python -m ml.training [--output ml/titanic_model_bundle.pkl]
+        [--database-url sqlite:///database/database.db] [--no-database]
+        [--chunk-size 10000] [--min-accuracy 0.8] [--include-predicted]
+"""
+
+import argparse
+import logging
+import os
+import pickle
+import resource
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.svm import SVC
+
+from ml.artifacts import export_bundle, write_atomically
+from ml.config import (
+    MODEL_BUNDLE_PATH,
+    MODEL_MIN_ACCURACY,
+    TEST_DATASET_PATH,
+    TEST_DATASET_SEED,
+    TEST_DATASET_SIZE,
+    TRAIN_DATASET_PATH,
+    TRAINING_CHUNK_SIZE,
+)
+from ml.pipeline import Pipeline
+from ml.preprocessor import AGE_MEDIAN_KEYS
+
+logger = logging.getLogger(__name__)
+
+# Hyperparameters selected by the grid search of the MVP notebook, used when no
+# bundle is published yet.
+DEFAULT_MODEL_PARAMS = {'kernel': 'rbf', 'C': 10, 'gamma': 0.01}
+# Boarding ports are stored by name in the database and by code in train.csv.
+PORT_CODES = {'Cherbourg': 'C', 'Queenstown': 'Q', 'Southampton': 'S'}
+# Database columns and the train.csv columns they are read into.
+PASSENGER_COLUMNS = {
+    'name': 'Name', 'ticket_class': 'Pclass', 'sex': 'Sex', 'age': 'Age',
+    'number_siblings_spouses': 'SibSp', 'number_parents_children': 'Parch',
+    'ticket': 'Ticket', 'fare': 'Fare', 'cabin': 'Cabin', 'embarked': 'Embarked',
+    'survived': 'Survived',
+}
+DATASET_DTYPES = {'Pclass': 'int8', 'SibSp': 'int8', 'Parch': 'int8', 'Survived': 'int8',
+                  'Age': 'float64', 'Fare': 'float64'}
+
+
+class ModelRejectedError(Exception):
+    """
+    Raised when a trained model does not reach the accuracy gate.
+    """
+
+
+@dataclass
+class TrainingReport:
+    """
+    Outcome of a training run.
+
+    Attributes:
+        rows (int): Number of passengers the model was trained on.
+        database_rows (int): Number of them read from the database.
+        accuracy (float): Accuracy of the new model on the test dataset.
+        previous_accuracy (Optional[float]): Accuracy of the replaced model, if any.
+        published (bool): Whether the new bundle was published.
+        path (str): Path of the bundle.
+        stages (Dict[str, float]): Duration of each stage, in seconds.
+        peak_memory_bytes (int): Peak memory traced during the run.
+    """
+
+    rows: int = 0
+    database_rows: int = 0
+    accuracy: float = 0.0
+    previous_accuracy: Optional[float] = None
+    published: bool = False
+    path: str = ''
+    stages: Dict[str, float] = field(default_factory=dict)
+    peak_memory_bytes: int = 0
+
+
+def read_database_passengers(database_url: str,
+                             chunk_size: int = TRAINING_CHUNK_SIZE,
+                             include_predicted: bool = False) -> Iterator[pd.DataFrame]:
+    """
+    Stream the labeled passengers stored in the database in the layout of train.csv.
+
+    The rows are fetched from a server-side cursor `chunk_size` at a time and
+    converted chunk by chunk into compact DataFrames, so no ORM object is built.
+    Passengers scored by a model (with a `model_version`) are left out, as their
+    outcome is a prediction, unless `include_predicted` is set.
+
+    Args:
+        database_url (str): SQLAlchemy URL of the application's database.
+        chunk_size (int): Number of rows per chunk.
+        include_predicted (bool): Whether to read the passengers whose outcome
+        was predicted too (self-training on pseudo-labels).
+
+    Yields:
+        pd.DataFrame: Up to `chunk_size` passengers, with train.csv column names.
+    """
+
+    from sqlalchemy import create_engine, inspect, select
+
+    from database.models.passenger import Passenger
+
+    engine = create_engine(database_url)
+    try:
+        if not inspect(engine).has_table(Passenger.__tablename__):
+            return
+        columns = [getattr(Passenger, column) for column in PASSENGER_COLUMNS]
+        statement = select(*columns).order_by(Passenger.id)
+        if not include_predicted:
+            statement = statement.where(Passenger.model_version.is_(None))
+        with engine.connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, yield_per=chunk_size).execute(statement)
+            for rows in result.partitions():
+                chunk = pd.DataFrame.from_records(rows, columns=list(PASSENGER_COLUMNS.values()))
+                chunk['Embarked'] = chunk['Embarked'].replace(PORT_CODES)
+                yield chunk.astype(DATASET_DTYPES)
+    finally:
+        engine.dispose()
+
+
+def drop_test_rows(train_dataset: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drop the rows of train.csv held out as the test dataset.
+
+    Reproduces the stratified split of the MVP notebook, which wrote its test
+    part to TEST_DATASET_PATH.
+
+    Args:
+        train_dataset (pd.DataFrame): The passengers of train.csv, in file order.
+
+    Returns:
+        pd.DataFrame: The passengers of the training part of the split.
+    """
+
+    _, test_index = train_test_split(train_dataset.index, test_size=TEST_DATASET_SIZE,
+                                     shuffle=True, random_state=TEST_DATASET_SEED,
+                                     stratify=train_dataset['Survived'])
+    return train_dataset.drop(test_index)
+
+
+def load_training_dataset(train_path: str = TRAIN_DATASET_PATH,
+                          database_url: Optional[str] = None,
+                          chunk_size: int = TRAINING_CHUNK_SIZE,
+                          include_predicted: bool = False,
+                          include_test: bool = False) -> Tuple[pd.DataFrame, int]:
+    """
+    Read the union of train.csv and the labeled passengers stored in the database.
+
+    The rows of train.csv held out as the test dataset are left out (see
+    `drop_test_rows`) unless `include_test` is set. Passengers without a fare
+    are left out, as the model cannot score them.
+
+    Args:
+        train_path (str): Path of the Kaggle training set.
+        database_url (Optional[str]): URL of the database, or None to skip it.
+        chunk_size (int): Number of database rows per chunk.
+        include_predicted (bool): Whether to read the stored passengers whose
+        outcome was predicted too (see `read_database_passengers`).
+        include_test (bool): Whether to keep the rows of train.csv held out as
+        the test dataset.
+
+    Returns:
+        Tuple[pd.DataFrame, int]: The passengers, and how many came from the database.
+    """
+
+    train_dataset = pd.read_csv(train_path, usecols=list(PASSENGER_COLUMNS.values()),
+                                dtype=DATASET_DTYPES)
+    chunks = [train_dataset if include_test else drop_test_rows(train_dataset)]
+    if database_url:
+        chunks.extend(read_database_passengers(database_url, chunk_size, include_predicted))
+    database_rows = sum(len(chunk) for chunk in chunks[1:])
+
+    dataset = pd.concat(chunks, ignore_index=True)
+    missing_fare = dataset['Fare'].isnull()
+    if missing_fare.any():
+        logger.info('Skipping %d passengers without a fare.', missing_fare.sum())
+        dataset = dataset[~missing_fare].reset_index(drop=True)
+    return dataset, database_rows
+
+
+def build_preprocessor(dataset: pd.DataFrame) -> Tuple[Dict[str, Any], pd.DataFrame]:
+    """
+    Fit the preprocessing artifacts and build the unscaled feature matrix.
+
+    Produces the same artifacts as the MVP notebook, with built-in group-by
+    aggregations instead of per-group Python callbacks: missing ages are filled
+    with the median of their (Sex, Pclass, Title, SibSp, Parch) group, then of
+    their (Sex, Pclass) group, and the median tables are taken after filling.
+
+    Args:
+        dataset (pd.DataFrame): Passengers in the layout of train.csv.
+
+    Returns:
+        Tuple[Dict[str, Any], pd.DataFrame]: The preprocessing artifacts, with
+        an unfitted 'scaler', and the feature matrix.
+    """
+
+    df = dataset.copy()
+    df['Title'] = df['Name'].str.extract(r' ([A-Za-z]+)\.', expand=False)
+
+    overall_keys = AGE_MEDIAN_KEYS[:2]
+    df['Age'] = df['Age'].fillna(df.groupby(AGE_MEDIAN_KEYS)['Age'].transform('median'))
+    df['Age'] = df['Age'].fillna(df.groupby(overall_keys)['Age'].transform('median'))
+    age_medians = df.groupby(AGE_MEDIAN_KEYS)['Age'].median()
+    age_medians_overall = df.groupby(overall_keys)['Age'].median()
+
+    embarked_mode_pclass1 = df.loc[df['Pclass'] == 1, 'Embarked'].mode()[0]
+    df.loc[df['Embarked'].isnull() & (df['Pclass'] == 1), 'Embarked'] = embarked_mode_pclass1
+
+    sex_encoder = LabelEncoder()
+    embarked = pd.get_dummies(df['Embarked'], prefix='Embarked', drop_first=True, dtype=int)
+
+    features = pd.DataFrame({
+        'Pclass': df['Pclass'],
+        'Sex': sex_encoder.fit_transform(df['Sex']),
+        'Age': df['Age'],
+        'SibSp': df['SibSp'],
+        'Parch': df['Parch'],
+        'Fare': df['Fare'],
+        'HasCabin': df['Cabin'].notnull().astype(int),
+    })
+    features = pd.concat([features, embarked], axis=1)
+
+    pp = {
+        'age_medians': age_medians,
+        'age_medians_overall': age_medians_overall,
+        'embarked_mode_pclass1': embarked_mode_pclass1,
+        'sex_encoder': sex_encoder,
+        'embarked_cols': list(embarked.columns),
+        'scaler': StandardScaler(),
+    }
+    return pp, features
+
+
+def evaluate_bundle(bundle: Dict[str, Any], test_path: str = TEST_DATASET_PATH) -> float:
+    """
+    Compute the accuracy of a bundle on the test dataset, as `tests/model_test.py` does.
+
+    Args:
+        bundle (Dict[str, Any]): Model bundle with 'model' and 'preprocessor'.
+        test_path (str): Path of the preprocessed, unscaled test dataset.
+
+    Returns:
+        float: Accuracy of the model.
+    """
+
+    dataset = pd.read_csv(test_path)
+    X = bundle['preprocessor']['scaler'].transform(dataset.iloc[:, 0:-1])
+    return float(accuracy_score(dataset.iloc[:, -1], bundle['model'].predict(X)))
+
+
+def publish_bundle(bundle: Dict[str, Any], path: str):
+    """
+    Atomically replace the bundle at `path`.
+
+    A `.pkl` path gets a pickled bundle, replaced with a single rename; a
+    directory gets a directory bundle whose manifest is replaced last.
+
+    Args:
+        bundle (Dict[str, Any]): Model bundle with 'model' and 'preprocessor'.
+        path (str): Path of the published bundle.
+    """
+
+    if os.path.isdir(path) or not path.endswith('.pkl'):
+        export_bundle(bundle, path)
+    else:
+        write_atomically(path, pickle.dumps(bundle))
+
+
+def train(output: str = MODEL_BUNDLE_PATH,
+          database_url: Optional[str] = None,
+          train_path: str = TRAIN_DATASET_PATH,
+          test_path: str = TEST_DATASET_PATH,
+          chunk_size: int = TRAINING_CHUNK_SIZE,
+          min_accuracy: float = MODEL_MIN_ACCURACY,
+          include_predicted: bool = False) -> TrainingReport:
+    """
+    Train a new model and publish it if it passes the accuracy gate.
+
+    The model starts from the hyperparameters of the bundle published at
+    `output` (warm start), or from the notebook's when there is none.
+
+    Args:
+        output (str): Path of the published bundle (pickle or directory).
+        database_url (Optional[str]): URL of the database whose labeled
+        passengers are added to the training set, or None to train on
+        train.csv only.
+        train_path (str): Path of the Kaggle training set.
+        test_path (str): Path of the test dataset of the accuracy gate.
+        chunk_size (int): Number of database rows read per chunk.
+        min_accuracy (float): Accuracy the new model must reach.
+        include_predicted (bool): Whether to train on the stored passengers
+        whose outcome was predicted by the model too.
+
+    Returns:
+        TrainingReport: Sizes, accuracies, stage durations and peak memory.
+
+    Raises:
+        ModelRejectedError: If the new model's accuracy is below `min_accuracy`.
+    """
+
+    report = TrainingReport(path=output)
+    tracing = not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+
+    try:
+        with _stage(report, 'load'):
+            dataset, report.database_rows = load_training_dataset(
+                train_path, database_url, chunk_size, include_predicted)
+            report.rows = len(dataset)
+            previous = _load_published(output)
+
+        with _stage(report, 'preprocess'):
+            pp, features = build_preprocessor(dataset)
+            X = pp['scaler'].fit_transform(features)
+            y = dataset['Survived'].to_numpy()
+            del dataset
+
+        with _stage(report, 'fit'):
+            model = clone(previous['model']) if _is_svc(previous) else SVC(**DEFAULT_MODEL_PARAMS)
+            model.fit(X, y)
+
+        bundle = {'model': model, 'preprocessor': pp}
+        with _stage(report, 'evaluate'):
+            report.accuracy = evaluate_bundle(bundle, test_path)
+            if _is_svc(previous):
+                report.previous_accuracy = evaluate_bundle(previous, test_path)
+
+        if report.accuracy < min_accuracy:
+            raise ModelRejectedError(
+                f'Model accuracy too low: {report.accuracy:.4f} < {min_accuracy:.4f}')
+
+        with _stage(report, 'publish'):
+            publish_bundle(bundle, output)
+            report.published = True
+    finally:
+        _, report.peak_memory_bytes = tracemalloc.get_traced_memory()
+        if tracing:
+            tracemalloc.stop()
+        logger.info('Training %s in %.2fs: %d passengers (%d from the database), accuracy '
+                    '%.4f (previous %s), stages %s, peak traced memory %.1f MiB, '
+                    'peak RSS %.1f MiB.',
+                    'published' if report.published else 'not published',
+                    time.perf_counter() - started, report.rows, report.database_rows,
+                    report.accuracy,
+                    'n/a' if report.previous_accuracy is None
+                    else f'{report.previous_accuracy:.4f}',
+                    {name: round(seconds, 3) for name, seconds in report.stages.items()},
+                    report.peak_memory_bytes / 2 ** 20,
+                    resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+
+    return report
+
+
+@contextmanager
+def _stage(report: TrainingReport, name: str):
+    started = time.perf_counter()
+    yield
+    report.stages[name] = time.perf_counter() - started
+
+
+def _load_published(path: str) -> Optional[Dict[str, Any]]:
+    # Directory bundles hold the fitted arrays only, without sklearn hyperparameters.
+    if os.path.isfile(path):
+        return Pipeline().load_pipeline(path)
+    return None
+
+
+def _is_svc(bundle: Optional[Dict[str, Any]]) -> bool:
+    return bundle is not None and isinstance(bundle['model'], SVC)
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Retrain the model from the command line.
+    """
+
+    from database.config import DATABASE_URI
+
+    parser = argparse.ArgumentParser(
+        description='Retrain the survival model from train.csv and the labeled passengers '
+                    'stored in the database.')
+    parser.add_argument('--output', default=MODEL_BUNDLE_PATH,
+                        help='published bundle (.pkl file or directory bundle)')
+    parser.add_argument('--database-url', default=DATABASE_URI,
+                        help='database whose labeled passengers are added to the training set')
+    parser.add_argument('--no-database', action='store_true',
+                        help='train on train.csv only')
+    parser.add_argument('--chunk-size', type=int, default=TRAINING_CHUNK_SIZE)
+    parser.add_argument('--min-accuracy', type=float, default=MODEL_MIN_ACCURACY,
+                        help=f'accuracy the new model must reach (default: {MODEL_MIN_ACCURACY})')
+    parser.add_argument('--include-predicted', action='store_true',
+                        help='also train on the passengers whose outcome was predicted by '
+                             'the model (pseudo-labels)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    try:
+        train(args.output, None if args.no_database else args.database_url,
+              chunk_size=args.chunk_size, min_accuracy=args.min_accuracy,
+              include_predicted=args.include_predicted)
+    except ModelRejectedError as error:
+        parser.exit(1, f'{error}\n')
+
+
+if __name__ == '__main__':
+    main()
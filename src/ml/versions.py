@@ -0,0 +1,174 @@
+"""
+Model versions module.
+
+This module provides `ModelVersions`, which serves several model bundles side by
+side under version IDs: the bundle of the process-wide `model_registry`, under
+MODEL_VERSION, and the candidate bundles listed in MODEL_CANDIDATES. Each
+passenger is routed to one of them by the configured traffic split, and one
+candidate can be designated as the shadow model.
+"""
+
+import threading
+import zlib
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from ml.config import (
+    MODEL_CANDIDATES,
+    MODEL_CHECK_INTERVAL,
+    MODEL_LEAN,
+    MODEL_SHADOW_VERSION,
+    MODEL_TRAFFIC_SPLIT,
+    MODEL_VERSION,
+)
+from ml.registry import ModelRegistry, model_registry
+
+if TYPE_CHECKING:
+    from schemas.passenger_dataclass import PassengerData
+
+# Traffic split resolution: passengers are hashed into this many buckets.
+_BUCKETS = 10000
+
+
+def parse_pairs(value: str) -> Dict[str, str]:
+    """
+    Parse a comma-separated list of `key=value` pairs.
+
+    Args:
+        value (str): The pairs, e.g. 'v2=/models/v2,v3=/models/v3'.
+
+    Returns:
+        Dict[str, str]: The values keyed by their keys, in order.
+
+    Raises:
+        ValueError: If an item is not a `key=value` pair.
+    """
+
+    pairs = {}
+    for item in filter(None, (item.strip() for item in value.split(','))):
+        key, separator, item_value = item.partition('=')
+        if not separator or not key.strip() or not item_value.strip():
+            raise ValueError(f'Expected a `key=value` pair, got {item!r}.')
+        pairs[key.strip()] = item_value.strip()
+    return pairs
+
+
+class ModelVersions:
+    """
+    Model bundles served side by side under version IDs.
+
+    Each version is backed by its own `ModelRegistry`, so every bundle is loaded
+    once, shared across requests and reloaded when replaced on disk. The
+    traffic split maps version IDs to the percentage of passengers they score;
+    the remaining passengers are scored by the primary version. A passenger is
+    routed by a hash of its name and ticket, so a resubmitted passenger is
+    scored by the same version.
+
+    Args:
+        primary (str): Version ID of the primary bundle.
+        registries (Dict[str, ModelRegistry]): Registry of every version,
+        including the primary one.
+        traffic (Dict[str, float]): Percentage of the passengers routed to each
+        candidate version.
+        shadow (Optional[str]): Version scoring every passenger in the background.
+
+    Raises:
+        ValueError: If the primary, a split or the shadow version is unknown, or
+        if the split exceeds 100%.
+    """
+
+    def __init__(self, primary: str, registries: Dict[str, ModelRegistry],
+                 traffic: Optional[Dict[str, float]] = None, shadow: Optional[str] = None):
+        traffic = traffic or {}
+        unknown = {primary, *traffic, *([shadow] if shadow else [])} - set(registries)
+        if unknown:
+            raise ValueError(f'Unknown model versions: {", ".join(sorted(unknown))}.')
+        if any(percentage < 0 for percentage in traffic.values()) or \
+                sum(traffic.values()) > 100:
+            raise ValueError('The traffic split must be between 0% and 100%.')
+
+        self.primary = primary
+        self.registries = registries
+        self.traffic = traffic
+        self.shadow = shadow or None
+        # Upper bucket bound of each routed candidate, in order.
+        self._routes: Tuple[Tuple[int, str], ...] = ()
+        bound = 0
+        for version, percentage in traffic.items():
+            bound += round(percentage * _BUCKETS / 100)
+            self._routes += ((bound, version),)
+        self._stats_lock = threading.Lock()
+        self._routed = dict.fromkeys(registries, 0)
+
+    @classmethod
+    def from_config(cls) -> 'ModelVersions':
+        """
+        Build the model versions from MODEL_VERSION, MODEL_CANDIDATES,
+        MODEL_TRAFFIC_SPLIT and MODEL_SHADOW_VERSION.
+
+        Returns:
+            ModelVersions: The configured model versions.
+        """
+
+        registries = {MODEL_VERSION: model_registry}
+        for version, path in parse_pairs(MODEL_CANDIDATES).items():
+            registries[version] = ModelRegistry(path, MODEL_CHECK_INTERVAL, MODEL_LEAN)
+        traffic = {version: float(percentage)
+                   for version, percentage in parse_pairs(MODEL_TRAFFIC_SPLIT).items()}
+        return cls(MODEL_VERSION, registries, traffic, MODEL_SHADOW_VERSION)
+
+    def route(self, data: 'PassengerData') -> str:
+        """
+        Choose the version scoring a passenger.
+
+        Args:
+            data (PassengerData): Information about the passenger.
+
+        Returns:
+            str: Version ID of the chosen bundle.
+        """
+
+        version = self.primary
+        if self._routes:
+            bucket = zlib.crc32(f'{data.name}\x00{data.ticket}'.encode()) % _BUCKETS
+            for bound, candidate in self._routes:
+                if bucket < bound:
+                    version = candidate
+                    break
+
+        with self._stats_lock:
+            self._routed[version] += 1
+        return version
+
+    def registry(self, version: Optional[str] = None) -> ModelRegistry:
+        """
+        Return the registry of a version.
+
+        Args:
+            version (Optional[str]): Version ID, or None for the primary version.
+
+        Returns:
+            ModelRegistry: The registry of the version.
+        """
+
+        return self.registries[version or self.primary]
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """
+        Return the counters of every version.
+
+        Returns:
+            dict: Per version ID, its bundle digest (None until loaded), its
+            traffic share and the number of passengers routed to it.
+        """
+
+        with self._stats_lock:
+            routed = dict(self._routed)
+        shares = {self.primary: 100 - sum(self.traffic.values()), **self.traffic}
+        return {version: {'digest': registry.stats()['version'],
+                          'traffic_percentage': shares.get(version, 0.0),
+                          'shadow': version == self.shadow,
+                          'routed': routed[version]}
+                for version, registry in self.registries.items()}
+
+
+model_versions = ModelVersions.from_config()
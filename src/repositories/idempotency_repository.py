@@ -0,0 +1,108 @@
+"""
+Repository module for the idempotency keys.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
+from database.models.idempotency_key import IdempotencyKey
+from database.db_setup import db
+
+
+def get_idempotency_key(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Retrieves a stored idempotency key, expired or not.
+
+    Args:
+        key (str): The idempotency key.
+
+    Returns:
+        Optional[Dict[str, Any]]: The 'request_hash', 'response' and
+        'expires_at' columns of the key, or None if it is not stored.
+    """
+
+    row = db.session.execute(
+        select(IdempotencyKey.request_hash, IdempotencyKey.response, IdempotencyKey.expires_at)
+        .where(IdempotencyKey.key == key)).first()
+    return dict(row._mapping) if row is not None else None
+
+
+def insert_idempotency_keys(rows: List[Dict[str, Any]]):
+    """
+    Inserts idempotency keys in the current transaction, without committing it.
+
+    Args:
+        rows (List[Dict[str, Any]]): Column values of the keys.
+
+    Raises:
+        IntegrityError: If a key is already stored.
+    """
+
+    if rows:
+        db.session.execute(insert(IdempotencyKey), rows)
+
+
+def claim_idempotency_keys(rows: List[Dict[str, Any]]) -> Set[str]:
+    """
+    Stores the idempotency keys that are not held by a valid key, in the
+    current transaction, without committing it.
+
+    A stored key that expired before the new row was created is replaced by it;
+    a stored key that is still valid is kept as is, and the new row is skipped.
+    On databases without `ON CONFLICT`, the expired keys are deleted and the
+    rows are inserted one by one, each in a savepoint.
+
+    Args:
+        rows (List[Dict[str, Any]]): Column values of the keys, with distinct keys.
+
+    Returns:
+        Set[str]: The keys stored from `rows`.
+    """
+
+    if not rows:
+        return set()
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect not in ('sqlite', 'postgresql'):
+        delete_expired_idempotency_keys(min(row['created_at'] for row in rows),
+                                        [row['key'] for row in rows])
+        claimed = set()
+        for row in rows:
+            try:
+                with db.session.begin_nested():
+                    insert_idempotency_keys([row])
+            except IntegrityError:
+                continue
+            claimed.add(row['key'])
+        return claimed
+
+    dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+    statement = dialect_insert(IdempotencyKey)
+    statement = statement.on_conflict_do_update(
+        index_elements=['key'],
+        set_={column: statement.excluded[column]
+              for column in ('request_hash', 'response', 'created_at', 'expires_at')},
+        where=IdempotencyKey.expires_at <= statement.excluded.created_at,
+    ).returning(IdempotencyKey.key)
+    return set(db.session.execute(statement, rows).scalars().all())
+
+
+def delete_expired_idempotency_keys(now: datetime, keys: Optional[List[str]] = None) -> int:
+    """
+    Deletes the idempotency keys expired at `now`, without committing.
+
+    Args:
+        now (datetime): The current time, in UTC.
+        keys (Optional[List[str]]): Keys to be deleted if expired; defaults to
+        every expired key.
+
+    Returns:
+        int: Number of deleted keys.
+    """
+
+    statement = delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now)
+    if keys is not None:
+        statement = statement.where(IdempotencyKey.key.in_(keys))
+    return db.session.execute(statement).rowcount
@@ -2,17 +2,185 @@
 Repository module for Passenger queries.
 """
 
-from typing import List
+import csv
+import io
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence
+from sqlalchemy import Row, insert, text
+from sqlalchemy.orm import Query
 from database.models.passenger import Passenger
 from database.db_setup import db
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection
 
-def get_all_passengers() -> List[Passenger]:
+
+def filter_passengers(query: Query, filters: Dict[str, Any]) -> Query:
+    """
+    Applies the passenger list filters to a query.
+
+    Args:
+        query (Query): Query over the passenger table.
+        filters (Dict[str, Any]): Filter values keyed by 'survived', 'ticket_class',
+        'sex', 'created_after' and 'created_before'. Missing keys are not applied.
+
+    Returns:
+        Query: The filtered query.
+    """
+
+    for column in ('survived', 'ticket_class', 'sex'):
+        if filters.get(column) is not None:
+            query = query.filter(getattr(Passenger, column) == filters[column])
+    if filters.get('created_after') is not None:
+        query = query.filter(Passenger.created_at >= filters['created_after'])
+    if filters.get('created_before') is not None:
+        query = query.filter(Passenger.created_at < filters['created_before'])
+    return query
+
+
+def get_passengers_page(after_id: Optional[int],
+                        limit: int,
+                        fields: Sequence[str],
+                        filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Retrieves a page of registered passengers, ordered by identifier.
+
+    Uses keyset pagination: the page starts right after `after_id`, so every
+    page costs an index range scan on the primary key regardless of its depth.
+    Only the requested columns (plus the identifier) are selected.
+
+    Args:
+        after_id (Optional[int]): Identifier of the last passenger of the previous
+        page, or None for the first page.
+        limit (int): Maximum number of passengers in the page.
+        fields (Sequence[str]): Passenger columns to be selected.
+        filters (Dict[str, Any]): Filters applied to the list.
+
+    Returns:
+        List[Dict[str, Any]]: Up to `limit` passengers with the selected columns.
+    """
+
+    columns = [Passenger.id] + [getattr(Passenger, field)
+                                for field in fields if field != 'id']
+    query = filter_passengers(db.session.query(*columns), filters)
+    if after_id is not None:
+        query = query.filter(Passenger.id > after_id)
+
+    rows = query.order_by(Passenger.id).limit(limit).all()
+
+    return [dict(row._mapping) for row in rows]
+
+
+def stream_passengers(fields: Sequence[str],
+                      filters: Dict[str, Any],
+                      chunk_size: int) -> Iterator[Row]:
+    """
+    Streams registered passengers, ordered by identifier.
+
+    Rows are fetched from a server-side cursor `chunk_size` at a time, so memory
+    use does not depend on the size of the table. The query only runs when the
+    returned iterator is consumed.
+
+    Args:
+        fields (Sequence[str]): Passenger columns to be selected, in order.
+        filters (Dict[str, Any]): Filters applied to the list.
+        chunk_size (int): Number of rows fetched per round trip.
+
+    Returns:
+        Iterator[Row]: Rows with the selected columns.
     """
-    Retrieves all registered passengers.
+
+    columns = [getattr(Passenger, field) for field in fields]
+    query = filter_passengers(db.session.query(*columns), filters)
+    yield from query.order_by(Passenger.id).yield_per(chunk_size)
+
+
+def insert_passengers(rows: List[Dict[str, Any]], returning_ids: bool = True) -> List[int]:
+    """
+    Inserts many passengers in the current transaction, without committing it.
+
+    On PostgreSQL the rows are streamed with `COPY ... FROM STDIN`, after
+    reserving their identifiers from the table's sequence when they are needed.
+    On other databases a single multi-row `INSERT` is used.
+
+    Args:
+        rows (List[Dict[str, Any]]): Column values of the passengers.
+        returning_ids (bool): Whether the identifiers of the new rows are needed.
 
     Returns:
-        List[Passenger]: A list of registered passengers.
+        List[int]: Identifiers of the inserted passengers, in the same order as
+        `rows`, or an empty list when `returning_ids` is False.
+    """
+
+    if not rows:
+        return []
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return _copy_passengers(rows, returning_ids)
+
+    if not returning_ids:
+        db.session.execute(insert(Passenger), rows)
+        return []
+
+    result = db.session.execute(
+        insert(Passenger).returning(Passenger.id, sort_by_parameter_order=True), rows)
+    return result.scalars().all()
+
+
+async def insert_passenger_async(connection: 'AsyncConnection', row: Dict[str, Any]) -> int:
     """
+    Inserts a passenger through an asynchronous connection, without committing.
+
+    Args:
+        connection (AsyncConnection): Connection of the current transaction.
+        row (Dict[str, Any]): Column values of the passenger.
+
+    Returns:
+        int: Identifier of the inserted passenger.
+    """
+
+    result = await connection.execute(insert(Passenger).returning(Passenger.id), row)
+    return result.scalar_one()
+
+
+def _copy_passengers(rows: List[Dict[str, Any]], returning_ids: bool) -> List[int]:
+    ids = []
+    if returning_ids:
+        ids = db.session.execute(
+            text("SELECT nextval(pg_get_serial_sequence('passenger', 'id')) "
+                 "FROM generate_series(1, :count)"),
+            {'count': len(rows)}).scalars().all()
+
+    now = datetime.now(timezone.utc)
+    columns = [column.name for column in Passenger.__table__.columns
+               if column.name != 'id' or returning_ids]
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+    for position, row in enumerate(rows):
+        values = {'created_at': now, 'updated_at': now, **row}
+        if returning_ids:
+            values['id'] = ids[position]
+        writer.writerow([_copy_value(values.get(column)) for column in columns])
+    buffer.seek(0)
+
+    statement = f"COPY passenger ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = db.session.connection().connection.driver_connection.cursor()
+    try:
+        if hasattr(cursor, 'copy_expert'):
+            cursor.copy_expert(statement, buffer)
+        else:
+            with cursor.copy(statement) as copy:
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
+
+    return ids
+
 
-    return db.session.query(Passenger).all()
+def _copy_value(value):
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
@@ -0,0 +1,127 @@
+"""
+Repository module for the passenger statistics summary table.
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from sqlalchemy import case, delete, func, insert, select, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.dialects import postgresql, sqlite
+from database.models.passenger import Passenger
+from database.models.passenger_stats import PassengerStats
+from database.db_setup import db
+
+STATS_GROUP_COLUMNS = ('ticket_class', 'sex', 'embarked')
+UNKNOWN_EMBARKED = ''
+
+
+def increment_passenger_stats(rows: Iterable[Dict[str, Any]],
+                              connection: Optional[Connection] = None):
+    """
+    Adds new passengers to the summary counters, without committing.
+
+    The rows are first aggregated per group, so a batch costs one upsert per
+    distinct (ticket class, sex, port) group rather than one per passenger.
+    Groups are written in a fixed order, so concurrent transactions lock the
+    counter rows in the same order.
+
+    Args:
+        rows (Iterable[Dict[str, Any]]): Column values of the new passengers.
+        connection (Optional[Connection]): Connection to write with, e.g. the
+        synchronous side of an `AsyncConnection.run_sync` call; defaults to the
+        session.
+    """
+
+    totals, survivors = Counter(), Counter()
+    for row in rows:
+        key = (row['ticket_class'], row['sex'], row.get('embarked') or UNKNOWN_EMBARKED)
+        totals[key] += 1
+        survivors[key] += bool(row['survived'])
+
+    if not totals:
+        return
+
+    values = [dict(zip(STATS_GROUP_COLUMNS, key), total=totals[key], survived=survivors[key])
+              for key in sorted(totals)]
+
+    target = db.session if connection is None else connection
+    dialect = (db.session.get_bind() if connection is None else connection).dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        dialect_insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        statement = dialect_insert(PassengerStats.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(STATS_GROUP_COLUMNS),
+            set_={'total': PassengerStats.__table__.c.total + statement.excluded.total,
+                  'survived': PassengerStats.__table__.c.survived + statement.excluded.survived})
+        target.execute(statement, values)
+        return
+
+    for value in values:
+        result = target.execute(
+            update(PassengerStats.__table__)
+            .where(*[getattr(PassengerStats, column) == value[column]
+                     for column in STATS_GROUP_COLUMNS])
+            .values(total=PassengerStats.total + value['total'],
+                    survived=PassengerStats.survived + value['survived']))
+        if result.rowcount == 0:
+            target.execute(insert(PassengerStats.__table__), value)
+
+
+def get_passenger_stats(group_by: Sequence[str],
+                        filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Retrieves the passenger counters, grouped by the requested columns.
+
+    Args:
+        group_by (Sequence[str]): Columns among 'ticket_class', 'sex' and
+        'embarked' to group the counters by. When empty, a single group with
+        the overall counters is returned.
+        filters (Dict[str, Any]): Filter values keyed by 'ticket_class', 'sex'
+        and 'embarked'. Missing keys are not applied.
+
+    Returns:
+        List[Dict[str, Any]]: One dictionary per group, with the group columns
+        and the 'total' and 'survived' counters, ordered by the group columns.
+        Unknown ports are returned as None.
+    """
+
+    columns = [getattr(PassengerStats, column) for column in group_by]
+    query = db.session.query(*columns,
+                             func.coalesce(func.sum(PassengerStats.total), 0).label('total'),
+                             func.coalesce(func.sum(PassengerStats.survived), 0).label('survived'))
+
+    for column in STATS_GROUP_COLUMNS:
+        if filters.get(column) is not None:
+            query = query.filter(getattr(PassengerStats, column) == filters[column])
+
+    rows = query.group_by(*columns).order_by(*columns).all() if columns else query.all()
+
+    groups = []
+    for row in rows:
+        group = dict(row._mapping)
+        if group.get('embarked') == UNKNOWN_EMBARKED:
+            group['embarked'] = None
+        if group['total']:
+            groups.append(group)
+    return groups
+
+
+def rebuild_passenger_stats():
+    """
+    Recomputes the summary counters from the passenger table, without committing.
+
+    On PostgreSQL the summary table is locked first, so passengers inserted
+    while the counters are rebuilt are added once the rebuild commits.
+    """
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        db.session.execute(text('LOCK TABLE passenger_stats IN EXCLUSIVE MODE'))
+
+    embarked = func.coalesce(Passenger.embarked, UNKNOWN_EMBARKED)
+    counters = (select(Passenger.ticket_class, Passenger.sex, embarked,
+                       func.count(), func.sum(case((Passenger.survived, 1), else_=0)))
+                .group_by(Passenger.ticket_class, Passenger.sex, embarked))
+
+    db.session.execute(delete(PassengerStats))
+    db.session.execute(insert(PassengerStats).from_select(
+        [*STATS_GROUP_COLUMNS, 'total', 'survived'], counters))
@@ -1,9 +1,11 @@
 """
-Registers the passengers routes with the Flask application.
+Registers the passengers, health check and metrics routes with the Flask application.
 """
 
 from flask_smorest import Api
 from routes.passenger_routes import passenger_bp
+from routes.health_routes import health_bp
+from routes.metrics_routes import metrics_bp
 
 
 def register_routes(api: Api):
@@ -15,3 +17,5 @@ def register_routes(api: Api):
     """
 
     api.register_blueprint(passenger_bp)
+    api.register_blueprint(health_bp)
+    api.register_blueprint(metrics_bp)
@@ -0,0 +1,10 @@
+"""
+Configuration module for the API routes.
+"""
+
+import os
+
+PASSENGER_BATCH_MAX_SIZE = int(os.environ.get('PASSENGER_BATCH_MAX_SIZE', 10000))
+PASSENGER_PAGE_SIZE = int(os.environ.get('PASSENGER_PAGE_SIZE', 100))
+PASSENGER_PAGE_MAX_SIZE = int(os.environ.get('PASSENGER_PAGE_MAX_SIZE', 1000))
+PASSENGER_EXPORT_CHUNK_SIZE = int(os.environ.get('PASSENGER_EXPORT_CHUNK_SIZE', 1000))
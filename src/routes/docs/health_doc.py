@@ -0,0 +1,34 @@
+"""
+This module contains standard descriptions and responses for the health checks.
+"""
+
+from schemas.health_schema import HealthSchema
+
+GET_HEALTHZ_SUMMARY = 'Verifica se a aplicação está no ar (liveness).'
+GET_HEALTHZ_DESCRIPTION = 'Este endpoint responde 200 enquanto o processo estiver no ar, ' \
+    'mesmo durante o aquecimento, com o estado do aquecimento, a versão do modelo e o ' \
+    'tempo de carregamento do modelo.'
+GET_READYZ_SUMMARY = 'Verifica se a aplicação está pronta para receber tráfego (readiness).'
+GET_READYZ_DESCRIPTION = 'Este endpoint responde 200 somente depois que o aquecimento ' \
+    '(carregamento do modelo, predição sintética e conexão com o banco de dados) terminou; ' \
+    'até lá, ou se o aquecimento falhou, responde 503.'
+
+readyz_responses = {
+    503: {
+        'description': 'Service Unavailable: O aquecimento ainda não terminou ou falhou.',
+        'content': {
+            'application/json': {
+                'schema': HealthSchema,
+                'example': {
+                    'status': 'warming_up',
+                    'ready': False,
+                    'model_version': None,
+                    'model_load_seconds': None,
+                    'warmup_seconds': None,
+                    'steps': {},
+                    'error': None
+                }
+            }
+        }
+    }
+}
@@ -0,0 +1,25 @@
+"""
+This module contains standard descriptions and responses for the metrics endpoint.
+"""
+
+GET_METRICS_SUMMARY = 'Retorna as métricas da aplicação no formato do Prometheus.'
+GET_METRICS_DESCRIPTION = 'Este endpoint retorna, no formato de texto do Prometheus, ' \
+    'histogramas da duração de cada etapa das requisições (validação, pré-processamento, ' \
+    'predição, banco de dados e total) por endpoint, com estimativas de p50, p95 e p99, ' \
+    'além dos contadores do cache de predições, do modelo e dos processos em segundo plano.'
+
+metrics_responses = {
+    200: {
+        'description': 'Métricas da aplicação.',
+        'content': {
+            'text/plain': {
+                'schema': {'type': 'string'},
+                'example': '# HELP titanic_stage_duration_seconds Duration of the request '
+                           'stages, per endpoint.\n'
+                           '# TYPE titanic_stage_duration_seconds histogram\n'
+                           'titanic_stage_duration_seconds_bucket{endpoint="Passenger.add_passenger",'
+                           'stage="predict",le="0.0005"} 42\n'
+            }
+        }
+    }
+}
@@ -4,12 +4,61 @@ This module contains standard descriptions and responses for the Passenger API.
 
 from schemas.error_schema import ErrorSchema
 
-GET_PASSENGER_SUMMARY = 'Retorna a lista de todos os passageiros(as).'
+GET_PASSENGER_SUMMARY = 'Retorna a lista paginada de passageiros(as).'
 GET_PASSENGER_DESCRIPTION = 'Este endpoint retorna uma coleção de registros de passageiros(as) ' \
-    'no formato JSON.'
+    'no formato JSON, ordenada por `id` e paginada por cursor. Quando houver mais registros, ' \
+    'a resposta traz o cabeçalho `Link` com `rel="next"` e o cabeçalho `X-Next-Cursor` ' \
+    'com o cursor da próxima página. O parâmetro `fields` restringe os campos retornados.'
+EXPORT_PASSENGERS_SUMMARY = 'Exporta os passageiros(as) em NDJSON ou CSV.'
+EXPORT_PASSENGERS_DESCRIPTION = 'Este endpoint transmite todos os registros de passageiros(as), ' \
+    'ordenados por `id`, no formato NDJSON (uma linha JSON por passageiro(a)) ou CSV. ' \
+    'Os registros são lidos e enviados em blocos, sem carregar a tabela inteira em memória, ' \
+    'e aceitam os mesmos filtros e o mesmo parâmetro `fields` da listagem.'
+GET_PASSENGERS_STATS_SUMMARY = 'Retorna estatísticas de sobrevivência dos passageiros(as).'
+GET_PASSENGERS_STATS_DESCRIPTION = 'Este endpoint retorna a quantidade de passageiros(as), ' \
+    'de sobreviventes e a taxa de sobrevivência, no total e agrupadas pelos campos de ' \
+    '`group_by` (por padrão `ticket_class`, `sex` e `embarked`). Os filtros `ticket_class`, ' \
+    '`sex` e `embarked` restringem os(as) passageiros(as) considerados(as). Os valores são ' \
+    'lidos de contadores atualizados a cada cadastro, sem percorrer a tabela de passageiros(as).'
 POST_PASSENGER_SUMMARY = 'Lida com a criação de um novo passageiro(a).'
 POST_PASSENGER_DESCRIPTION = 'Este endpoint processa o envio de um formulário (JSON) ' \
-    'para criar um novo registro de passageiro(a).'
+    'para criar um novo registro de passageiro(a). Com o cabeçalho `Idempotency-Key`, ' \
+    'novas tentativas com a mesma chave e o mesmo corpo recebem a resposta original, ' \
+    'sem cadastrar o(a) passageiro(a) novamente, até a chave expirar.'
+POST_PASSENGERS_BATCH_SUMMARY = 'Lida com a criação de um lote de passageiros(as).'
+POST_PASSENGERS_BATCH_DESCRIPTION = 'Este endpoint processa o envio de uma lista (JSON) ' \
+    'de passageiros(as), calcula a sobrevivência de todos(as) de uma só vez e os(as) ' \
+    'registra em uma única transação. Passageiros(as) inválidos(as) são reportados(as) ' \
+    'em `errors`, indexados(as) pela posição no lote, sem impedir o registro dos demais.'
+
+passenger_list_headers = {
+    'Link': {
+        'description': 'Link para a próxima página (`rel="next"`), quando houver.',
+        'schema': {'type': 'string'}
+    },
+    'X-Next-Cursor': {
+        'description': 'Cursor da próxima página, quando houver.',
+        'schema': {'type': 'integer'}
+    }
+}
+
+passenger_export_responses = {
+    200: {
+        'description': 'Exportação dos passageiros(as).',
+        'content': {
+            'application/x-ndjson': {
+                'schema': {'type': 'string'},
+                'example': '{"id": 1, "name": "Snyder, Mrs. John Pillsbury (Nelle Stevenson)", '
+                           '"survived": true}\n'
+            },
+            'text/csv': {
+                'schema': {'type': 'string'},
+                'example': 'id,name,survived\r\n'
+                           '1,"Snyder, Mrs. John Pillsbury (Nelle Stevenson)",True\r\n'
+            }
+        }
+    }
+}
 
 passenger_responses = {
     400: {
@@ -48,7 +97,8 @@ passenger_responses = {
         '- `fare` é obrigatório, mas não foi fornecido.\n'
         '- `fare` o valor deve ser maior ou igual a 0.\n'
         '- `cabin` formato inválido.\n'
-        '- `embarked` valor deve ser Cherbourg, Queenstown ou Southampton.\n\n',
+        '- `embarked` valor deve ser Cherbourg, Queenstown ou Southampton.\n'
+        '- `Idempotency-Key` já utilizada com outro(a) passageiro(a).\n\n',
         'content': {
             'application/json': {
                 'schema': ErrorSchema,
@@ -79,5 +129,56 @@ passenger_responses = {
                 }
             }
         }
+    },
+    503: {
+        'description':
+        'Service Unavailable: A fila de gravação de passageiros(as) está cheia '
+        '(somente no modo de gravação assíncrona).',
+        'content': {
+            'application/json': {
+                'schema': ErrorSchema,
+                'example': {
+                    'code': 503,
+                    'message': 'The passenger write queue is full.',
+                    'status': 'Service Unavailable'
+                }
+            }
+        }
+    }
+}
+
+passenger_idempotency_parameters = [
+    {
+        'in': 'header',
+        'name': 'Idempotency-Key',
+        'required': False,
+        'description': 'Chave única da requisição (até 255 caracteres). Novas tentativas '
+                       'com a mesma chave recebem a resposta original.',
+        'schema': {'type': 'string', 'maxLength': 255},
+    }
+]
+
+passenger_batch_responses = {
+    400: passenger_responses[400],
+    422: {
+        'description':
+        'Validation Error: Nenhum(a) passageiro(a) válido(a) foi enviado(a) ou o lote '
+        'excede o tamanho máximo permitido.',
+        'content': {
+            'application/json': {
+                'schema': ErrorSchema,
+                'example': {
+                    'code': 422,
+                    'errors': {
+                        'json': {
+                            'passengers': {
+                                '0': {'sex': ['Sex must be either male or female.']}
+                            }
+                        }
+                    },
+                    'status': 'Unprocessable Entity'
+                }
+            }
+        }
     }
 }
@@ -0,0 +1,54 @@
+"""
+Route module for the health check routes.
+"""
+
+from flask import current_app
+from flask_smorest import Blueprint as SmorestBlueprint
+from schemas.health_schema import HealthSchema
+from business.warmup import get_warmup_status
+from routes.docs.health_doc import (
+    GET_HEALTHZ_SUMMARY,
+    GET_HEALTHZ_DESCRIPTION,
+    GET_READYZ_SUMMARY,
+    GET_READYZ_DESCRIPTION,
+    readyz_responses,
+)
+
+health_bp = SmorestBlueprint(
+    'Health', __name__, description='Verificações de saúde da aplicação')
+
+
+@health_bp.route('/healthz', methods=['GET'])
+@health_bp.response(200, HealthSchema, description='Aplicação no ar.')
+@health_bp.doc(summary=GET_HEALTHZ_SUMMARY, description=GET_HEALTHZ_DESCRIPTION)
+def healthz():
+    """
+    Report that the process is alive.
+
+    Always answers 200 while the process is running, with the warm-up status,
+    the model version and the model load time.
+
+    Responses:
+        JSON response:
+        - 200 (OK): The process is alive.
+    """
+
+    return get_warmup_status(current_app)
+
+
+@health_bp.route('/readyz', methods=['GET'])
+@health_bp.response(200, HealthSchema, description='Aplicação pronta.')
+@health_bp.doc(summary=GET_READYZ_SUMMARY, description=GET_READYZ_DESCRIPTION,
+               responses=readyz_responses)
+def readyz():
+    """
+    Report whether the application is ready to receive traffic.
+
+    Responses:
+        JSON response:
+        - 200 (OK): The warm-up finished successfully.
+        - 503 (Service Unavailable): The warm-up is running or failed.
+    """
+
+    status = get_warmup_status(current_app)
+    return status, 200 if status['ready'] else 503
@@ -0,0 +1,31 @@
+"""
+Route module for the metrics route.
+"""
+
+from flask import Response
+from flask_smorest import Blueprint as SmorestBlueprint
+from business.metrics import render_metrics
+from routes.docs.metrics_doc import (
+    GET_METRICS_SUMMARY,
+    GET_METRICS_DESCRIPTION,
+    metrics_responses,
+)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+metrics_bp = SmorestBlueprint(
+    'Metrics', __name__, description='Métricas da aplicação')
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+@metrics_bp.doc(summary=GET_METRICS_SUMMARY, description=GET_METRICS_DESCRIPTION,
+                responses=metrics_responses)
+def metrics():
+    """
+    Expose the application metrics in the Prometheus text format.
+
+    Responses:
+        - 200 (OK): The stage duration histograms and the application counters.
+    """
+
+    return Response(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -2,28 +2,93 @@
 Route module for Passenger routes.
 """
 
-from flask_smorest import Blueprint as SmorestBlueprint
-from schemas.passenger_schema import PassengerSchema, PassengerViewSchema
+from flask import Response, request, stream_with_context, url_for
+from flask_smorest import Blueprint as SmorestBlueprint, abort
+from marshmallow import ValidationError
+from webargs.flaskparser import FlaskParser
+from schemas.passenger_schema import (
+    PassengerSchema,
+    PassengerViewSchema,
+    PassengerBatchSchema,
+    PassengerBatchViewSchema,
+    PassengerListArgsSchema,
+    PassengerExportArgsSchema,
+    PassengerStatsArgsSchema,
+    PassengerStatsViewSchema,
+    PASSENGER_VIEW_FIELDS,
+)
 from schemas.passenger_dataclass import PassengerData
-from business.passenger_business import create_passenger
-from repositories.passenger_repository import get_all_passengers
+from business.idempotency import (
+    IDEMPOTENCY_KEY_HEADER,
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    IdempotencyKeyConflictError,
+)
+from business.passenger_business import create_passenger, create_passengers
+from business.passenger_writer import WriteQueueFullError
+from business.passenger_export import EXPORT_MIMETYPES, export_passengers
+from business.passenger_stats import get_passengers_stats
+from business.metrics import stage_metrics
+from repositories.passenger_repository import get_passengers_page
 from routes.docs.passenger_doc import (
     GET_PASSENGER_SUMMARY,
     GET_PASSENGER_DESCRIPTION,
+    EXPORT_PASSENGERS_SUMMARY,
+    EXPORT_PASSENGERS_DESCRIPTION,
+    GET_PASSENGERS_STATS_SUMMARY,
+    GET_PASSENGERS_STATS_DESCRIPTION,
     POST_PASSENGER_SUMMARY,
     POST_PASSENGER_DESCRIPTION,
+    POST_PASSENGERS_BATCH_SUMMARY,
+    POST_PASSENGERS_BATCH_DESCRIPTION,
     passenger_responses,
+    passenger_idempotency_parameters,
+    passenger_batch_responses,
+    passenger_list_headers,
+    passenger_export_responses,
 )
+from routes.config import (
+    PASSENGER_BATCH_MAX_SIZE,
+    PASSENGER_PAGE_SIZE,
+    PASSENGER_PAGE_MAX_SIZE,
+    PASSENGER_EXPORT_CHUNK_SIZE,
+)
+
+
+class TimedArgumentsParser(FlaskParser):
+    """
+    Arguments parser timing the validation of the request arguments.
+    """
+
+    def parse(self, *args, **kwargs):
+        """
+        Parses and validates the request arguments as the 'validation' stage.
+        """
+
+        with stage_metrics.stage('validation'):
+            return super().parse(*args, **kwargs)
+
+
+class PassengerBlueprint(SmorestBlueprint):
+    """
+    Blueprint whose arguments are parsed by `TimedArgumentsParser`.
+    """
 
-passenger_bp = SmorestBlueprint(
+    ARGUMENTS_PARSER = TimedArgumentsParser()
+
+
+passenger_bp = PassengerBlueprint(
     'Passenger', __name__, description='Operações em Passageiros(as)')
 
+# Schema instances are shared by every request: marshmallow schemas are costly
+# to instantiate and hold no per-request state.
+passenger_schema = PassengerSchema()
+
 
 @passenger_bp.route('/passenger', methods=['POST'])
-@passenger_bp.arguments(PassengerSchema)
+@passenger_bp.arguments(PassengerSchema())
 @passenger_bp.response(201, PassengerViewSchema, description='Passageiro(a) cadastrado(a) com sucesso.')
 @passenger_bp.doc(summary=POST_PASSENGER_SUMMARY, description=POST_PASSENGER_DESCRIPTION,
-                  responses=passenger_responses)
+                  responses=passenger_responses, parameters=passenger_idempotency_parameters)
 def add_passenger(passenger_data):
     """
     Handles the creation of a new passenger.
@@ -33,31 +98,164 @@ def add_passenger(passenger_data):
     Receives a JSON payload with 'name', 'ticket_class', 'sex', 'age', 'number_siblings_spouses',
     'number_parents_children', 'ticket', 'fare', 'cabin', 'embarked', 
     calls the business logic to create a passenger,
-    and returns an appropriate response.
+    and returns an appropriate response. A retry sent with the same
+    'Idempotency-Key' header gets the response of the original request.
 
     Returns:
         JSON response:
         - 201 (Created): Passenger created successfully.
-        - 400 (Bad Request): Invalid body JSON format.
-        - 422 (Unprocessable Entity): Validation error.
+        - 400 (Bad Request): Invalid body JSON format or idempotency key.
+        - 422 (Unprocessable Entity): Validation error, or idempotency key
+          already used with another passenger.
+        - 503 (Service Unavailable): Write queue full (write-behind mode only).
     """
 
+    idempotency_key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    if idempotency_key is not None and not 0 < len(idempotency_key) <= IDEMPOTENCY_KEY_MAX_LENGTH:
+        abort(400, message=f'{IDEMPOTENCY_KEY_HEADER} must have between 1 and '
+                           f'{IDEMPOTENCY_KEY_MAX_LENGTH} characters.')
+
     data = PassengerData(**passenger_data)
-    return create_passenger(data)
+    try:
+        return create_passenger(data, idempotency_key)
+    except WriteQueueFullError as error:
+        abort(503, message=str(error))
+    except IdempotencyKeyConflictError as error:
+        abort(422, message=str(error))
+
+
+@passenger_bp.route('/passengers/batch', methods=['POST'])
+@passenger_bp.arguments(PassengerBatchSchema())
+@passenger_bp.response(201, PassengerBatchViewSchema,
+                       description='Lote de passageiros(as) processado com sucesso.')
+@passenger_bp.doc(summary=POST_PASSENGERS_BATCH_SUMMARY, description=POST_PASSENGERS_BATCH_DESCRIPTION,
+                  responses=passenger_batch_responses)
+def add_passengers(batch_data):
+    """
+    Handles the creation of a batch of passengers.
+
+    Receives a JSON payload with a 'passengers' list, where each item has the same
+    fields accepted by the single passenger endpoint. Every item is validated
+    individually; the valid ones are scored together and registered in a single
+    transaction, while the invalid ones are reported by their position in the list.
+
+    Returns:
+        JSON response:
+        - 201 (Created): Batch processed, with the created passengers and the
+          validation errors of the rejected ones.
+        - 400 (Bad Request): Invalid body JSON format.
+        - 422 (Unprocessable Entity): No valid passenger or batch too large.
+    """
+
+    items = batch_data['passengers']
+
+    if len(items) > PASSENGER_BATCH_MAX_SIZE:
+        abort(422, errors={'json': {'passengers': [
+            f'Batch size must be at most {PASSENGER_BATCH_MAX_SIZE} passengers.']}})
+
+    data, errors = [], {}
+    # The envelope was timed as the 'validation' stage by the arguments parser.
+    with stage_metrics.stage('item_validation'):
+        for index, item in enumerate(items):
+            try:
+                data.append(PassengerData(**passenger_schema.load(item)))
+            except ValidationError as error:
+                errors[index] = error.messages
+
+    if items and not data:
+        abort(422, errors={'json': {'passengers': errors}})
+
+    return {
+        'passengers': create_passengers(data),
+        'errors': {str(index): messages for index, messages in errors.items()},
+    }
 
 
 @passenger_bp.route('/passengers', methods=['GET'])
-@passenger_bp.response(200, PassengerViewSchema(many=True))
+@passenger_bp.arguments(PassengerListArgsSchema(), location='query', as_kwargs=True)
+@passenger_bp.response(200, PassengerViewSchema(many=True), headers=passenger_list_headers)
 @passenger_bp.doc(summary=GET_PASSENGER_SUMMARY, description=GET_PASSENGER_DESCRIPTION)
-def get_passengers():
+def get_passengers(cursor=None, limit=PASSENGER_PAGE_SIZE, fields=PASSENGER_VIEW_FIELDS, **filters):
+    """
+    Retrieve a page of passengers.
+
+    This endpoint returns a collection of passenger records in JSON format, ordered
+    by identifier. Pages are walked with the `cursor` query argument: when more
+    passengers are available, the response carries a `Link` header with the URL of
+    the next page and an `X-Next-Cursor` header with its cursor. The `fields` query
+    argument restricts the returned fields, and the remaining arguments filter the list.
+
+    Responses:
+        JSON response:
+        - 200 (OK): Successfully retrieved the page of passengers.
+        - 422 (Unprocessable Entity): Invalid query arguments.
+    """
+
+    limit = min(limit, PASSENGER_PAGE_MAX_SIZE)
+    passengers = get_passengers_page(cursor, limit + 1, fields, filters)
+
+    headers = {}
+    if len(passengers) > limit:
+        passengers = passengers[:limit]
+        next_cursor = passengers[-1]['id']
+        args = request.args.to_dict(flat=False)
+        args['cursor'] = next_cursor
+        headers['Link'] = f'<{url_for(request.endpoint, **args)}>; rel="next"'
+        headers['X-Next-Cursor'] = str(next_cursor)
+
+    if 'id' not in fields:
+        for passenger in passengers:
+            del passenger['id']
+
+    return passengers, headers
+
+
+@passenger_bp.route('/passengers/export', methods=['GET'])
+@passenger_bp.arguments(PassengerExportArgsSchema(), location='query')
+@passenger_bp.doc(summary=EXPORT_PASSENGERS_SUMMARY, description=EXPORT_PASSENGERS_DESCRIPTION,
+                  responses=passenger_export_responses)
+def export_passenger_list(export_args):
+    """
+    Stream every passenger as NDJSON or CSV.
+
+    The passengers are read from a server-side cursor and written to the response
+    chunk by chunk, so memory use stays flat regardless of the size of the table.
+    Accepts the same filters and `fields` projection as the passenger list, plus
+    a `format` argument ('ndjson' or 'csv').
+
+    Responses:
+        - 200 (OK): Stream of passengers in the requested format.
+        - 422 (Unprocessable Entity): Invalid query arguments.
+    """
+
+    export_format = export_args.pop('format')
+    fields = export_args.pop('fields', PASSENGER_VIEW_FIELDS)
+
+    body = export_passengers(export_format, fields, export_args, PASSENGER_EXPORT_CHUNK_SIZE)
+
+    return Response(stream_with_context(body), mimetype=EXPORT_MIMETYPES[export_format],
+                    headers={'Content-Disposition':
+                             f'attachment; filename=passengers.{export_format}'})
+
+
+@passenger_bp.route('/passengers/stats', methods=['GET'])
+@passenger_bp.arguments(PassengerStatsArgsSchema(), location='query', as_kwargs=True)
+@passenger_bp.response(200, PassengerStatsViewSchema)
+@passenger_bp.doc(summary=GET_PASSENGERS_STATS_SUMMARY, description=GET_PASSENGERS_STATS_DESCRIPTION)
+def get_passenger_stats(group_by, **filters):
     """
-    Retrieve a list of all passengers.
+    Retrieve the passenger counts and survival rates.
 
-    This endpoint returns a collection of passenger records in JSON format.
+    This endpoint returns the number of passengers, the number of survivors and
+    the survival rate, overall and per group of the `group_by` fields (ticket
+    class, sex and boarding port by default), optionally filtered by ticket
+    class, sex and boarding port. The values are read from counters updated on
+    every insert, not computed by scanning the passengers.
 
-    Responses:         
+    Responses:
         JSON response:
-        - 200 (OK): Successfully retrieved the list of passengers.                                                     
+        - 200 (OK): Successfully retrieved the statistics.
+        - 422 (Unprocessable Entity): Invalid query arguments.
     """
 
-    return get_all_passengers()
+    return get_passengers_stats(group_by, filters)
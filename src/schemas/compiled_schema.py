@@ -0,0 +1,291 @@
+"""
+Compiled fast paths for marshmallow schemas.
+
+Marshmallow runs every value through generic machinery (field lookup, error
+collection, hook dispatch), which dominates the cost of small payloads. The
+schemas in this module compile their declared fields, once per instance, into
+flat plans of type checks, precompiled validators and converters:
+
+- `CompiledLoadSchema` loads a plain dictionary with its plan and returns the
+  same result as marshmallow when every value is valid. Anything else (a missing
+  or unknown key, a value of another type, a failing validator) is loaded by
+  marshmallow itself, so the error messages do not change.
+- `CompiledDumpSchema` reads the fields of a dictionary or an object directly.
+
+Fields, validators or hooks a plan does not support disable the fast path of the
+schema. The declared fields are untouched, so the OpenAPI documentation
+generated from the schemas is the same.
+"""
+
+import math
+from typing import Any, Callable, Optional, Tuple
+
+from marshmallow import EXCLUDE, Schema, fields, missing, validate
+from marshmallow.decorators import (
+    POST_DUMP,
+    POST_LOAD,
+    PRE_DUMP,
+    PRE_LOAD,
+    VALIDATES,
+    VALIDATES_SCHEMA,
+)
+
+_INVALID = object()
+
+# Input types accepted by the fast path, per field class. Booleans are rejected
+# by exact type checks, as marshmallow rejects them for numbers.
+_LOAD_TYPES = {
+    fields.String: (str,),
+    fields.Integer: (int,),
+    fields.Float: (int, float),
+}
+
+# Output types returned as they are by the fast path, per field class; values of
+# other types are serialized by the field.
+_DUMP_TYPES = {
+    fields.String: (str,),
+    fields.Integer: (int,),
+    fields.Float: (float,),
+    fields.Boolean: (bool,),
+}
+
+
+def _compile_validator(validator) -> Optional[Callable[[Any], bool]]:
+    """
+    Compile a marshmallow validator into a predicate.
+
+    Args:
+        validator: A validator of the field.
+
+    Returns:
+        Optional[Callable[[Any], bool]]: A function telling whether a value passes
+        the validator, or None when the validator is not supported.
+    """
+
+    kind = type(validator)
+
+    if kind is validate.Length:
+        minimum, maximum, equal = validator.min, validator.max, validator.equal
+        if equal is not None:
+            return lambda value: len(value) == equal
+        return lambda value: ((minimum is None or len(value) >= minimum)
+                              and (maximum is None or len(value) <= maximum))
+
+    if kind is validate.OneOf:
+        try:
+            choices = frozenset(validator.choices)
+        except TypeError:
+            choices = tuple(validator.choices)
+        return lambda value: value in choices
+
+    if kind is validate.Range:
+        minimum, maximum = validator.min, validator.max
+        min_inclusive, max_inclusive = validator.min_inclusive, validator.max_inclusive
+
+        def in_range(value) -> bool:
+            if minimum is not None and (value < minimum if min_inclusive else value <= minimum):
+                return False
+            if maximum is not None and (value > maximum if max_inclusive else value >= maximum):
+                return False
+            return True
+
+        return in_range
+
+    if kind is validate.Regexp:
+        match = validator.regex.match
+        return lambda value: match(value) is not None
+
+    return None
+
+
+def _compile_load_field(field: fields.Field) -> Optional[Callable[[Any], Any]]:
+    """
+    Compile a field into a function loading one of its values.
+
+    Returns:
+        Optional[Callable[[Any], Any]]: A function returning the loaded value, or
+        `_INVALID` when the value must be loaded by marshmallow; None when the
+        field is not supported.
+    """
+
+    kind = type(field)
+    if kind not in _LOAD_TYPES or field.load_default is not missing:
+        return None
+
+    tests = [_compile_validator(validator) for validator in field.validators]
+    if any(test is None for test in tests):
+        return None
+
+    accepted = _LOAD_TYPES[kind]
+    allow_none = field.allow_none
+    is_float = kind is fields.Float
+    finite = is_float and not field.allow_nan
+
+    def load_value(value):
+        if value is None:
+            return None if allow_none else _INVALID
+        if type(value) not in accepted:
+            return _INVALID
+        if is_float:
+            try:
+                value = float(value)
+            except OverflowError:
+                return _INVALID
+            if finite and not math.isfinite(value):
+                return _INVALID
+        for test in tests:
+            if not test(value):
+                return _INVALID
+        return value
+
+    return load_value
+
+
+class CompiledLoadSchema(Schema):
+    """
+    Schema loading valid plain dictionaries without marshmallow's machinery.
+
+    The fast path applies to String, Integer and Float fields validated by
+    Length, OneOf, Range or Regexp, in schemas without load hooks. Loading
+    with `partial` always goes through marshmallow.
+    """
+
+    _load_plan: Optional[Tuple[Tuple[str, str, bool, Callable[[Any], Any]], ...]]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._load_plan = self._compile_load_plan()
+
+    def _compile_load_plan(self):
+        if any(self._hooks.get(tag) for tag in (PRE_LOAD, POST_LOAD, VALIDATES, VALIDATES_SCHEMA)):
+            return None
+
+        plan = []
+        for name, field in self.load_fields.items():
+            load_value = _compile_load_field(field)
+            if load_value is None:
+                return None
+            plan.append((field.data_key or name, field.attribute or name,
+                         field.required, load_value))
+        return tuple(plan)
+
+    def load(self, data, *, many=None, partial=None, unknown=None):
+        """
+        Load data, through the compiled plan when it is valid.
+
+        Same arguments and result as `marshmallow.Schema.load`.
+        """
+
+        if self._load_plan is not None and not partial and not self.partial:
+            result = self._fast_load(data, self.many if many is None else many,
+                                     unknown or self.unknown)
+            if result is not None:
+                return result
+        return super().load(data, many=many, partial=partial, unknown=unknown)
+
+    def validate(self, data, *, many=None, partial=None):
+        """
+        Validate data, through the compiled plan when it is valid.
+
+        Same arguments and result as `marshmallow.Schema.validate`.
+        """
+
+        if self._load_plan is not None and not partial and not self.partial:
+            if self._fast_load(data, self.many if many is None else many,
+                               self.unknown) is not None:
+                return {}
+        return super().validate(data, many=many, partial=partial)
+
+    def _fast_load(self, data, many: bool, unknown: str):
+        if not many:
+            return self._fast_load_one(data, unknown)
+        if type(data) is not list:
+            return None
+        results = []
+        for item in data:
+            result = self._fast_load_one(item, unknown)
+            if result is None:
+                return None
+            results.append(result)
+        return results
+
+    def _fast_load_one(self, data, unknown: str):
+        if type(data) is not dict:
+            return None
+
+        result = {}
+        for key, attribute, required, load_value in self._load_plan:
+            value = data.get(key, missing)
+            if value is missing:
+                if required:
+                    return None
+                continue
+            value = load_value(value)
+            if value is _INVALID:
+                return None
+            result[attribute] = value
+
+        if len(result) != len(data) and unknown != EXCLUDE:
+            return None
+        return result
+
+
+class CompiledDumpSchema(Schema):
+    """
+    Schema dumping dictionaries and objects without marshmallow's machinery.
+
+    The fast path applies to String, Integer, Float and Boolean fields without
+    dump defaults or dotted attributes, in schemas without dump hooks. Objects
+    supporting item access other than dictionaries are dumped by marshmallow.
+    """
+
+    _dump_plan: Optional[Tuple[Tuple[str, str, tuple, fields.Field], ...]]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._dump_plan = self._compile_dump_plan()
+
+    def _compile_dump_plan(self):
+        if any(self._hooks.get(tag) for tag in (PRE_DUMP, POST_DUMP)):
+            return None
+
+        plan = []
+        for name, field in self.dump_fields.items():
+            attribute = field.attribute or name
+            if (type(field) not in _DUMP_TYPES or field.dump_default is not missing
+                    or '.' in attribute or getattr(field, 'as_string', False)):
+                return None
+            plan.append((field.data_key or name, attribute, _DUMP_TYPES[type(field)], field))
+        return tuple(plan)
+
+    def dump(self, obj, *, many=None):
+        """
+        Serialize an object, or a list of objects, to native Python data types.
+
+        Same arguments and result as `marshmallow.Schema.dump`.
+        """
+
+        if self._dump_plan is None:
+            return super().dump(obj, many=many)
+        if self.many if many is None else many:
+            return [self._fast_dump(item) for item in obj]
+        return self._fast_dump(obj)
+
+    def _fast_dump(self, obj):
+        if type(obj) is dict:
+            get = obj.get
+        elif hasattr(type(obj), '__getitem__'):
+            return super().dump(obj, many=False)
+        else:
+            def get(attribute, default):
+                return getattr(obj, attribute, default)
+
+        result = {}
+        for key, attribute, natural, field in self._dump_plan:
+            value = get(attribute, missing)
+            if value is missing:
+                continue
+            if value is not None and type(value) not in natural:
+                value = field._serialize(value, attribute, obj)
+            result[key] = value
+        return result
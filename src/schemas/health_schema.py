@@ -0,0 +1,52 @@
+"""
+Schema module for the health checks.
+"""
+
+from marshmallow import Schema, fields
+
+STATUS_METADATA = metadata = {
+    'example': 'ok'}
+STATUS_DESCRIPTION = 'Estado da aplicação: `ok`, `warming_up` ou `failed`'
+READY_METADATA = metadata = {
+    'example': True}
+READY_DESCRIPTION = 'Indica se o aquecimento terminou e a aplicação pode receber tráfego'
+MODEL_VERSION_METADATA = metadata = {
+    'example': '5f1d0c0f3c5e4b8a9d7e6f5a4b3c2d1e0f9a8b7c6d5e4f3a2b1c0d9e8f7a6b5c'}
+MODEL_VERSION_DESCRIPTION = 'Versão (SHA-256) do modelo carregado'
+MODEL_LOAD_SECONDS_METADATA = metadata = {
+    'example': 1.28}
+MODEL_LOAD_SECONDS_DESCRIPTION = 'Tempo de carregamento do modelo, em segundos'
+WARMUP_SECONDS_METADATA = metadata = {
+    'example': 1.42}
+WARMUP_SECONDS_DESCRIPTION = 'Duração do aquecimento, em segundos'
+STEPS_METADATA = metadata = {
+    'example': {'model': 1.29, 'prediction': 0.12, 'database': 0.01}}
+STEPS_DESCRIPTION = 'Duração de cada etapa do aquecimento, em segundos'
+ERROR_DESCRIPTION = 'Erro do aquecimento, quando houver'
+
+
+class HealthSchema(Schema):
+    """
+    Schema for serializing the health and readiness status.
+
+    Attributes:
+        status (str): The application status (ok, warming_up or failed).
+        ready (bool): Whether the warm-up finished successfully.
+        model_version (str): The version of the loaded model.
+        model_load_seconds (float): The time spent loading the model.
+        warmup_seconds (float): The duration of the warm-up.
+        steps (dict): The duration of each warm-up step.
+        error (str): The warm-up error, if any.
+    """
+
+    status = fields.Str(required=True, metadata=STATUS_METADATA, description=STATUS_DESCRIPTION)
+    ready = fields.Bool(required=True, metadata=READY_METADATA, description=READY_DESCRIPTION)
+    model_version = fields.Str(allow_none=True, metadata=MODEL_VERSION_METADATA,
+                               description=MODEL_VERSION_DESCRIPTION)
+    model_load_seconds = fields.Float(allow_none=True, metadata=MODEL_LOAD_SECONDS_METADATA,
+                                      description=MODEL_LOAD_SECONDS_DESCRIPTION)
+    warmup_seconds = fields.Float(allow_none=True, metadata=WARMUP_SECONDS_METADATA,
+                                  description=WARMUP_SECONDS_DESCRIPTION)
+    steps = fields.Dict(keys=fields.Str(), values=fields.Float(), metadata=STEPS_METADATA,
+                        description=STEPS_DESCRIPTION)
+    error = fields.Str(allow_none=True, description=ERROR_DESCRIPTION)
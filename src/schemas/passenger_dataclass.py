@@ -2,15 +2,18 @@
 Dataclass module for the Passenger.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class PassengerData:
     """
     Represents a passenger.
 
+    Instances use `__slots__`, so they are smaller and faster to create than
+    regular dataclasses; one is created per passenger of every request.
+
     Attributes:
         name (str): The name of the passenger.
         ticket_class (int): The passenger's ticket class.
@@ -36,3 +39,6 @@ class PassengerData:
     age: Optional[float] = None
     cabin: Optional[str] = None
     embarked: Optional[str] = None
+
+
+PASSENGER_DATA_FIELDS = tuple(field.name for field in fields(PassengerData))
@@ -3,6 +3,8 @@ Schema module for Passenger entities.
 """
 
 from marshmallow import Schema, fields, validate
+from webargs.fields import DelimitedList
+from schemas.compiled_schema import CompiledDumpSchema, CompiledLoadSchema
 
 NAME_METADATA = metadata = {
     'example': 'Snyder, Mrs. John Pillsbury (Nelle Stevenson)'}
@@ -39,12 +41,51 @@ EMBARKED_DESCRIPTION = 'Porto de embarque do(a) Passageiro(a)'
 SURVIVED_METADATA = metadata = {
     'example': True}
 SURVIVED_DESCRIPTION = 'Sobrevivência do Passageiro(a)'
+MODEL_VERSION_METADATA = metadata = {
+    'example': 'default'}
+MODEL_VERSION_DESCRIPTION = 'Versão do modelo que previu a sobrevivência do(a) Passageiro(a)'
+PASSENGERS_METADATA = metadata = {
+    'example': [{'name': 'Snyder, Mrs. John Pillsbury (Nelle Stevenson)', 'ticket_class': 1,
+                 'sex': 'female', 'age': 23, 'number_siblings_spouses': 1,
+                 'number_parents_children': 0, 'ticket': '21228', 'fare': 82.2667,
+                 'cabin': 'B45', 'embarked': 'Cherbourg'}]}
+PASSENGERS_DESCRIPTION = 'Lista de Passageiros(as)'
+PASSENGERS_ERRORS_METADATA = metadata = {
+    'example': {'1': {'sex': ['Sex must be either male or female.']}}}
+PASSENGER_VIEW_FIELDS = ('id', 'name', 'ticket_class', 'sex', 'age', 'number_siblings_spouses',
+                         'number_parents_children', 'ticket', 'fare', 'cabin', 'embarked',
+                         'survived', 'model_version')
+CURSOR_DESCRIPTION = 'Cursor da página: retorna passageiros(as) com `id` maior que este valor'
+LIMIT_DESCRIPTION = 'Quantidade máxima de passageiros(as) por página'
+FIELDS_DESCRIPTION = 'Campos a serem retornados, separados por vírgula'
+CREATED_AFTER_DESCRIPTION = 'Retorna passageiros(as) cadastrados(as) a partir desta data'
+CREATED_BEFORE_DESCRIPTION = 'Retorna passageiros(as) cadastrados(as) antes desta data'
+FORMAT_METADATA = metadata = {
+    'example': 'ndjson'}
+FORMAT_DESCRIPTION = 'Formato da exportação: `ndjson` ou `csv`'
+PASSENGERS_ERRORS_DESCRIPTION = 'Erros de validação por posição do(a) Passageiro(a) no lote'
+PASSENGER_STATS_GROUP_FIELDS = ('ticket_class', 'sex', 'embarked')
+GROUP_BY_DESCRIPTION = 'Campos de agrupamento das estatísticas, separados por vírgula ' \
+    '(`ticket_class`, `sex` e/ou `embarked`)'
+TOTAL_METADATA = metadata = {
+    'example': 94}
+TOTAL_DESCRIPTION = 'Quantidade de passageiros(as)'
+SURVIVED_COUNT_METADATA = metadata = {
+    'example': 91}
+SURVIVED_COUNT_DESCRIPTION = 'Quantidade de sobreviventes'
+SURVIVAL_RATE_METADATA = metadata = {
+    'example': 0.9681}
+SURVIVAL_RATE_DESCRIPTION = 'Taxa de sobrevivência (sobreviventes / passageiros(as))'
+STATS_GROUPS_DESCRIPTION = 'Estatísticas por grupo'
 
 
-class PassengerSchema(Schema):
+class PassengerSchema(CompiledLoadSchema):
     """
     Schema for validating and serializing passenger input data.
 
+    Valid payloads are loaded through the compiled fast path of
+    `CompiledLoadSchema`; invalid ones are reported by marshmallow.
+
     Attributes:
         name (str): The name of the passenger (min 3, max 100 characters).
         ticket_class (int): The passenger's ticket class (1, 2 or 3).
@@ -105,10 +146,12 @@ class PassengerSchema(Schema):
                                 error="Embkarked value must be one either Cherbourg, Queenstown or Southampton."))
 
 
-class PassengerViewSchema(Schema):
+class PassengerViewSchema(CompiledDumpSchema):
     """
     Schema for serializing passenger data for output.
 
+    Passengers are dumped through the compiled fast path of `CompiledDumpSchema`.
+
     Attributes:
         id (int): The unique identifier of the passenger.
         name (str): The name of the passenger.
@@ -124,6 +167,7 @@ class PassengerViewSchema(Schema):
         cabin (str): The ticket's designated cabin.
         embarked (str): The passenger's boarding port.
         survived (bool): The fate of the passenger after the collision.
+        model_version (str): The version of the model that predicted the outcome.
     """
 
     id = fields.Int(dump_only=True)
@@ -152,3 +196,181 @@ class PassengerViewSchema(Schema):
         required=False, allow_none=True, metadata=EMBARKED_METADATA, description=EMBARKED_DESCRIPTION)
     survived = fields.Bool(
         required=True, metadata=SURVIVED_METADATA, description=SURVIVED_DESCRIPTION)
+    model_version = fields.Str(
+        allow_none=True, metadata=MODEL_VERSION_METADATA, description=MODEL_VERSION_DESCRIPTION)
+
+
+class PassengerBatchSchema(Schema):
+    """
+    Schema for validating a batch of passenger input data.
+
+    Each item is validated individually against `PassengerSchema`, so the
+    envelope only checks that a list of passengers was provided.
+
+    Attributes:
+        passengers (list): The passengers to be registered.
+    """
+
+    passengers = fields.List(fields.Raw(allow_none=True), required=True,
+                             metadata=PASSENGERS_METADATA,
+                             description=PASSENGERS_DESCRIPTION)
+
+
+class PassengerBatchViewSchema(Schema):
+    """
+    Schema for serializing the outcome of a batch of passengers.
+
+    Attributes:
+        passengers (list): The registered passengers.
+        errors (dict): Validation errors keyed by the index of the rejected
+        passenger in the submitted batch.
+    """
+
+    passengers = fields.List(fields.Nested(PassengerViewSchema), required=True)
+    errors = fields.Dict(keys=fields.String(), values=fields.Dict(), required=True,
+                         metadata=PASSENGERS_ERRORS_METADATA,
+                         description=PASSENGERS_ERRORS_DESCRIPTION)
+
+
+class PassengerFilterSchema(Schema):
+    """
+    Schema for validating the passenger filters accepted as query arguments.
+
+    Attributes:
+        survived (bool): Only passengers with this survival outcome.
+        ticket_class (int): Only passengers of this ticket class.
+        sex (str): Only passengers of this gender.
+        created_after (datetime): Only passengers registered at or after this moment.
+        created_before (datetime): Only passengers registered before this moment.
+    """
+
+    survived = fields.Bool(metadata=SURVIVED_METADATA, description=SURVIVED_DESCRIPTION)
+    ticket_class = fields.Integer(metadata=TICKET_CLASS_METADATA, description=TICKET_CLASS_DESCRIPTION,
+                                  validate=validate.OneOf(
+                                      [1, 2, 3],
+                                      error="Ticket class must be 1 (First), "
+                                      "2 (Second), or 3 (Third)"))
+    sex = fields.Str(metadata=SEX_METADATA, description=SEX_DESCRIPTION,
+                     validate=validate.OneOf(
+                         ['male', 'female'],
+                         error="Sex must be either male or female."))
+    created_after = fields.DateTime(description=CREATED_AFTER_DESCRIPTION)
+    created_before = fields.DateTime(description=CREATED_BEFORE_DESCRIPTION)
+
+
+class PassengerProjectionSchema(PassengerFilterSchema):
+    """
+    Schema for validating the passenger filters and the field projection.
+
+    Attributes:
+        fields (list): Passenger fields to be returned.
+    """
+
+    fields = DelimitedList(fields.Str(validate=validate.OneOf(
+        PASSENGER_VIEW_FIELDS, error="Field must be one of: {choices}.")),
+        validate=validate.Length(min=1, error="At least one field must be given."),
+        description=FIELDS_DESCRIPTION)
+
+
+class PassengerListArgsSchema(PassengerProjectionSchema):
+    """
+    Schema for validating the query arguments of the passenger list.
+
+    Attributes:
+        cursor (int): Identifier of the last passenger of the previous page.
+        limit (int): Maximum number of passengers in the page.
+    """
+
+    cursor = fields.Integer(description=CURSOR_DESCRIPTION,
+                            validate=validate.Range(min=0, error="Cursor must be at least 0."))
+    limit = fields.Integer(description=LIMIT_DESCRIPTION,
+                           validate=validate.Range(min=1, error="Limit must be at least 1."))
+
+
+class PassengerExportArgsSchema(PassengerProjectionSchema):
+    """
+    Schema for validating the query arguments of the passenger export.
+
+    Attributes:
+        format (str): Output format of the export (ndjson or csv).
+    """
+
+    format = fields.Str(load_default='ndjson', metadata=FORMAT_METADATA,
+                        description=FORMAT_DESCRIPTION,
+                        validate=validate.OneOf(['ndjson', 'csv'],
+                                                error="Format must be either ndjson or csv."))
+
+
+class PassengerStatsArgsSchema(Schema):
+    """
+    Schema for validating the query arguments of the passenger statistics.
+
+    Attributes:
+        group_by (list): Fields the statistics are grouped by.
+        ticket_class (int): Only passengers of this ticket class.
+        sex (str): Only passengers of this gender.
+        embarked (str): Only passengers from this boarding port.
+    """
+
+    group_by = DelimitedList(fields.Str(validate=validate.OneOf(
+        PASSENGER_STATS_GROUP_FIELDS, error="Group field must be one of: {choices}.")),
+        load_default=list(PASSENGER_STATS_GROUP_FIELDS), description=GROUP_BY_DESCRIPTION)
+    ticket_class = fields.Integer(metadata=TICKET_CLASS_METADATA, description=TICKET_CLASS_DESCRIPTION,
+                                  validate=validate.OneOf(
+                                      [1, 2, 3],
+                                      error="Ticket class must be 1 (First), "
+                                      "2 (Second), or 3 (Third)"))
+    sex = fields.Str(metadata=SEX_METADATA, description=SEX_DESCRIPTION,
+                     validate=validate.OneOf(
+                         ['male', 'female'],
+                         error="Sex must be either male or female."))
+    embarked = fields.Str(metadata=EMBARKED_METADATA, description=EMBARKED_DESCRIPTION,
+                          validate=validate.OneOf(['Cherbourg', 'Queenstown', 'Southampton'],
+                                                  error="Embkarked value must be one either Cherbourg, Queenstown or Southampton."))
+
+
+class PassengerStatsGroupSchema(Schema):
+    """
+    Schema for serializing the statistics of one group of passengers.
+
+    Only the fields the statistics were grouped by are present.
+
+    Attributes:
+        ticket_class (int): The ticket class of the group.
+        sex (str): The gender of the group.
+        embarked (str): The boarding port of the group (null when unknown).
+        total (int): The number of passengers in the group.
+        survived (int): The number of survivors in the group.
+        survival_rate (float): The share of survivors in the group.
+    """
+
+    ticket_class = fields.Integer(metadata=TICKET_CLASS_METADATA,
+                                  description=TICKET_CLASS_DESCRIPTION)
+    sex = fields.Str(metadata=SEX_METADATA, description=SEX_DESCRIPTION)
+    embarked = fields.Str(allow_none=True, metadata=EMBARKED_METADATA,
+                          description=EMBARKED_DESCRIPTION)
+    total = fields.Integer(required=True, metadata=TOTAL_METADATA, description=TOTAL_DESCRIPTION)
+    survived = fields.Integer(required=True, metadata=SURVIVED_COUNT_METADATA,
+                              description=SURVIVED_COUNT_DESCRIPTION)
+    survival_rate = fields.Float(required=True, metadata=SURVIVAL_RATE_METADATA,
+                                 description=SURVIVAL_RATE_DESCRIPTION)
+
+
+class PassengerStatsViewSchema(Schema):
+    """
+    Schema for serializing the passenger statistics.
+
+    Attributes:
+        total (int): The number of passengers matching the filters.
+        survived (int): The number of survivors matching the filters.
+        survival_rate (float): The share of survivors matching the filters.
+        groups (list): The statistics of each group.
+    """
+
+    total = fields.Integer(required=True, metadata=TOTAL_METADATA, description=TOTAL_DESCRIPTION)
+    survived = fields.Integer(required=True, metadata=SURVIVED_COUNT_METADATA,
+                              description=SURVIVED_COUNT_DESCRIPTION)
+    survival_rate = fields.Float(required=True, metadata=SURVIVAL_RATE_METADATA,
+                                 description=SURVIVAL_RATE_DESCRIPTION)
+    groups = fields.List(fields.Nested(PassengerStatsGroupSchema), required=True,
+                         description=STATS_GROUPS_DESCRIPTION)
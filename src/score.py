@@ -0,0 +1,220 @@
+"""
+Command-line entry point for offline bulk scoring.
+
+This module reads a CSV or Parquet file shaped like `data/train.csv` in
+fixed-size chunks, predicts the survival of every passenger with the bundled
+model and streams the predictions to an output file, optionally spreading the
+chunks over a pool of worker processes.
+
+Usage:
+    python src/score.py INPUT OUTPUT [--chunk-size N] [--workers N] [--bundle PATH]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+import pandas as pd
+
+from ml.config import MODEL_BUNDLE_PATH
+from ml.preprocessor import PreProcessor
+from ml.registry import ModelRegistry
+
+ID_COLUMN = 'PassengerId'
+PREDICTION_COLUMN = 'Survived'
+
+_registry = None
+
+
+def read_chunks(path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Parquet file in chunks of `chunk_size` rows.
+
+    Args:
+        path (str): Path to a `.csv` or `.parquet` file.
+        chunk_size (int): Number of rows per chunk.
+
+    Returns:
+        Iterator[pd.DataFrame]: The chunks of the file, in order.
+    """
+
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def score_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Predict the survival of every passenger in a chunk.
+
+    Args:
+        chunk (pd.DataFrame): Raw passenger data.
+
+    Returns:
+        pd.DataFrame: The passenger identifiers (or row numbers) and predictions.
+    """
+
+    global _registry
+
+    if _registry is None:
+        _registry = ModelRegistry(MODEL_BUNDLE_PATH)
+    bundle = _registry.get()
+
+    X_scaled = PreProcessor().preprocess_new_data(chunk, bundle.preprocessor)
+    predictions = bundle.model.predict(X_scaled)
+
+    ids = chunk[ID_COLUMN] if ID_COLUMN in chunk else chunk.index
+    return pd.DataFrame({ID_COLUMN: ids, PREDICTION_COLUMN: predictions.astype(int)})
+
+
+def _init_worker(bundle_path: str):
+    global _registry
+
+    _registry = ModelRegistry(bundle_path)
+    _registry.get()
+
+
+class PredictionWriter:
+    """
+    Appends prediction chunks to a CSV or Parquet file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self._opened = False
+        self._parquet_writer = None
+
+    def write(self, predictions: pd.DataFrame):
+        """
+        Append a chunk of predictions to the output file.
+
+        Args:
+            predictions (pd.DataFrame): Predictions returned by `score_chunk`.
+        """
+
+        if self.path.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(predictions, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            predictions.to_csv(self.path, mode='a' if self._opened else 'w',
+                               header=not self._opened, index=False)
+        self._opened = True
+        self.rows += len(predictions)
+
+    def close(self):
+        """
+        Flush and close the output file, writing the header alone when no
+        prediction was written.
+        """
+
+        if not self._opened:
+            self.write(pd.DataFrame({ID_COLUMN: pd.Series(dtype='int64'),
+                                     PREDICTION_COLUMN: pd.Series(dtype='int64')}))
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def score_file(input_path: str, output_path: str, chunk_size: int, workers: int,
+               bundle_path: str = MODEL_BUNDLE_PATH) -> int:
+    """
+    Score a whole file and stream the predictions to the output file.
+
+    With more than one worker, chunks are scored in a process pool. At most two
+    chunks per worker are in flight at any time and results are written in input
+    order, so peak memory depends on the chunk size and not on the file size.
+    Empty chunks are skipped; an input without rows gives an output with only
+    the header.
+
+    Args:
+        input_path (str): Path to the passengers file.
+        output_path (str): Path to the predictions file.
+        chunk_size (int): Number of rows per chunk.
+        workers (int): Number of worker processes (1 scores in this process).
+        bundle_path (str): Path to the model bundle.
+
+    Returns:
+        int: Number of scored rows.
+    """
+
+    writer = PredictionWriter(output_path)
+    chunks = (chunk for chunk in read_chunks(input_path, chunk_size) if not chunk.empty)
+
+    try:
+        if workers <= 1:
+            _init_worker(bundle_path)
+            for chunk in chunks:
+                writer.write(score_chunk(chunk))
+            return writer.rows
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(bundle_path,)) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(score_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    writer.write(pending.popleft().result())
+            while pending:
+                writer.write(pending.popleft().result())
+        return writer.rows
+    finally:
+        writer.close()
+
+
+def _int_at_least(minimum: int):
+    def parse(value: str) -> int:
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f'invalid integer: {value!r}') from None
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f'must be at least {minimum}, got {number}')
+        return number
+
+    return parse
+
+
+def main(argv=None):
+    """
+    Parse the command-line arguments, score the file and report the throughput.
+    """
+
+    parser = argparse.ArgumentParser(
+        description='Predict the survival of the passengers in a CSV or Parquet file.')
+    parser.add_argument('input', help='CSV or Parquet file shaped like data/train.csv')
+    parser.add_argument('output', help='CSV or Parquet file for the predictions')
+    parser.add_argument('--chunk-size', type=_int_at_least(1), default=10000,
+                        help='rows scored at a time (default: 10000)')
+    parser.add_argument('--workers', type=_int_at_least(0), default=1,
+                        help='worker processes, 0 for one per core (default: 1)')
+    parser.add_argument('--bundle', default=MODEL_BUNDLE_PATH,
+                        help='path to the model bundle')
+    args = parser.parse_args(argv)
+
+    workers = args.workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    rows = score_file(args.input, args.output, args.chunk_size, workers, args.bundle)
+    elapsed = time.perf_counter() - start
+
+    print(f'Scored {rows} rows in {elapsed:.2f}s '
+          f'({rows / elapsed if elapsed else 0:.0f} rows/s) with {workers} worker(s).',
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
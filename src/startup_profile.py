@@ -0,0 +1,109 @@
+"""
+Start-up profiling module.
+
+This module provides a `StartupProfile` that times the start-up stages of the
+application (imports, database initialization, model load) and the import of
+every module loaded while it is active, and formats them as a report.
+"""
+
+import builtins
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+class StartupProfile:
+    """
+    Collector of start-up stage timings and per-module import costs.
+
+    Import costs are measured by wrapping `builtins.__import__`: every `import`
+    statement of a module that is not loaded yet is timed, inclusive of the
+    modules it imports itself, and its self time excludes them (like
+    `python -X importtime`). A disabled profile does nothing.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.stages: List[Tuple[str, float]] = []
+        self.imports: Dict[str, Tuple[float, float]] = {}
+        self._original_import = None
+        self._stack: List[float] = []
+        self._thread = threading.get_ident()
+        self._started = time.perf_counter()
+
+    def start(self):
+        """
+        Start timing the imports.
+        """
+
+        if self.enabled and self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+
+    def stop(self):
+        """
+        Stop timing the imports.
+        """
+
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time a start-up stage.
+
+        Args:
+            name (str): Name of the stage in the report.
+        """
+
+        if not self.enabled:
+            yield
+            return
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - started))
+
+    def report(self, top: int = 20) -> str:
+        """
+        Format the stage timings and the most expensive imports.
+
+        Args:
+            top (int): Number of modules listed, by decreasing inclusive time.
+
+        Returns:
+            str: The report, one line per stage and per module, in milliseconds.
+        """
+
+        lines = ['Start-up profile (ms):']
+        for name, seconds in self.stages:
+            lines.append(f'  {name:<40} {seconds * 1000:>9.1f}')
+        lines.append(f"  {'total':<40} {(time.perf_counter() - self._started) * 1000:>9.1f}")
+
+        lines.append(f"Imports ({len(self.imports)} modules, top {top} by inclusive time):")
+        lines.append(f"  {'module':<40} {'inclusive':>9} {'self':>9}")
+        ranked = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (inclusive, own) in ranked[:top]:
+            lines.append(f'  {name:<40} {inclusive * 1000:>9.1f} {own * 1000:>9.1f}')
+        return '\n'.join(lines)
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules or threading.get_ident() != self._thread:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = self._stack.pop()
+            self.imports[name] = (elapsed, elapsed - children)
+            if self._stack:
+                self._stack[-1] += elapsed
@@ -0,0 +1,143 @@
+"""
+Test script for the directory bundle format.
+
+Converts the pickled bundle, loads it back with memory-mapped arrays and checks
+that it preprocesses and predicts exactly like the original, including in lean
+mode, where neither scikit-learn nor pandas may be imported.
+"""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml.artifacts import export_bundle, load_bundle
+from ml.feature_vector import FeatureVectorBuilder
+from ml.pipeline import Pipeline
+from ml.preprocessor import PreProcessor
+from ml.registry import ModelRegistry
+from tests.preprocessor_test import row_to_passenger
+
+
+dataset = pd.read_csv('./src/data/train.csv')
+test_dataset = pd.read_csv('./src/data/test_dataset_titanic.csv')
+bundle = Pipeline().load_pipeline('./src/ml/titanic_model_bundle.pkl')
+
+
+def test_directory_bundle_matches_pickle(tmp_path):
+    """
+    Test that a converted bundle gives the same features and predictions.
+
+    Steps:
+    - Export the pickled bundle to a directory and load it back.
+    - Check that the arrays are memory-mapped read-only.
+    - Compare the preprocessed training features bit-for-bit.
+    - Compare the predictions on the training and test datasets.
+
+    Raises:
+        AssertionError: If the converted bundle behaves differently.
+    """
+
+    export_bundle(bundle, str(tmp_path))
+    converted = load_bundle(str(tmp_path))
+
+    assert isinstance(converted['model'].support_vectors, np.memmap)
+    assert not converted['model'].support_vectors.flags.writeable
+
+    preprocessor = PreProcessor()
+    expected = preprocessor.preprocess_new_data(dataset, bundle['preprocessor'])
+    actual = preprocessor.preprocess_new_data(dataset, converted['preprocessor'])
+
+    assert actual.tobytes() == expected.tobytes()
+    np.testing.assert_array_equal(converted['model'].predict(actual),
+                                  bundle['model'].predict(expected))
+
+    X_test = bundle['preprocessor']['scaler'].transform(test_dataset.iloc[:, 0:-1])
+    np.testing.assert_array_equal(converted['model'].predict(X_test),
+                                  bundle['model'].predict(X_test))
+
+
+def test_registry_loads_directory_bundle(tmp_path):
+    """
+    Test that the registry serves and reloads directory bundles.
+
+    Raises:
+        AssertionError: If the bundle is not loaded or not reloaded on change.
+    """
+
+    export_bundle(bundle, str(tmp_path))
+    registry = ModelRegistry(str(tmp_path), check_interval=0)
+
+    first = registry.get()
+    assert registry.get() is first
+
+    export_bundle({**bundle, 'preprocessor': {**bundle['preprocessor'],
+                                              'embarked_mode_pclass1': 'C'}},
+                  str(tmp_path))
+
+    second = registry.get()
+    assert second.version != first.version
+    assert second.preprocessor['embarked_mode_pclass1'] == 'C'
+
+
+def test_lean_bundle_matches_model(tmp_path):
+    """
+    Test that a lean directory bundle scores exactly like the pickled model.
+
+    Steps:
+    - Load the converted bundle in lean mode (plain dictionaries, no pandas).
+    - Compare the feature rows built for the training passengers with the
+      pandas preprocessing.
+    - Compare the predictions on the test dataset with `model.predict`.
+
+    Raises:
+        AssertionError: If the lean bundle behaves differently.
+    """
+
+    export_bundle(bundle, str(tmp_path))
+    lean = load_bundle(str(tmp_path), lean=True)
+
+    assert isinstance(lean['preprocessor']['age_medians'], dict)
+
+    builder = FeatureVectorBuilder(lean['preprocessor'])
+    rows = np.vstack([builder.build(row_to_passenger(row)) for _, row in dataset.iterrows()])
+    expected = PreProcessor().preprocess_new_data(dataset, bundle['preprocessor'])
+    np.testing.assert_array_equal(rows, expected)
+
+    X_test = bundle['preprocessor']['scaler'].transform(test_dataset.iloc[:, 0:-1])
+    np.testing.assert_array_equal(lean['model'].predict(X_test), bundle['model'].predict(X_test))
+
+    with pytest.raises(ValueError):
+        ModelRegistry('./src/ml/titanic_model_bundle.pkl', lean=True).get()
+
+
+def test_lean_mode_does_not_import_sklearn_or_pandas(tmp_path):
+    """
+    Test that scoring passengers in lean mode never imports scikit-learn or pandas.
+
+    Raises:
+        AssertionError: If one of them is imported.
+    """
+
+    export_bundle(bundle, str(tmp_path / 'bundle'))
+    script = (
+        'import sys\n'
+        'from business.passenger_business import get_passenger_survival_prediction, '
+        'get_passengers_survival_predictions\n'
+        'from schemas.passenger_dataclass import PassengerData\n'
+        "data = PassengerData(name='Braund, Mr. Owen Harris', ticket_class=3, sex='male', "
+        "number_siblings_spouses=1, number_parents_children=0, ticket='A/5 21171', fare=7.25)\n"
+        'print(get_passenger_survival_prediction(data), '
+        'get_passengers_survival_predictions([data, data]))\n'
+        "print(sorted({name.split('.')[0] for name in sys.modules} & {'sklearn', 'pandas', 'scipy'}))\n"
+    )
+    env = {**os.environ, 'TITANIC_LEAN': '1', 'TITANIC_MODEL_BUNDLE': str(tmp_path / 'bundle'),
+           'DATABASE_URL': f"sqlite:///{tmp_path / 'lean.db'}"}
+
+    output = subprocess.run([sys.executable, '-c', script], cwd='./src', env=env,
+                            check=True, capture_output=True, text=True).stdout.splitlines()
+
+    assert output == ['False [False, False]', '[]']
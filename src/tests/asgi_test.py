@@ -0,0 +1,90 @@
+"""
+Test script for the ASGI serving mode.
+
+Sends requests straight to the ASGI application and checks that the natively
+handled POST /passenger answers exactly like the Flask application, and that
+the other requests are passed to Flask.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip('aiosqlite')
+
+from asgi import create_asgi_app  # noqa: E402  pylint: disable=wrong-import-position
+
+PASSENGER = {'name': 'Snyder, Mrs. John Pillsbury (Nelle Stevenson)', 'ticket_class': 1,
+             'sex': 'female', 'age': 23.0, 'number_siblings_spouses': 1,
+             'number_parents_children': 0, 'ticket': '21228', 'fare': 82.2667,
+             'cabin': 'B45', 'embarked': 'Cherbourg'}
+
+
+async def request(app, method: str, path: str, body: bytes = b'', query_string: bytes = b''):
+    """
+    Send one HTTP request to an ASGI application.
+
+    Returns:
+        tuple: The status, the headers and the body of the response.
+    """
+
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    await app({'type': 'http', 'method': method, 'path': path, 'root_path': '',
+               'query_string': query_string, 'http_version': '1.1', 'scheme': 'http',
+               'headers': [(b'content-type', b'application/json')],
+               'server': ('testserver', 80), 'client': ('127.0.0.1', 5000)},
+              receive, send)
+
+    return (sent[0]['status'], dict(sent[0]['headers']),
+            b''.join(message.get('body', b'') for message in sent[1:]))
+
+
+def test_asgi_app_matches_flask(tmp_path, monkeypatch):
+    """
+    Test that native and delegated requests answer like the Flask application.
+
+    Steps:
+    - Create a passenger through the native path and through Flask's test client.
+    - Send an invalid passenger, which must get Flask's validation errors.
+    - List and export the passengers through the Flask delegation.
+
+    Raises:
+        AssertionError: If a response differs from the Flask one.
+    """
+
+    monkeypatch.setattr('business.warmup.MODEL_WARMUP', False)
+    app = create_asgi_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'asgi.db'}"})
+    client = app.app.test_client()
+
+    async def scenario():
+        created = await request(app, 'POST', '/passenger', json.dumps(PASSENGER).encode())
+        invalid = await request(app, 'POST', '/passenger',
+                                json.dumps({**PASSENGER, 'sex': 'other'}).encode())
+        listed = await request(app, 'GET', '/passengers', query_string=b'limit=10')
+        exported = await request(app, 'GET', '/passengers/export', query_string=b'format=csv')
+        await app.close()
+        return created, invalid, listed, exported
+
+    created, invalid, listed, exported = asyncio.run(scenario())
+
+    flask_created = client.post('/passenger', json=PASSENGER)
+    assert created[0] == 201
+    assert json.loads(created[2]) == {**flask_created.get_json(), 'id': 1}
+    assert created[1][b'content-type'] == b'application/json'
+
+    flask_invalid = client.post('/passenger', json={**PASSENGER, 'sex': 'other'})
+    assert (invalid[0], invalid[2]) == (422, flask_invalid.get_data())
+
+    assert listed[0] == 200 and [passenger['id'] for passenger in json.loads(listed[2])] == [1]
+    assert exported[0] == 200 and exported[2].decode().count('\r\n') == 2
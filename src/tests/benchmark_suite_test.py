@@ -0,0 +1,24 @@
+"""
+Test script for the regression check of the benchmark suite.
+"""
+
+from benchmarks.suite import compare
+
+
+def test_compare_flags_regressions_above_threshold():
+    """
+    Test that only benchmarks slower than the threshold are flagged.
+
+    Raises:
+        AssertionError: If a benchmark is flagged wrongly or missing ones are compared.
+    """
+
+    baseline = {'fast': {'median': 1.0}, 'slow': {'median': 1.0}, 'removed': {'median': 1.0}}
+    results = {'fast': {'median': 1.1}, 'slow': {'median': 1.3}, 'added': {'median': 1.0}}
+
+    comparison = {entry['name']: entry for entry in compare(results, baseline, threshold=0.2)}
+
+    assert sorted(comparison) == ['fast', 'slow']
+    assert not comparison['fast']['regression']
+    assert comparison['slow']['regression']
+    assert abs(comparison['slow']['ratio'] - 1.3) < 1e-9
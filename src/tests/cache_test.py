@@ -0,0 +1,60 @@
+"""
+Test script for the in-memory LRU cache.
+"""
+
+from business.cache import LRUCache
+
+
+class FakeClock:
+    """
+    Manually advanced clock for expiration tests.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_evicts_least_recently_used():
+    """
+    Test that the least recently used entry is evicted when the cache is full.
+
+    Raises:
+        AssertionError: If the wrong entry is evicted or counters are off.
+    """
+
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['hits'] == 3
+    assert cache.stats()['misses'] == 1
+
+
+def test_cache_expires_entries():
+    """
+    Test that entries older than the time-to-live are treated as missing.
+
+    Raises:
+        AssertionError: If an expired entry is returned.
+    """
+
+    clock = FakeClock()
+    cache = LRUCache(maxsize=10, ttl=5, clock=clock)
+    cache.set('a', False)
+
+    clock.now = 4.9
+    assert cache.get('a') is False
+
+    clock.now = 5.0
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+    assert len(cache) == 0
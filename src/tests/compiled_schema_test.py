@@ -0,0 +1,116 @@
+"""
+Test script for the compiled fast paths of the passenger schemas.
+
+Every payload is loaded and dumped both through the fast path and through plain
+marshmallow, and the results or error messages must be identical.
+"""
+
+import math
+
+import pytest
+from marshmallow import Schema, ValidationError
+
+from database.models.passenger import Passenger
+from schemas.passenger_schema import PassengerSchema, PassengerViewSchema
+
+VALID = {'name': 'Snyder, Mrs. John Pillsbury (Nelle Stevenson)', 'ticket_class': 1,
+         'sex': 'female', 'age': 23, 'number_siblings_spouses': 1,
+         'number_parents_children': 0, 'ticket': '21228', 'fare': 82.2667,
+         'cabin': 'B45', 'embarked': 'Cherbourg'}
+
+PAYLOADS = [
+    VALID,
+    {key: value for key, value in VALID.items() if key not in ('age', 'cabin', 'embarked')},
+    {**VALID, 'age': None, 'fare': None, 'cabin': None, 'embarked': None},
+    {**VALID, 'age': 120, 'fare': 0},
+    {**VALID, 'name': 'Al'},
+    {**VALID, 'name': 'x' * 101},
+    {**VALID, 'ticket_class': 4},
+    {**VALID, 'ticket_class': True},
+    {**VALID, 'ticket_class': '1'},
+    {**VALID, 'ticket_class': 1.0},
+    {**VALID, 'sex': 'other'},
+    {**VALID, 'sex': None},
+    {**VALID, 'age': -1},
+    {**VALID, 'age': 120.5},
+    {**VALID, 'age': '23'},
+    {**VALID, 'age': math.nan},
+    {**VALID, 'fare': math.inf},
+    {**VALID, 'fare': 10 ** 400},
+    {**VALID, 'number_siblings_spouses': -1},
+    {**VALID, 'cabin': 'b45'},
+    {**VALID, 'embarked': 'Belfast'},
+    {**VALID, 'ticket': 21228},
+    {**VALID, 'unexpected': 1},
+    {key: value for key, value in VALID.items() if key != 'name'},
+    [VALID],
+    'not a passenger',
+]
+
+
+def _outcome(load, payload):
+    try:
+        return 'ok', load(payload)
+    except (ValidationError, OverflowError) as error:
+        return 'error', getattr(error, 'messages', type(error))
+
+
+@pytest.mark.parametrize('payload', PAYLOADS)
+def test_fast_load_matches_marshmallow(payload):
+    """
+    Test that single passengers load with the same result or errors.
+
+    Raises:
+        AssertionError: If the fast path and marshmallow disagree.
+    """
+
+    schema = PassengerSchema()
+
+    assert _outcome(schema.load, payload) == _outcome(
+        lambda data: Schema.load(schema, data), payload)
+    assert schema.validate(payload) == Schema.validate(schema, payload)
+
+
+def test_fast_load_many_matches_marshmallow():
+    """
+    Test that batches load and validate like marshmallow, errors included.
+
+    Raises:
+        AssertionError: If the fast path and marshmallow disagree.
+    """
+
+    schema = PassengerSchema(many=True)
+    valid = [payload for payload in PAYLOADS[:4]]
+    mixed = [payload for payload in PAYLOADS if isinstance(payload, dict)]
+
+    for payloads in (valid, mixed, []):
+        assert _outcome(schema.load, payloads) == _outcome(
+            lambda data: Schema.load(schema, data), payloads)
+        assert schema.validate(payloads) == Schema.validate(schema, payloads)
+
+
+def test_fast_dump_matches_marshmallow():
+    """
+    Test that models, dictionaries and projections dump like marshmallow.
+
+    Raises:
+        AssertionError: If the fast path and marshmallow disagree.
+    """
+
+    loaded = PassengerSchema().load(VALID)
+    passengers = [
+        Passenger(**loaded, survived=True),
+        {**loaded, 'id': 7, 'survived': False},
+        {'id': 3, 'name': 'Braund, Mr. Owen Harris', 'age': 22, 'survived': 1},
+        {**loaded, 'id': None, 'survived': True, 'created_at': 'ignored'},
+    ]
+
+    schema = PassengerViewSchema()
+    for passenger in passengers:
+        assert schema.dump(passenger) == Schema.dump(schema, passenger)
+
+    many = PassengerViewSchema(many=True)
+    assert many.dump(passengers) == Schema.dump(many, passengers)
+
+    projected = PassengerViewSchema(only=('id', 'sex'))
+    assert projected.dump(passengers[1]) == {'id': 7, 'sex': 'female'}
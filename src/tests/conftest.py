@@ -0,0 +1,87 @@
+"""
+Shared fixtures for the test suite.
+
+Database tests run against SQLite and, when available, against PostgreSQL: either
+the server given in TEST_POSTGRES_URL, or a throwaway local cluster started with
+`initdb`/`pg_ctl` when those binaries and a PostgreSQL driver are installed.
+"""
+
+import os
+import shutil
+import socket
+import subprocess
+
+import pytest
+from flask import Flask
+
+from database.db_setup import db, init_db
+from database.models import Passenger  # noqa: F401  pylint: disable=unused-import
+
+
+def _postgres_driver():
+    for module, driver in (('psycopg2', 'psycopg2'), ('psycopg', 'psycopg')):
+        try:
+            __import__(module)
+            return driver
+        except ImportError:
+            continue
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope='session')
+def postgres_url(tmp_path_factory):
+    """
+    URL of a PostgreSQL database for the tests, or skip when none is available.
+    """
+
+    url = os.environ.get('TEST_POSTGRES_URL')
+    if url:
+        yield url
+        return
+
+    driver = _postgres_driver()
+    initdb, pg_ctl = shutil.which('initdb'), shutil.which('pg_ctl')
+    if driver is None or initdb is None or pg_ctl is None:
+        pytest.skip('PostgreSQL is not available (set TEST_POSTGRES_URL or install '
+                    'initdb/pg_ctl and a PostgreSQL driver).')
+
+    data_dir = tmp_path_factory.mktemp('postgres')
+    port = _free_port()
+    subprocess.run([initdb, '-D', str(data_dir), '-A', 'trust', '-U', 'postgres'],
+                   check=True, capture_output=True)
+    subprocess.run([pg_ctl, '-D', str(data_dir), '-l', str(data_dir / 'server.log'), '-w',
+                    '-o', f"-p {port} -k {data_dir} -c listen_addresses=''", 'start'],
+                   check=True, capture_output=True)
+    try:
+        yield f'postgresql+{driver}://postgres@/postgres?host={data_dir}&port={port}'
+    finally:
+        subprocess.run([pg_ctl, '-D', str(data_dir), '-m', 'immediate', 'stop'],
+                       check=False, capture_output=True)
+
+
+@pytest.fixture(params=['sqlite', 'postgresql'])
+def db_app(request, tmp_path):
+    """
+    Flask application bound to an empty database, once per database backend.
+    """
+
+    if request.param == 'sqlite':
+        url = f"sqlite:///{tmp_path / 'test.db'}"
+    else:
+        url = request.getfixturevalue('postgres_url')
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    init_db(app)
+
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
@@ -0,0 +1,88 @@
+"""
+Test script for the database setup.
+
+Checks the engine options of file and in-memory databases, the SQLite pragmas
+applied to new connections, and the creation of indexes missing from an
+existing table.
+"""
+
+from sqlalchemy import inspect, text
+
+from app import create_app
+from database.config import DATABASE_POOL_SIZE, SQLITE_PRAGMAS
+from database.db_setup import create_missing_indexes, db, engine_options
+
+
+def test_engine_options():
+    """
+    Test that the pool sizing options are left out for in-memory SQLite.
+
+    Raises:
+        AssertionError: If the options do not match the database.
+    """
+
+    assert engine_options('sqlite:////tmp/titanic.db')['pool_size'] == DATABASE_POOL_SIZE
+    assert engine_options('postgresql://localhost/titanic')['pool_size'] == DATABASE_POOL_SIZE
+    for url in ('sqlite://', 'sqlite:///:memory:',
+                'sqlite:///file:titanic?mode=memory&cache=shared&uri=true'):
+        assert 'pool_size' not in engine_options(url)
+
+
+def test_in_memory_app(monkeypatch):
+    """
+    Test that an application can be created on an in-memory SQLite database.
+
+    Raises:
+        AssertionError: If the application cannot store a passenger.
+    """
+
+    monkeypatch.setattr('business.warmup.MODEL_WARMUP', False)
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+
+    response = app.test_client().get('/passengers')
+    assert response.status_code == 200 and response.get_json() == []
+
+
+def test_sqlite_pragmas(tmp_path, monkeypatch):
+    """
+    Test that the configured pragmas are applied to every new connection.
+
+    Raises:
+        AssertionError: If a pragma differs from its configured value.
+    """
+
+    monkeypatch.setattr('business.warmup.MODEL_WARMUP', False)
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'pragmas.db'}"})
+
+    with app.app_context(), db.engine.connect() as connection:
+        def pragma(name):
+            return connection.execute(text(f'PRAGMA {name}')).scalar()
+
+        assert pragma('journal_mode').upper() == SQLITE_PRAGMAS['journal_mode'].upper()
+        assert pragma('busy_timeout') == SQLITE_PRAGMAS['busy_timeout']
+        assert pragma('cache_size') == SQLITE_PRAGMAS['cache_size']
+        assert pragma('synchronous') == 1  # NORMAL
+        assert pragma('temp_store') == 2  # MEMORY
+
+
+def test_missing_indexes_are_created(db_app):
+    """
+    Test that indexes missing from an existing table are created.
+
+    Raises:
+        AssertionError: If the dropped indexes are not created again.
+    """
+
+    def indexes():
+        return {index['name'] for index in inspect(db.engine).get_indexes('passenger')}
+
+    expected = indexes()
+    with db.engine.begin() as connection:
+        connection.execute(text('DROP INDEX ix_passenger_sex'))
+        connection.execute(text('DROP INDEX ix_passenger_created_at'))
+    assert 'ix_passenger_sex' not in indexes()
+
+    create_missing_indexes(db.engine)
+    create_missing_indexes(db.engine)
+
+    assert indexes() == expected
@@ -0,0 +1,199 @@
+"""
+Test script for the `Idempotency-Key` deduplication of POST /passenger.
+
+Checks that retries get the original response without scoring or inserting the
+passenger again, from the in-memory cache and from the table, that a reused key
+with another payload is rejected, that keys expire, and that the write-behind
+writer drops retries of a stored key.
+"""
+
+import json
+import time
+from dataclasses import asdict
+
+from app import create_app
+from business import passenger_business
+from business.idempotency import idempotency_cache
+from business.passenger_business import create_passenger
+from business.passenger_writer import PassengerWriter
+from database.db_setup import db
+from database.models import IdempotencyKey, Passenger
+from tests.passenger_repository_test import PASSENGERS
+
+PASSENGER = asdict(PASSENGERS[1])
+
+
+def count_scoring(monkeypatch) -> list:
+    """
+    Record the passengers scored by the business layer.
+    """
+
+    scored = []
+    score_passenger = passenger_business.score_passenger
+
+    def counting_score_passenger(data):
+        scored.append(data)
+        return score_passenger(data)
+
+    monkeypatch.setattr(passenger_business, 'score_passenger', counting_score_passenger)
+    return scored
+
+
+def test_retries_get_the_original_response(tmp_path, monkeypatch):
+    """
+    Test that POST /passenger retries with the same key are deduplicated.
+
+    Steps:
+    - Send a passenger twice with the same key, then again once the in-memory
+      cache was cleared, so the response is read from the table.
+    - Reuse the key with another passenger, send an oversized key and let a key
+      expire.
+
+    Raises:
+        AssertionError: If a retry creates or scores a passenger again, or if an
+        invalid or expired key is not handled.
+    """
+
+    monkeypatch.setattr('business.warmup.MODEL_WARMUP', False)
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'idempotency.db'}"})
+    client = app.test_client()
+    scored = count_scoring(monkeypatch)
+    headers = {'Idempotency-Key': 'retry-1'}
+
+    first = client.post('/passenger', json=PASSENGER, headers=headers)
+    second = client.post('/passenger', json=PASSENGER, headers=headers)
+    idempotency_cache.clear()
+    third = client.post('/passenger', json=PASSENGER, headers=headers)
+
+    assert first.status_code == second.status_code == third.status_code == 201
+    assert first.get_data() == second.get_data() == third.get_data()
+    assert len(scored) == 1
+
+    conflict = client.post('/passenger', json={**PASSENGER, 'age': 30}, headers=headers)
+    assert conflict.status_code == 422
+    assert 'retry-1' in conflict.get_json()['message']
+
+    oversized = client.post('/passenger', json=PASSENGER, headers={'Idempotency-Key': 'k' * 256})
+    assert oversized.status_code == 400
+
+    monkeypatch.setattr('business.idempotency.IDEMPOTENCY_KEY_TTL', -1)
+    expired_headers = {'Idempotency-Key': 'expired-1'}
+    client.post('/passenger', json=PASSENGER, headers=expired_headers)
+    client.post('/passenger', json=PASSENGER, headers=expired_headers)
+    assert len(scored) == 3
+
+    with app.app_context():
+        assert db.session.query(Passenger).count() == 3
+        assert db.session.query(IdempotencyKey).count() == 2
+
+
+def test_write_behind_stores_keys_with_passengers(db_app, monkeypatch):
+    """
+    Test that the write-behind writer stores the keys with their passengers.
+
+    Raises:
+        AssertionError: If a retry is queued again or the key is not written.
+    """
+
+    idempotency_cache.clear()
+    writer = PassengerWriter(db_app, batch_size=10, flush_interval=0.01)
+    writer.start()
+    monkeypatch.setattr(passenger_business, 'get_passenger_writer', lambda: writer)
+    scored = count_scoring(monkeypatch)
+
+    created = [create_passenger(PASSENGERS[0], 'writer-1') for _ in range(3)]
+    writer.stop()
+
+    assert created[0] == created[1] == created[2] and created[0]['id'] is None
+    assert len(scored) == 1
+    assert db.session.query(Passenger).count() == 1
+    assert db.session.query(IdempotencyKey).count() == 1
+
+
+def test_write_behind_replaces_expired_keys(db_app, monkeypatch):
+    """
+    Test that the write-behind writer replaces an expired key with the new one.
+
+    Steps:
+    - Send a request whose key expires right away, then retry it once the key
+      was written, so the retry is scored and queued again.
+    - Retry again with the cache cleared, so the response is read from the table.
+
+    Raises:
+        AssertionError: If the expired key is not replaced by the retry's.
+    """
+
+    def create_and_flush(key):
+        written = writer.stats()['written']
+        response = create_passenger(PASSENGERS[0], key)
+        deadline = time.monotonic() + 5
+        while writer.stats()['written'] == written and time.monotonic() < deadline:
+            time.sleep(0.005)
+        idempotency_cache.clear()
+        return response
+
+    idempotency_cache.clear()
+    writer = PassengerWriter(db_app, batch_size=10, flush_interval=0.01)
+    writer.start()
+    monkeypatch.setattr(passenger_business, 'get_passenger_writer', lambda: writer)
+    scored = count_scoring(monkeypatch)
+
+    try:
+        monkeypatch.setattr('business.idempotency.IDEMPOTENCY_KEY_TTL', -1)
+        create_and_flush('expiring-1')
+        monkeypatch.setattr('business.idempotency.IDEMPOTENCY_KEY_TTL', 3600)
+        create_and_flush('expiring-1')
+        assert create_passenger(PASSENGERS[0], 'expiring-1')['id'] is None
+    finally:
+        writer.stop()
+
+    assert len(scored) == 2
+    assert db.session.query(Passenger).count() == 2
+    stored = db.session.query(IdempotencyKey).one()
+    assert stored.key == 'expiring-1' and stored.expires_at > stored.created_at
+
+
+def test_write_behind_drops_retries_missing_the_cache(db_app, monkeypatch):
+    """
+    Test that the write-behind writer drops a retry whose key is already stored,
+    when the retry missed the in-memory cache (e.g. served by another process).
+
+    Steps:
+    - Send a request and retry it with the cache cleared before the first one
+      is written, so both are queued in the same batch.
+    - Retry it again with the cache cleared after the key was written, but with
+      the table lookup missing it as if the key was not committed yet.
+
+    Raises:
+        AssertionError: If a retry inserts a second passenger or replaces the key.
+    """
+
+    def settled():
+        stats = writer.stats()
+        return stats['written'] + stats['duplicates']
+
+    idempotency_cache.clear()
+    writer = PassengerWriter(db_app, batch_size=10, flush_interval=0.01)
+    monkeypatch.setattr(passenger_business, 'get_passenger_writer', lambda: writer)
+    scored = count_scoring(monkeypatch)
+
+    first = create_passenger(PASSENGERS[0], 'k1')
+    idempotency_cache.clear()
+    create_passenger(PASSENGERS[0], 'k1')
+    writer.start()
+    try:
+        deadline = time.monotonic() + 5
+        while settled() < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+        idempotency_cache.clear()
+        monkeypatch.setattr(passenger_business, 'find_response', lambda key, payload_hash: None)
+        create_passenger(PASSENGERS[0], 'k1')
+    finally:
+        writer.stop()
+
+    assert len(scored) == 3
+    assert writer.stats()['written'] == 1 and writer.stats()['duplicates'] == 2
+    assert db.session.query(Passenger).count() == 1
+    stored = db.session.query(IdempotencyKey).one()
+    assert stored.key == 'k1' and json.loads(stored.response) == first
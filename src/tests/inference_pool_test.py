@@ -0,0 +1,45 @@
+"""
+Test script for the multi-process inference pool.
+"""
+
+import dataclasses
+
+import numpy as np
+
+from business.inference_pool import InferencePool
+from ml.registry import model_registry
+from tests.prediction_batcher_test import predict_concurrently
+
+
+def test_pool_scores_like_the_model():
+    """
+    Test that the worker processes score exactly like the model in process.
+
+    Steps:
+    - Start a pool of two workers and score 40 passengers from concurrent threads.
+    - Score vectors of another model version, which the workers must hand back
+      to the web process.
+    - Stop the pool and check its counters.
+
+    Raises:
+        AssertionError: If a prediction differs from `model.predict`.
+    """
+
+    bundle = model_registry.get()
+    rows = list(np.random.RandomState(0).randn(40, 1, 9))
+    expected = [bool(prediction) for prediction in bundle.model.predict(np.vstack(rows))]
+
+    pool = InferencePool(2, path=bundle.path)
+    pool.start()
+    try:
+        assert predict_concurrently(pool, [bundle] * len(rows), rows) == expected
+
+        other = dataclasses.replace(bundle, version='0' * 64)
+        assert predict_concurrently(pool, [other] * 4, rows[:4]) == expected[:4]
+    finally:
+        pool.stop()
+
+    stats = pool.stats()
+    assert stats['predictions'] == 44 and stats['processes'] == 2
+    assert 0 < stats['remote_batches'] < stats['batches']
+    assert pool.predict(bundle, rows[0]) == expected[0]
@@ -0,0 +1,112 @@
+"""
+Test script for the stage timings and the Prometheus metrics.
+"""
+
+import math
+from dataclasses import asdict
+
+from app import create_app
+from business.metrics import Histogram, StageMetrics, render_metrics, stage_metrics
+from tests.passenger_repository_test import PASSENGERS
+
+
+def test_histogram_quantiles():
+    """
+    Test the bucket counts and the interpolated quantiles of a histogram.
+
+    Raises:
+        AssertionError: If a count or an estimate is off.
+    """
+
+    histogram = Histogram(buckets=(1.0, 2.0, 4.0))
+    assert math.isnan(histogram.quantile(0.5))
+
+    for value in (0.5, 1.0, 1.5, 1.5, 3.0, 8.0):
+        histogram.observe(value)
+
+    counts, count, total = histogram.snapshot()
+    assert counts == [2, 2, 1, 1] and count == 6 and total == 15.5
+
+    assert histogram.quantile(0.5) == 1.5
+    assert histogram.quantile(0.75) == 3.0
+    assert histogram.quantile(0.99) == 4.0
+
+
+def test_stage_metrics_record_stages():
+    """
+    Test that stages are timed per endpoint, and not at all when disabled.
+
+    Raises:
+        AssertionError: If the recorded stages are wrong.
+    """
+
+    metrics = StageMetrics(enabled=True)
+    with metrics.stage('predict'):
+        pass
+    metrics.start('validation')
+    metrics.finish('validation')
+    metrics.finish('never-started')
+    metrics.observe('database', 0.002, endpoint='Passenger.add_passenger')
+
+    histograms = metrics.histograms()
+    assert list(histograms) == [('Passenger.add_passenger', 'database'),
+                                ('none', 'predict'), ('none', 'validation')]
+    assert all(histogram.count == 1 for histogram in histograms.values())
+
+    disabled = StageMetrics(enabled=False)
+    with disabled.stage('predict'):
+        pass
+    disabled.start('validation')
+    disabled.finish('validation')
+    assert disabled.histograms() == {}
+
+
+def test_render_metrics_in_prometheus_format():
+    """
+    Test the Prometheus rendering of the stage histograms.
+
+    Raises:
+        AssertionError: If an expected series is missing.
+    """
+
+    stage_metrics.clear()
+    for seconds in (0.0003, 0.0004, 0.02):
+        stage_metrics.observe('predict', seconds, endpoint='Passenger.add_passenger')
+
+    lines = render_metrics().splitlines()
+    labels = 'endpoint="Passenger.add_passenger",stage="predict"'
+
+    assert '# TYPE titanic_stage_duration_seconds histogram' in lines
+    assert f'titanic_stage_duration_seconds_bucket{{{labels},le="0.0005"}} 2' in lines
+    assert f'titanic_stage_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in lines
+    assert f'titanic_stage_duration_seconds_count{{{labels}}} 3' in lines
+    assert any(line.startswith(f'titanic_stage_duration_quantile_seconds{{{labels},'
+                               'quantile="0.99"}') for line in lines)
+    assert 'titanic_prediction_cache_misses_total' in ' '.join(lines)
+
+    stage_metrics.clear()
+
+
+def test_routes_time_argument_validation(tmp_path, monkeypatch):
+    """
+    Test that the passenger routes time the validation of their arguments.
+
+    Raises:
+        AssertionError: If a request's validation is not recorded exactly once.
+    """
+
+    monkeypatch.setattr('business.warmup.MODEL_WARMUP', False)
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'metrics.db'}"})
+    client = app.test_client()
+    stage_metrics.clear()
+    passenger = asdict(PASSENGERS[0])
+
+    client.post('/passenger', json=passenger)
+    client.post('/passenger', json={'name': 'X'})
+    client.post('/passengers/batch', json={'passengers': [passenger]})
+
+    histograms = stage_metrics.histograms()
+    assert histograms[('Passenger.add_passenger', 'validation')].count == 2
+    assert histograms[('Passenger.add_passengers', 'validation')].count == 1
+    assert histograms[('Passenger.add_passengers', 'item_validation')].count == 1
+    stage_metrics.clear()
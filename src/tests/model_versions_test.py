@@ -0,0 +1,115 @@
+"""
+Test script for the model versions, the traffic split and the shadow scorer.
+
+Checks that passengers are routed to the model versions by the configured
+split, that the shadow model's disagreements are counted and logged, and that
+the model version column is added to existing passenger tables.
+"""
+
+import logging
+
+import pytest
+from sqlalchemy import inspect, text
+
+from business.passenger_business import create_passenger
+from business.shadow_scorer import ShadowScorer
+from database.db_setup import create_missing_columns, db
+from database.models.passenger import Passenger
+from ml.registry import ModelRegistry
+from ml.versions import ModelVersions, model_versions, parse_pairs
+from schemas.passenger_dataclass import PassengerData
+from tests.passenger_repository_test import PASSENGERS
+
+BUNDLE_PATH = './src/ml/titanic_model_bundle.pkl'
+
+
+def test_traffic_split_routes_passengers():
+    """
+    Test that the traffic split routes the expected share of passengers.
+
+    Raises:
+        AssertionError: If the share routed to the candidate is off, if a
+        passenger is routed differently twice, or if an invalid split is accepted.
+    """
+
+    registry = ModelRegistry(BUNDLE_PATH)
+    versions = ModelVersions('v1', {'v1': registry, 'v2': registry},
+                             {'v2': 20}, shadow='v2')
+    passengers = [PassengerData(name=f'Passenger {number}', ticket_class=3, sex='male',
+                                number_siblings_spouses=0, number_parents_children=0,
+                                ticket=str(number), fare=7.25)
+                  for number in range(5000)]
+
+    routed = [versions.route(passenger) for passenger in passengers]
+
+    assert 0.17 < routed.count('v2') / len(routed) < 0.23
+    assert [versions.route(passenger) for passenger in passengers[:100]] == routed[:100]
+    assert versions.stats()['v2']['routed'] == routed.count('v2') + routed[:100].count('v2')
+    assert versions.stats()['v1']['traffic_percentage'] == 80
+
+    assert parse_pairs(' v2=/models/v2, v3=/models/v3,') == {'v2': '/models/v2',
+                                                              'v3': '/models/v3'}
+    with pytest.raises(ValueError):
+        parse_pairs('v2')
+    with pytest.raises(ValueError):
+        ModelVersions('v1', {'v1': registry}, {'v3': 10})
+    with pytest.raises(ValueError):
+        ModelVersions('v1', {'v1': registry, 'v2': registry}, {'v2': 120})
+
+
+def test_shadow_scorer_logs_disagreements(monkeypatch, caplog):
+    """
+    Test that the shadow scorer compares its predictions with the primary ones.
+
+    Steps:
+    - Submit a passenger with the shadow model's own prediction and one with
+      the opposite prediction.
+    - Submit a passenger scored by the shadow version itself, which is skipped.
+
+    Raises:
+        AssertionError: If the counters or the logged disagreement are wrong.
+    """
+
+    registry = ModelRegistry(BUNDLE_PATH)
+    versions = ModelVersions('v1', {'v1': registry, 'v2': registry}, shadow='v2')
+    monkeypatch.setattr('business.shadow_scorer.get_model_versions', lambda: versions)
+    passenger = PASSENGERS[0]
+    bundle = registry.get()
+    survived = bool(bundle.model.predict(bundle.feature_builder.build(passenger))[0])
+
+    scorer = ShadowScorer('v2', workers=1)
+    scorer.start()
+    with caplog.at_level(logging.INFO, logger='business.shadow_scorer'):
+        scorer.submit(passenger, 'v1', survived)
+        scorer.submit(passenger, 'v1', not survived)
+        scorer.submit(passenger, 'v2', survived)
+        scorer.stop()
+
+    stats = scorer.stats()
+    assert (stats['scored'], stats['disagreements'], stats['dropped']) == (2, 1, 0)
+    assert [record.getMessage() for record in caplog.records] == [
+        f'Shadow model v2 predicted survived={survived} for passenger '
+        f"{passenger.name!r} (ticket {passenger.ticket}), model v1 predicted "
+        f'survived={not survived}.']
+
+
+def test_model_version_column_is_added(db_app):
+    """
+    Test that the model version column is added to an existing passenger table
+    and recorded on new passengers.
+
+    Raises:
+        AssertionError: If the column is missing or the version is not recorded.
+    """
+
+    with db.engine.begin() as connection:
+        connection.execute(text('DROP INDEX ix_passenger_model_version'))
+        connection.execute(text('ALTER TABLE passenger DROP COLUMN model_version'))
+    assert 'model_version' not in {column['name']
+                                   for column in inspect(db.engine).get_columns('passenger')}
+
+    create_missing_columns(db.engine)
+
+    created = create_passenger(PASSENGERS[0])
+    stored = db.session.get(Passenger, created['id'])
+    assert created['model_version'] == stored.model_version == model_versions.primary
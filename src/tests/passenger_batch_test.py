@@ -0,0 +1,82 @@
+"""
+Test script for the passenger batch endpoint.
+
+Checks that POST /passengers/batch registers the valid passengers and reports
+the invalid ones by position, and that batches without valid passengers or
+above the maximum size are rejected.
+"""
+
+from dataclasses import asdict
+
+import pytest
+
+from app import create_app
+from database.db_setup import db
+from database.models import Passenger
+from tests.passenger_repository_test import PASSENGERS
+
+
+@pytest.fixture(name='app')
+def fixture_app(tmp_path, monkeypatch):
+    """
+    Application bound to an empty database file.
+    """
+
+    monkeypatch.setattr('business.warmup.MODEL_WARMUP', False)
+    return create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'batch.db'}"})
+
+
+def test_batch_with_invalid_items(app):
+    """
+    Test that a batch with valid and invalid passengers registers the valid ones.
+
+    Raises:
+        AssertionError: If a valid passenger is not registered or an invalid one
+        is not reported at its position.
+    """
+
+    passengers = [asdict(passenger) for passenger in PASSENGERS]
+    items = [passengers[0], {**passengers[1], 'sex': 'other'}, 'passenger', None,
+             passengers[2]]
+
+    response = app.test_client().post('/passengers/batch', json={'passengers': items})
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert [passenger['name'] for passenger in body['passengers']] == \
+        [PASSENGERS[0].name, PASSENGERS[2].name]
+    assert all(passenger['id'] for passenger in body['passengers'])
+    assert sorted(body['errors']) == ['1', '2', '3']
+    assert 'sex' in body['errors']['1']
+    assert body['errors']['2'] == {'_schema': ['Invalid input type.']}
+
+    with app.app_context():
+        assert db.session.query(Passenger).count() == 2
+
+
+def test_rejected_batches(app, monkeypatch):
+    """
+    Test that batches without valid passengers or too large are rejected.
+
+    Raises:
+        AssertionError: If such a batch is accepted or a passenger is registered.
+    """
+
+    client = app.test_client()
+
+    response = client.post('/passengers/batch',
+                           json={'passengers': [{'name': 'X'}, 42]})
+    assert response.status_code == 422
+    errors = response.get_json()['errors']['json']['passengers']
+    assert sorted(errors) == ['0', '1'] and 'ticket_class' in errors['0']
+
+    monkeypatch.setattr('routes.passenger_routes.PASSENGER_BATCH_MAX_SIZE', 2)
+    response = client.post('/passengers/batch',
+                           json={'passengers': [asdict(passenger) for passenger in PASSENGERS]})
+    assert response.status_code == 422
+    assert 'at most 2' in response.get_json()['errors']['json']['passengers'][0]
+
+    assert client.post('/passengers/batch', json={'passengers': 'all'}).status_code == 422
+
+    with app.app_context():
+        assert db.session.query(Passenger).count() == 0
@@ -0,0 +1,75 @@
+"""
+Test script for the passenger export endpoint.
+
+Checks the NDJSON and CSV output of GET /passengers/export, the fields
+projection, the filters, and the rejection of an empty projection.
+"""
+
+import csv
+import io
+import json
+
+import pytest
+
+from app import create_app
+from business.passenger_business import create_passengers
+from tests.passenger_repository_test import PASSENGERS
+
+
+@pytest.fixture(name='client')
+def fixture_client(tmp_path, monkeypatch):
+    """
+    Test client of an application holding the passengers of PASSENGERS.
+    """
+
+    monkeypatch.setattr('business.warmup.MODEL_WARMUP', False)
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'export.db'}"})
+    with app.app_context():
+        create_passengers(PASSENGERS)
+    return app.test_client()
+
+
+def test_export_formats(client):
+    """
+    Test that the export streams every passenger as NDJSON and as CSV.
+
+    Raises:
+        AssertionError: If a format is wrong or a passenger is missing.
+    """
+
+    response = client.get('/passengers/export?format=ndjson')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert 'passengers.ndjson' in response.headers['Content-Disposition']
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row['name'] for row in rows] == [passenger.name for passenger in PASSENGERS]
+    assert rows[0]['embarked'] == 'Cherbourg' and rows[1]['cabin'] is None
+
+    response = client.get('/passengers/export?format=csv')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row['name'] for row in rows] == [passenger.name for passenger in PASSENGERS]
+    assert rows[0]['ticket'] == 'PC 17599'
+
+
+def test_export_projection_and_filters(client):
+    """
+    Test the fields projection and the filters of the export.
+
+    Raises:
+        AssertionError: If other fields or passengers are exported, or if an
+        empty or unknown projection is accepted.
+    """
+
+    response = client.get('/passengers/export?format=csv&fields=name,fare&sex=female')
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines == ['name,fare', f'"{PASSENGERS[0].name}",71.2833',
+                     f'"{PASSENGERS[2].name}",263.0']
+
+    response = client.get('/passengers/export?format=ndjson&fields=ticket&ticket_class=3')
+    assert response.get_data(as_text=True) == '{"ticket": "A/5 21171"}\n'
+
+    for path in ('/passengers/export?format=csv&fields=', '/passengers?fields=',
+                 '/passengers/export?format=csv&fields=password'):
+        assert client.get(path).status_code == 422
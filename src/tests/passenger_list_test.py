@@ -0,0 +1,123 @@
+"""
+Test script for the passenger list endpoint.
+
+Checks that GET /passengers pages are walked through the `Link` and
+`X-Next-Cursor` headers, that the query filters and the fields projection are
+kept across pages, and that the page size is clamped to its maximum.
+"""
+
+import re
+
+import pytest
+
+from app import create_app
+from business.passenger_business import create_passengers
+from tests.passenger_repository_test import PASSENGERS
+
+NEXT_LINK = re.compile(r'^<(?P<url>[^>]+)>; rel="next"$')
+
+
+@pytest.fixture(name='client')
+def fixture_client(tmp_path, monkeypatch):
+    """
+    Test client of an application holding the passengers of PASSENGERS twice.
+    """
+
+    monkeypatch.setattr('business.warmup.MODEL_WARMUP', False)
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'list.db'}"})
+    with app.app_context():
+        create_passengers(PASSENGERS + PASSENGERS)
+    return app.test_client()
+
+
+def test_pages_follow_the_link_header(client):
+    """
+    Test that following `Link` walks every filtered passenger exactly once.
+
+    Raises:
+        AssertionError: If a page is missing the next headers, the last page has
+        them, a passenger is repeated or skipped, or the filter or projection is
+        lost on the next pages.
+    """
+
+    url = '/passengers?sex=female&fields=name&limit=1'
+    names, cursors = [], []
+    while True:
+        response = client.get(url)
+        assert response.status_code == 200
+        page = response.get_json()
+        assert len(page) <= 1
+        assert all(list(passenger) == ['name'] for passenger in page)
+        names.extend(passenger['name'] for passenger in page)
+
+        link = response.headers.get('Link')
+        if link is None:
+            assert 'X-Next-Cursor' not in response.headers
+            break
+        url = NEXT_LINK.match(link)['url']
+        assert 'sex=female' in url and 'fields=name' in url
+        cursor = response.headers['X-Next-Cursor']
+        assert f'cursor={cursor}' in url
+        cursors.append(int(cursor))
+
+    female = [passenger.name for passenger in PASSENGERS if passenger.sex == 'female']
+    assert names == female + female
+    assert cursors == sorted(cursors) and len(set(cursors)) == len(cursors)
+
+
+def test_last_page_has_no_next_headers(client):
+    """
+    Test that a page holding the remaining passengers has no next headers.
+
+    Raises:
+        AssertionError: If the page is incomplete or announces a next page.
+    """
+
+    response = client.get(f'/passengers?limit={2 * len(PASSENGERS)}')
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 2 * len(PASSENGERS)
+    assert 'Link' not in response.headers
+    assert 'X-Next-Cursor' not in response.headers
+
+
+def test_filters_and_projection(client):
+    """
+    Test that the query filters apply and that `id` is only kept when requested.
+
+    Raises:
+        AssertionError: If a filtered out passenger is returned or the
+        projection is not applied.
+    """
+
+    response = client.get('/passengers?ticket_class=3&fields=id,name')
+    page = response.get_json()
+    assert [passenger['name'] for passenger in page] == [PASSENGERS[1].name] * 2
+    assert all(sorted(passenger) == ['id', 'name'] for passenger in page)
+
+    response = client.get('/passengers?sex=male&ticket_class=1')
+    assert response.status_code == 200 and response.get_json() == []
+
+    response = client.get('/passengers?fields=ticket_class')
+    assert response.get_json() == [{'ticket_class': passenger.ticket_class}
+                                   for passenger in PASSENGERS + PASSENGERS]
+
+
+def test_limit_clamped_to_maximum(client, monkeypatch):
+    """
+    Test that a limit above PASSENGER_PAGE_MAX_SIZE is clamped to it.
+
+    Raises:
+        AssertionError: If the page holds more passengers than the maximum or
+        does not link to the next page.
+    """
+
+    monkeypatch.setattr('routes.passenger_routes.PASSENGER_PAGE_MAX_SIZE', 2)
+
+    response = client.get('/passengers?limit=1000')
+
+    assert response.status_code == 200
+    page = response.get_json()
+    assert len(page) == 2
+    assert response.headers['X-Next-Cursor'] == str(page[-1]['id'])
+    assert 'limit=1000' in NEXT_LINK.match(response.headers['Link'])['url']
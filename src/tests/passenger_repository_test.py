@@ -0,0 +1,85 @@
+"""
+Test script for the passenger repository and bulk writes.
+
+Runs against every available database backend (see `conftest.py`).
+"""
+
+from business.passenger_business import create_passengers
+from repositories.passenger_repository import (
+    get_passengers_page,
+    insert_passengers,
+    stream_passengers,
+)
+from schemas.passenger_dataclass import PassengerData
+
+
+PASSENGERS = [
+    PassengerData(name='Cumings, Mrs. John Bradley (Florence Briggs Thayer)',
+                  ticket_class=1, sex='female', number_siblings_spouses=1,
+                  number_parents_children=0, ticket='PC 17599', fare=71.2833,
+                  age=38.0, cabin='C85', embarked='Cherbourg'),
+    PassengerData(name='Braund, Mr. Owen Harris', ticket_class=3, sex='male',
+                  number_siblings_spouses=1, number_parents_children=0,
+                  ticket='A/5 21171', fare=7.25, age=22.0),
+    PassengerData(name='Fortune, Miss. Mabel Helen', ticket_class=1, sex='female',
+                  number_siblings_spouses=3, number_parents_children=2, ticket='19950',
+                  fare=263.0, cabin='C23 C25 C27', embarked='Southampton'),
+]
+
+
+def test_create_passengers_bulk_insert(db_app):
+    """
+    Test the bulk creation of passengers and reading them back.
+
+    Steps:
+    - Create a batch of passengers (bulk INSERT, or COPY on PostgreSQL).
+    - Walk the list page by page with the keyset cursor.
+    - Filter the list and stream it.
+
+    Raises:
+        AssertionError: If the stored passengers differ from the created ones.
+    """
+
+    created = create_passengers(PASSENGERS * 4)
+    ids = [passenger['id'] for passenger in created]
+
+    assert len(set(ids)) == 12
+    assert ids == sorted(ids)
+
+    walked, cursor = [], None
+    while True:
+        page = get_passengers_page(cursor, 5, ['id', 'name', 'cabin'], {})
+        walked.extend(page)
+        if len(page) < 5:
+            break
+        cursor = page[-1]['id']
+
+    assert [passenger['id'] for passenger in walked] == ids
+    assert walked[2]['cabin'] == 'C23 C25 C27'
+
+    women = get_passengers_page(None, 100, ['id'], {'sex': 'female'})
+    assert len(women) == 8
+
+    streamed = list(stream_passengers(['id', 'survived'], {}, chunk_size=5))
+    assert [row.id for row in streamed] == ids
+    assert [row.survived for row in streamed] == [p['survived'] for p in created]
+
+
+def test_insert_passengers_without_ids(db_app):
+    """
+    Test the bulk insert used by the write-behind writer.
+
+    Raises:
+        AssertionError: If the rows are not stored.
+    """
+
+    rows = [{'name': 'Braund, Mr. Owen Harris', 'ticket_class': 3, 'sex': 'male',
+             'age': None, 'number_siblings_spouses': 1, 'number_parents_children': 0,
+             'ticket': 'A/5 21171', 'fare': 7.25, 'cabin': None, 'embarked': None,
+             'survived': False}] * 3
+
+    assert insert_passengers(rows, returning_ids=False) == []
+
+    stored = get_passengers_page(None, 10, ['age', 'cabin', 'survived'], {})
+    assert len(stored) == 3
+    assert stored[0]['age'] is None and stored[0]['survived'] is False
@@ -0,0 +1,109 @@
+"""
+Test script for the passenger statistics counters.
+
+Runs against every available database backend (see `conftest.py`).
+"""
+
+from collections import Counter
+
+from business.passenger_business import create_passenger, create_passengers, passenger_row
+from business.passenger_stats import get_passengers_stats, rebuild_passengers_stats
+from business.passenger_writer import PassengerWriter
+from database.db_setup import db
+from database.models.passenger import Passenger
+from schemas.passenger_dataclass import PassengerData
+from tests.passenger_repository_test import PASSENGERS
+
+
+def scanned_stats():
+    """
+    Count the passengers and survivors per group by scanning the passenger table.
+    """
+
+    totals, survivors = Counter(), Counter()
+    for passenger in db.session.query(Passenger):
+        key = (passenger.ticket_class, passenger.sex, passenger.embarked)
+        totals[key] += 1
+        survivors[key] += passenger.survived
+    return {key: (totals[key], survivors[key]) for key in totals}
+
+
+def counted_stats():
+    """
+    Read the same counts from the statistics counters.
+    """
+
+    stats = get_passengers_stats(['ticket_class', 'sex', 'embarked'], {})
+    return {(group['ticket_class'], group['sex'], group['embarked']):
+            (group['total'], group['survived']) for group in stats['groups']}
+
+
+def test_stats_follow_inserts(db_app):
+    """
+    Test that every insert path keeps the counters equal to a full scan.
+
+    Steps:
+    - Create passengers one by one, in a batch and through the write-behind writer.
+    - Compare the counters with a scan after each step.
+    - Check the filters, the grouping and the rebuild.
+
+    Raises:
+        AssertionError: If the counters differ from the scanned values.
+    """
+
+    for passenger in PASSENGERS:
+        create_passenger(passenger)
+    assert counted_stats() == scanned_stats()
+
+    create_passengers(PASSENGERS * 3)
+    assert counted_stats() == scanned_stats()
+
+    writer = PassengerWriter(db_app, batch_size=2, flush_interval=0.01)
+    writer.start()
+    for passenger in PASSENGERS:
+        writer.submit(passenger_row(passenger, True))
+    writer.stop()
+    assert counted_stats() == scanned_stats()
+
+    overall = get_passengers_stats([], {})
+    assert overall['total'] == 15 and overall['groups'] == []
+    assert overall['survival_rate'] == overall['survived'] / 15
+
+    by_sex = get_passengers_stats(['sex'], {'ticket_class': 1})
+    assert [(group['sex'], group['total']) for group in by_sex['groups']] == [('female', 10)]
+
+    no_port = get_passengers_stats(['embarked'], {'sex': 'male'})
+    assert no_port['groups'][0]['embarked'] is None
+
+    expected = counted_stats()
+    db.session.execute(db.delete(Passenger).where(Passenger.sex == 'male'))
+    rebuild_passengers_stats()
+    assert counted_stats() == {key: value for key, value in expected.items()
+                               if key[1] == 'female'}
+
+
+def test_stats_of_empty_table(db_app):
+    """
+    Test the statistics before any passenger is registered.
+
+    Raises:
+        AssertionError: If the empty statistics are not zeroed.
+    """
+
+    assert get_passengers_stats(['sex'], {}) == {
+        'total': 0, 'survived': 0, 'survival_rate': 0.0, 'groups': []}
+
+
+def test_unknown_port_is_counted(db_app):
+    """
+    Test that passengers without a boarding port are counted in their own group.
+
+    Raises:
+        AssertionError: If the passenger is not counted.
+    """
+
+    create_passenger(PassengerData(name='Icard, Miss. Amelie', ticket_class=1, sex='female',
+                                   number_siblings_spouses=0, number_parents_children=0,
+                                   ticket='113572', fare=80.0, age=38.0, cabin='B28'))
+
+    assert counted_stats() == scanned_stats()
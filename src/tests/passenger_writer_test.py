@@ -0,0 +1,247 @@
+"""
+Test script for the write-behind passenger writer.
+
+Checks that queued passengers are written in batches when the batch is full or
+when the flush interval elapses, that the queued passengers are written on
+stop, that failed batches are retried and then written row by row with the
+failing rows kept in the dead-letter file, and that a full or stopped writer
+pushes back on the callers (503 on POST /passenger).
+"""
+
+import json
+import threading
+import time
+from dataclasses import asdict
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from business import passenger_business, passenger_writer
+from business.passenger_business import passenger_row
+from business.passenger_writer import PassengerWriter, WriteQueueFullError, get_passenger_writer
+from database.db_setup import db
+from database.models import Passenger
+from tests.passenger_repository_test import PASSENGERS
+
+ROWS = [passenger_row(passenger, survived=True) for passenger in PASSENGERS]
+
+
+def wait_for_writes(writer: PassengerWriter, count: int, timeout: float = 5.0):
+    """
+    Wait until `count` rows were written, or `timeout` seconds elapsed.
+    """
+
+    deadline = time.monotonic() + timeout
+    while writer.stats()['written'] < count and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def test_batch_flushed_by_size(db_app):
+    """
+    Test that a full batch is written without waiting for the flush interval.
+
+    Raises:
+        AssertionError: If the batch waited for the interval or was split.
+    """
+
+    writer = PassengerWriter(db_app, batch_size=len(ROWS), flush_interval=1.0)
+    writer.start()
+    try:
+        started = time.monotonic()
+        for row in ROWS:
+            writer.submit(dict(row))
+        wait_for_writes(writer, len(ROWS))
+        elapsed = time.monotonic() - started
+    finally:
+        writer.stop()
+
+    assert elapsed < 0.5
+    assert writer.stats() == {'queued': 0, 'written': len(ROWS), 'failed': 0, 'duplicates': 0,
+                              'batches': 1}
+    assert db.session.query(Passenger).count() == len(ROWS)
+
+
+def test_batch_flushed_by_interval(db_app):
+    """
+    Test that a partial batch is written once the flush interval elapses.
+
+    Raises:
+        AssertionError: If the rows are not written while the writer runs.
+    """
+
+    writer = PassengerWriter(db_app, batch_size=100, flush_interval=0.02)
+    writer.start()
+    try:
+        for row in ROWS[:2]:
+            writer.submit(dict(row))
+        wait_for_writes(writer, 2)
+        stats = writer.stats()
+    finally:
+        writer.stop()
+
+    assert stats['written'] == 2 and stats['batches'] == 1
+    assert db.session.query(Passenger).count() == 2
+
+
+def test_stop_drains_the_queue(db_app):
+    """
+    Test that stopping the writer writes the queued rows and refuses new ones.
+
+    Raises:
+        AssertionError: If a queued row is lost or a row is accepted after stop.
+    """
+
+    writer = PassengerWriter(db_app, batch_size=2, flush_interval=0.05)
+    for row in ROWS:
+        writer.submit(dict(row))
+    writer.start()
+    writer.stop()
+
+    assert writer.stats()['written'] == len(ROWS)
+    assert db.session.query(Passenger).count() == len(ROWS)
+
+    with pytest.raises(WriteQueueFullError):
+        writer.submit(dict(ROWS[0]))
+
+
+def test_transient_errors_retried(db_app, monkeypatch):
+    """
+    Test that a batch failing with a transient database error is retried whole.
+
+    Raises:
+        AssertionError: If the batch is not retried or a row is lost.
+    """
+
+    insert_passengers = passenger_writer.insert_passengers
+    calls = []
+
+    def flaky_insert(rows, returning_ids=True):
+        calls.append(len(rows))
+        if len(calls) < 3:
+            raise OperationalError('INSERT', {}, Exception('database is locked'))
+        return insert_passengers(rows, returning_ids)
+
+    monkeypatch.setattr(passenger_writer, 'insert_passengers', flaky_insert)
+    writer = PassengerWriter(db_app, retries=2, retry_backoff=0.001)
+    for row in ROWS:
+        writer.submit(dict(row))
+    writer.stop()
+
+    assert calls == [len(ROWS)] * 3
+    assert writer.stats() == {'queued': 0, 'written': len(ROWS), 'failed': 0, 'duplicates': 0,
+                              'batches': 1}
+    assert db.session.query(Passenger).count() == len(ROWS)
+
+
+def test_bad_row_kept_in_dead_letter_file(db_app, tmp_path):
+    """
+    Test that a row failing the batch does not drop the other rows of the batch
+    and is kept in the dead-letter file.
+
+    Raises:
+        AssertionError: If a valid row is not written or the bad row is lost.
+    """
+
+    dead_letter_path = tmp_path / 'dead_letter.jsonl'
+    writer = PassengerWriter(db_app, dead_letter_path=str(dead_letter_path))
+    bad_row = {**ROWS[1], 'name': None}
+    for row in (ROWS[0], bad_row, ROWS[2]):
+        writer.submit(dict(row))
+    writer.stop()
+
+    assert writer.stats() == {'queued': 0, 'written': 2, 'failed': 1, 'duplicates': 0,
+                              'batches': 1}
+    assert [name for name, in db.session.query(Passenger.name).order_by(Passenger.id)] == \
+        [ROWS[0]['name'], ROWS[2]['name']]
+    lines = dead_letter_path.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 1
+    entry = json.loads(lines[0])
+    assert entry['passenger'] == bad_row and entry['idempotency_key'] is None
+    assert 'null' in entry['error'].lower()
+
+
+def test_stop_releases_blocked_submitters(db_app):
+    """
+    Test that a caller waiting for room in the queue is refused once the writer
+    stops, instead of queueing a row that would never be written.
+
+    Raises:
+        AssertionError: If the waiting row is queued after stop, the caller keeps
+        waiting for the whole put timeout, or the accepted row is lost.
+    """
+
+    writer = PassengerWriter(db_app, max_queue_size=1, put_timeout=5.0)
+    writer.submit(dict(ROWS[0]))
+    errors = []
+
+    def submit():
+        try:
+            writer.submit(dict(ROWS[1]))
+        except WriteQueueFullError as error:
+            errors.append(error)
+
+    submitter = threading.Thread(target=submit)
+    submitter.start()
+    time.sleep(0.05)
+    writer.stop()
+    submitter.join(1.0)
+
+    assert not submitter.is_alive()
+    assert len(errors) == 1 and 'stopping' in str(errors[0])
+    assert writer.stats() == {'queued': 0, 'written': 1, 'failed': 0, 'duplicates': 0,
+                              'batches': 1}
+    assert db.session.query(Passenger).count() == 1
+
+
+def test_full_queue_returns_503(tmp_path, monkeypatch):
+    """
+    Test that POST /passenger answers 503 while the write queue is full.
+
+    Raises:
+        AssertionError: If the request is accepted or the passenger written.
+    """
+
+    monkeypatch.setattr('business.warmup.MODEL_WARMUP', False)
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'writer.db'}"})
+    writer = PassengerWriter(app, max_queue_size=1, put_timeout=0.01)
+    writer.submit(dict(ROWS[0]))
+    monkeypatch.setattr(passenger_business, 'get_passenger_writer', lambda: writer)
+
+    response = app.test_client().post('/passenger', json=asdict(PASSENGERS[1]))
+
+    assert response.status_code == 503
+    assert 'queue is full' in response.get_json()['message']
+    with app.app_context():
+        assert db.session.query(Passenger).count() == 0
+
+
+def test_writer_per_application(tmp_path, monkeypatch):
+    """
+    Test that every application gets its own writer, bound to its database.
+
+    Raises:
+        AssertionError: If a writer is shared or writes to another database.
+    """
+
+    monkeypatch.setattr('business.warmup.MODEL_WARMUP', False)
+    monkeypatch.setattr('business.passenger_writer.PASSENGER_WRITE_BEHIND', True)
+    apps = [create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / f'{name}.db'}"})
+            for name in ('first', 'second')]
+    writers = [get_passenger_writer(app) for app in apps]
+    try:
+        assert writers[0] is not writers[1]
+        assert [writer.app for writer in writers] == apps
+        assert get_passenger_writer() is None
+
+        response = apps[1].test_client().post('/passenger', json=asdict(PASSENGERS[0]))
+        assert response.status_code == 201 and response.get_json()['id'] is None
+    finally:
+        for writer in writers:
+            writer.stop()
+
+    counts = []
+    for app in apps:
+        with app.app_context():
+            counts.append(db.session.query(Passenger).count())
+    assert counts == [0, 1]
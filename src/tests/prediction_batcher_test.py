@@ -0,0 +1,143 @@
+"""
+Test script for the micro-batching prediction scheduler.
+"""
+
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+
+from business.prediction_batcher import PredictionBatcher
+from ml.registry import model_registry
+
+
+class RecordingModel:
+    """
+    Model predicting whether the first feature is positive, recording batch sizes.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, X):
+        self.calls.append(len(X))
+        return X[:, 0] > 0
+
+
+def predict_concurrently(batcher, bundles, rows):
+    """
+    Call `batcher.predict` from one thread per row and collect the results.
+    """
+
+    results = [None] * len(rows)
+    start = threading.Barrier(len(rows))
+
+    def call(position):
+        start.wait()
+        results[position] = batcher.predict(bundles[position], rows[position])
+
+    threads = [threading.Thread(target=call, args=(position,)) for position in range(len(rows))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_batcher_groups_concurrent_predictions():
+    """
+    Test that concurrent predictions are scored in batches.
+
+    Steps:
+    - Predict 40 rows from 40 threads with two model versions.
+    - Check that every caller gets its own result.
+    - Check that each model scored only its own rows, in batches.
+
+    Raises:
+        AssertionError: If a result is wrong or batches are not formed.
+    """
+
+    models = [RecordingModel(), RecordingModel()]
+    bundles = [SimpleNamespace(model=model, version=str(position))
+               for position, model in enumerate(models)]
+
+    rows = [np.array([[position % 3 - 1.0, 0.0]]) for position in range(40)]
+    row_bundles = [bundles[position % 2] for position in range(40)]
+
+    batcher = PredictionBatcher(max_wait=0.05, max_batch_size=16)
+    batcher.start()
+    try:
+        results = predict_concurrently(batcher, row_bundles, rows)
+    finally:
+        batcher.stop()
+
+    assert results == [bool(row[0, 0] > 0) for row in rows]
+    assert sum(models[0].calls) == sum(models[1].calls) == 20
+    assert max(models[0].calls + models[1].calls) <= 16
+    assert len(models[0].calls) + len(models[1].calls) < 40
+
+    stats = batcher.stats()
+    assert stats['predictions'] == 40
+    assert sum(size * count for size, count in stats['batch_sizes'].items()) == 40
+    assert stats['queue_depth'] == 0 and stats['max_queue_depth'] >= 1
+
+
+def test_batched_predictions_match_model():
+    """
+    Test that batched predictions of the trained model match one-row predictions.
+
+    Raises:
+        AssertionError: If a batched prediction differs.
+    """
+
+    bundle = model_registry.get()
+    rows = [np.random.default_rng(seed).normal(size=(1, 9)) for seed in range(32)]
+
+    batcher = PredictionBatcher(max_wait=0.05, max_batch_size=8)
+    batcher.start()
+    try:
+        results = predict_concurrently(batcher, [bundle] * len(rows), rows)
+    finally:
+        batcher.stop()
+
+    assert results == [bool(bundle.model.predict(row)[0]) for row in rows]
+
+    assert batcher.predict(bundle, rows[0]) == results[0]
+
+
+def test_stop_while_predicting():
+    """
+    Test that stopping the batcher does not strand concurrent callers.
+
+    Steps:
+    - Predict in a loop from 8 threads and stop the batcher meanwhile.
+    - Check that every thread returns with correct results.
+
+    Raises:
+        AssertionError: If a caller blocks or gets a wrong result.
+    """
+
+    model = RecordingModel()
+    bundle = SimpleNamespace(model=model, version='0')
+    batcher = PredictionBatcher(max_wait=0.001, max_batch_size=4, timeout=5)
+    batcher.start()
+
+    results = []
+    started = threading.Barrier(9)
+
+    def call(position):
+        row = np.array([[position % 2 - 0.5]])
+        started.wait()
+        for _ in range(200):
+            results.append(batcher.predict(bundle, row) == (position % 2 == 1))
+
+    threads = [threading.Thread(target=call, args=(position,)) for position in range(8)]
+    for thread in threads:
+        thread.start()
+    started.wait()
+    batcher.stop()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert len(results) == 8 * 200 and all(results)
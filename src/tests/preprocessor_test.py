@@ -0,0 +1,125 @@
+"""
+Test script for the Titanic preprocessor.
+
+Checks that the vectorized preprocessing steps give the same results as the
+original row-wise implementation, and that the single-row feature vector
+builder matches the pandas preprocessing path.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ml.feature_vector import FeatureVectorBuilder
+from ml.pipeline import Pipeline
+from ml.preprocessor import PreProcessor
+from schemas.passenger_dataclass import PassengerData
+
+
+dataset = pd.read_csv('./src/data/train.csv')
+bundle = Pipeline().load_pipeline('./src/ml/titanic_model_bundle.pkl')
+
+
+def reference_impute_age(df, pp):
+    """
+    Row-wise age imputation, as originally implemented in the preprocessor.
+    """
+
+    def fill_age(row):
+        val = pp['age_medians'].get(
+            (row['Sex'], row['Pclass'], row['Title'],
+             row['SibSp'], row['Parch']),
+            np.nan
+        )
+        if pd.isnull(val):
+            val = pp['age_medians_overall'].get(
+                (row['Sex'], row['Pclass']), np.nan)
+        return row['Age'] if not pd.isnull(row['Age']) else val
+
+    return df.apply(fill_age, axis=1)
+
+
+def test_impute_age_matches_row_wise_implementation():
+    """
+    Test the vectorized age imputation against the row-wise one.
+
+    Steps:
+    - Extract titles from the training dataset.
+    - Add rows whose keys only exist in the overall medians table, whose title
+      cannot be extracted and whose keys match no table at all.
+    - Compare both implementations, treating missing values as equal.
+
+    Raises:
+        AssertionError: If any imputed age differs.
+    """
+
+    pp = bundle['preprocessor']
+
+    df = dataset.copy()
+    extra = pd.DataFrame([
+        {'Name': 'Doe, Mr. John', 'Pclass': 3, 'Sex': 'male',
+         'Age': np.nan, 'SibSp': 8, 'Parch': 6},
+        {'Name': 'No title', 'Pclass': 2, 'Sex': 'female',
+         'Age': np.nan, 'SibSp': 0, 'Parch': 0},
+        {'Name': 'Doe, Miss. Jane', 'Pclass': 4, 'Sex': 'female',
+         'Age': np.nan, 'SibSp': 0, 'Parch': 0},
+        {'Name': 'Doe, Miss. Jane', 'Pclass': 1, 'Sex': 'female',
+         'Age': 7.0, 'SibSp': 0, 'Parch': 0},
+    ])
+    df = pd.concat([df, extra], ignore_index=True)
+    df['Title'] = df['Name'].str.extract(r' ([A-Za-z]+)\.', expand=False)
+
+    expected = reference_impute_age(df, pp).to_numpy(dtype=float)
+    actual = PreProcessor().impute_age(df, pp).to_numpy(dtype=float)
+
+    np.testing.assert_array_equal(actual, expected)
+
+
+def row_to_passenger(row) -> PassengerData:
+    """
+    Convert a row of the training dataset to a PassengerData instance.
+    """
+
+    def value(column):
+        return None if pd.isnull(row[column]) else row[column]
+
+    return PassengerData(name=row['Name'],
+                         ticket_class=int(row['Pclass']),
+                         sex=row['Sex'],
+                         number_siblings_spouses=int(row['SibSp']),
+                         number_parents_children=int(row['Parch']),
+                         ticket=row['Ticket'],
+                         fare=float(row['Fare']),
+                         age=value('Age'),
+                         cabin=value('Cabin'),
+                         embarked=value('Embarked'))
+
+
+def test_feature_vector_builder_matches_pandas_path():
+    """
+    Test the single-row feature builder against the pandas preprocessing path.
+
+    Steps:
+    - Preprocess the whole training dataset with `preprocess_new_data`.
+    - Build every row with `FeatureVectorBuilder` and with the one-row pandas path.
+    - Assert all three are bit-for-bit identical.
+
+    Raises:
+        AssertionError: If any feature value differs.
+    """
+
+    pp = bundle['preprocessor']
+    preprocessor = PreProcessor()
+    builder = FeatureVectorBuilder(pp)
+
+    expected = preprocessor.preprocess_new_data(dataset, pp)
+
+    passengers = [row_to_passenger(row) for _, row in dataset.iterrows()]
+    actual = np.vstack([builder.build(passenger) for passenger in passengers])
+    one_row = np.vstack([
+        preprocessor.preprocess_new_data(
+            preprocessor.dataclass_to_dataframe(passenger), pp)
+        for passenger in passengers[:100]
+    ])
+
+    assert actual.tobytes() == expected.tobytes()
+    assert one_row.tobytes() == expected[:100].tobytes()
@@ -0,0 +1,72 @@
+"""
+Test script for the model registry.
+
+Checks that the bundle is loaded once and shared across calls, and that a
+replaced bundle file is picked up without restarting the process.
+"""
+
+import os
+import shutil
+
+from ml.registry import ModelRegistry
+
+
+BUNDLE_PATH = './src/ml/titanic_model_bundle.pkl'
+
+
+def test_registry_loads_bundle_once(tmp_path):
+    """
+    Test that repeated lookups are served from memory.
+
+    Raises:
+        AssertionError: If the bundle is loaded more than once.
+    """
+
+    path = tmp_path / 'bundle.pkl'
+    shutil.copy(BUNDLE_PATH, path)
+    registry = ModelRegistry(str(path), check_interval=0)
+
+    first = registry.get()
+    second = registry.get()
+    stats = registry.stats()
+
+    assert first is second
+    assert stats['loads'] == 1
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+    assert stats['version'] == first.version
+
+
+def test_registry_reloads_replaced_bundle(tmp_path):
+    """
+    Test that a bundle replaced on disk is reloaded.
+
+    Steps:
+    - Load the bundle from a temporary copy.
+    - Touch the file without changing it and check it is not reloaded.
+    - Atomically replace it with different content and check it is reloaded.
+
+    Raises:
+        AssertionError: If the registry does not follow the file on disk.
+    """
+
+    path = tmp_path / 'bundle.pkl'
+    shutil.copy(BUNDLE_PATH, path)
+    registry = ModelRegistry(str(path), check_interval=0)
+
+    first = registry.get()
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert registry.get() is first
+
+    replacement = tmp_path / 'replacement.pkl'
+    with open(BUNDLE_PATH, 'rb') as source, open(replacement, 'wb') as target:
+        target.write(source.read() + b'\n')
+    os.replace(replacement, path)
+
+    second = registry.get()
+
+    assert second is not first
+    assert second.version != first.version
+    assert registry.stats()['loads'] == 2
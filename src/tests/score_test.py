@@ -0,0 +1,85 @@
+"""
+Test script for the offline bulk scoring command.
+
+Checks that scoring in worker processes gives the same predictions as scoring
+in the current process, CSV and Parquet input and output, empty input files
+and the validation of the command-line arguments.
+"""
+
+import pandas as pd
+import pytest
+
+from score import main, score_file
+
+TRAIN_PATH = './src/data/train.csv'
+BUNDLE_PATH = './src/ml/titanic_model_bundle.pkl'
+
+
+def test_workers_match_serial_scoring(tmp_path):
+    """
+    Test that scoring with two worker processes matches scoring in process.
+
+    Raises:
+        AssertionError: If the row count, the order or a prediction differs.
+    """
+
+    serial, parallel = tmp_path / 'serial.csv', tmp_path / 'parallel.csv'
+
+    rows = score_file(TRAIN_PATH, str(serial), 100, 1, BUNDLE_PATH)
+    main([TRAIN_PATH, str(parallel), '--chunk-size', '100', '--workers', '2',
+          '--bundle', BUNDLE_PATH])
+
+    expected = pd.read_csv(serial)
+    assert rows == len(expected) == 891
+    assert list(expected['PassengerId']) == list(range(1, 892))
+    pd.testing.assert_frame_equal(pd.read_csv(parallel), expected)
+
+
+def test_parquet_input_and_output(tmp_path):
+    """
+    Test that Parquet files are scored like CSV files.
+
+    Raises:
+        AssertionError: If the Parquet predictions differ from the CSV ones.
+    """
+
+    pytest.importorskip('pyarrow')
+    parquet_input = tmp_path / 'train.parquet'
+    pd.read_csv(TRAIN_PATH).to_parquet(parquet_input)
+
+    score_file(TRAIN_PATH, str(tmp_path / 'expected.csv'), 300, 1, BUNDLE_PATH)
+    score_file(str(parquet_input), str(tmp_path / 'predictions.parquet'), 300, 1, BUNDLE_PATH)
+
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / 'predictions.parquet'),
+                                  pd.read_csv(tmp_path / 'expected.csv'))
+
+
+def test_empty_input(tmp_path):
+    """
+    Test that an input without rows gives an output with only the header.
+
+    Raises:
+        AssertionError: If the output is missing or holds rows.
+    """
+
+    empty_input, output = tmp_path / 'empty.csv', tmp_path / 'predictions.csv'
+    pd.read_csv(TRAIN_PATH, nrows=0).drop(columns='Survived').to_csv(empty_input, index=False)
+
+    for workers in (1, 2):
+        assert score_file(str(empty_input), str(output), 100, workers, BUNDLE_PATH) == 0
+        assert output.read_text().splitlines() == ['PassengerId,Survived']
+
+
+@pytest.mark.parametrize('argument', [['--chunk-size', '0'], ['--chunk-size', 'ten'],
+                                      ['--workers', '-1']])
+def test_invalid_arguments(tmp_path, argument):
+    """
+    Test that invalid chunk sizes and worker counts are rejected by the parser.
+
+    Raises:
+        AssertionError: If the command does not exit with a usage error.
+    """
+
+    with pytest.raises(SystemExit) as error:
+        main([TRAIN_PATH, str(tmp_path / 'predictions.csv'), *argument])
+    assert error.value.code == 2
@@ -0,0 +1,89 @@
+"""
+Test script for the start-up profile.
+"""
+
+import builtins
+import sys
+
+import pytest
+
+from app import create_app
+from startup_profile import StartupProfile
+
+
+def test_profile_times_stages_and_imports(tmp_path, monkeypatch):
+    """
+    Test that stages and first-time imports are timed, and nothing else.
+
+    Steps:
+    - Import a fresh module that imports another fresh module, inside a stage.
+    - Import an already loaded module.
+    - Check the recorded timings and that `__import__` is restored.
+
+    Raises:
+        AssertionError: If a timing is missing, wrong or unexpected.
+    """
+
+    (tmp_path / 'profiled_outer.py').write_text('import time\nimport profiled_inner\n')
+    (tmp_path / 'profiled_inner.py').write_text('import time\ntime.sleep(0.02)\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    original_import = builtins.__import__
+    profile = StartupProfile(enabled=True)
+    profile.start()
+    with profile.stage('import'):
+        import profiled_outer  # noqa: F401  pylint: disable=import-outside-toplevel,unused-import
+    profile.stop()
+
+    assert builtins.__import__ is original_import
+    assert [name for name, _ in profile.stages] == ['import']
+    assert set(profile.imports) == {'profiled_outer', 'profiled_inner'}
+
+    outer_inclusive, outer_self = profile.imports['profiled_outer']
+    inner_inclusive, inner_self = profile.imports['profiled_inner']
+    assert inner_inclusive >= 0.02 and inner_self == inner_inclusive
+    assert outer_inclusive >= inner_inclusive
+    assert abs(outer_self - (outer_inclusive - inner_inclusive)) < 1e-9
+    assert 'profiled_outer' in profile.report()
+
+    del sys.modules['profiled_outer'], sys.modules['profiled_inner']
+
+
+def test_disabled_profile_does_nothing():
+    """
+    Test that a disabled profile neither wraps imports nor records stages.
+
+    Raises:
+        AssertionError: If anything is recorded.
+    """
+
+    original_import = builtins.__import__
+    profile = StartupProfile(enabled=False)
+    profile.start()
+    assert builtins.__import__ is original_import
+    with profile.stage('stage'):
+        pass
+    profile.stop()
+
+    assert profile.stages == [] and profile.imports == {}
+
+
+def test_failed_start_up_stops_the_profile(monkeypatch):
+    """
+    Test that `create_app` stops the profile when a start-up stage raises.
+
+    Raises:
+        AssertionError: If the error is swallowed or `__import__` stays wrapped.
+    """
+
+    def failing_init_db(app):
+        raise RuntimeError('database unavailable')
+
+    original_import = builtins.__import__
+    monkeypatch.setattr('app.STARTUP_PROFILE', True)
+    monkeypatch.setattr('database.db_setup.init_db', failing_init_db)
+
+    with pytest.raises(RuntimeError, match='database unavailable'):
+        create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+
+    assert builtins.__import__ is original_import
@@ -0,0 +1,126 @@
+"""
+Test script for the model training pipeline.
+
+Checks that the preprocessing artifacts rebuilt from train.csv match the ones
+of the published bundle, that the rows of the test dataset are left out of the
+training set, that a model trained with the labeled passengers is
+published and hot-swapped by the model registry, and that a model below the
+accuracy gate is not published.
+"""
+
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from business.passenger_business import create_passengers, passenger_row
+from database.db_setup import db
+from ml.pipeline import Pipeline
+from ml.registry import ModelRegistry
+from ml.training import (
+    ModelRejectedError,
+    build_preprocessor,
+    load_training_dataset,
+    train,
+)
+from repositories.passenger_repository import insert_passengers
+from tests.passenger_repository_test import PASSENGERS
+
+BUNDLE_PATH = './src/ml/titanic_model_bundle.pkl'
+TEST_PATH = './src/data/test_dataset_titanic.csv'
+
+
+def test_preprocessor_matches_published_bundle():
+    """
+    Test that the artifacts rebuilt from train.csv match the published bundle,
+    which the MVP notebook fitted on the whole file.
+
+    Raises:
+        AssertionError: If an artifact differs from the published one.
+    """
+
+    published = Pipeline().load_pipeline(BUNDLE_PATH)['preprocessor']
+    dataset, database_rows = load_training_dataset(include_test=True)
+    pp, features = build_preprocessor(dataset)
+    pp['scaler'].fit(features)
+
+    assert database_rows == 0
+    assert pp['age_medians'].equals(published['age_medians'])
+    assert pp['age_medians_overall'].equals(published['age_medians_overall'])
+    assert pp['embarked_mode_pclass1'] == published['embarked_mode_pclass1']
+    assert pp['embarked_cols'] == published['embarked_cols']
+    assert list(pp['sex_encoder'].classes_) == list(published['sex_encoder'].classes_)
+    assert list(pp['scaler'].feature_names_in_) == list(published['scaler'].feature_names_in_)
+    assert np.allclose(pp['scaler'].mean_, published['scaler'].mean_)
+    assert np.allclose(pp['scaler'].scale_, published['scaler'].scale_)
+
+
+def test_test_rows_left_out_of_training():
+    """
+    Test that the training set and the test dataset do not overlap.
+
+    Raises:
+        AssertionError: If a row of the test dataset is trained on, or a row of
+        train.csv outside of it is left out.
+    """
+
+    dataset, _ = load_training_dataset()
+    full_dataset, _ = load_training_dataset(include_test=True)
+    assert full_dataset['Name'].is_unique
+
+    held_out = ~full_dataset['Name'].isin(dataset['Name'])
+    _, features = build_preprocessor(full_dataset)
+    held_out_rows = features[held_out].assign(Survived=full_dataset.loc[held_out, 'Survived'])
+    test_rows = pd.read_csv(TEST_PATH)
+
+    assert len(dataset) + len(test_rows) == len(full_dataset)
+    assert list(held_out_rows.columns) == list(test_rows.columns)
+    assert sorted(map(tuple, held_out_rows.to_numpy(dtype=float))) == \
+        sorted(map(tuple, test_rows.to_numpy(dtype=float)))
+
+
+def test_training_publishes_hot_swapped_bundle(db_app, tmp_path):
+    """
+    Test that a model trained with the labeled passengers replaces the bundle.
+
+    Steps:
+    - Store passengers scored by the model and passengers with a known outcome,
+      and load a copy of the published bundle in a registry.
+    - Train into the copy, reading the passengers in chunks of one row.
+    - Train again with an unreachable accuracy gate.
+
+    Raises:
+        AssertionError: If the labeled passengers are not used, if predicted
+        ones are, if the registry does not pick up the new bundle, or if a
+        rejected model is published.
+    """
+
+    create_passengers(PASSENGERS)
+    labeled = [passenger_row(passenger, survived) for passenger, survived
+               in zip(PASSENGERS[:2], (True, False))]
+    insert_passengers(labeled, returning_ids=False)
+    db.session.commit()
+    database_url = db.engine.url.render_as_string(hide_password=False)
+
+    _, predicted_rows = load_training_dataset(database_url=database_url,
+                                              include_predicted=True)
+    assert predicted_rows == len(PASSENGERS) + len(labeled)
+
+    output = str(tmp_path / 'bundle.pkl')
+    shutil.copyfile(BUNDLE_PATH, output)
+    registry = ModelRegistry(output, check_interval=0)
+    previous_version = registry.get().version
+
+    report = train(output, database_url, chunk_size=1)
+
+    assert report.published and report.accuracy >= 0.8
+    assert report.database_rows == len(labeled)
+    assert report.rows == 891 - len(pd.read_csv(TEST_PATH)) + len(labeled)
+    assert report.peak_memory_bytes > 0
+    assert registry.get().version != previous_version
+
+    published_version = registry.get().version
+    with pytest.raises(ModelRejectedError):
+        train(output, None, min_accuracy=1.01)
+    assert registry.get().version == published_version
@@ -0,0 +1,49 @@
+"""
+Test script for the start-up warm-up and its readiness status.
+"""
+
+from business.warmup import WarmUp
+from ml.registry import model_registry
+
+
+def test_warmup_marks_application_ready(db_app):
+    """
+    Test that a successful warm-up makes the application ready.
+
+    Raises:
+        AssertionError: If the status is wrong before or after the warm-up.
+    """
+
+    warmup = WarmUp(db_app)
+    assert warmup.status()['status'] == 'warming_up'
+    assert not warmup.status()['ready']
+
+    warmup.run()
+
+    status = warmup.status()
+    assert status['ready'] and status['status'] == 'ok'
+    assert status['model_version'] == model_registry.get().version
+    assert status['model_load_seconds'] is not None
+    assert set(status['steps']) == {'model', 'prediction', 'database'}
+    assert status['warmup_seconds'] >= sum(status['steps'].values())
+
+
+def test_failed_warmup_is_not_ready(db_app, monkeypatch):
+    """
+    Test that a failing warm-up step leaves the application not ready.
+
+    Raises:
+        AssertionError: If the failure is not reported.
+    """
+
+    def broken_registry():
+        raise OSError('bundle not found')
+
+    monkeypatch.setattr(WarmUp, '_model_registry', staticmethod(broken_registry))
+
+    warmup = WarmUp(db_app)
+    warmup.run()
+
+    assert not warmup.ready
+    assert warmup.status()['status'] == 'failed'
+    assert warmup.status()['error'] == 'OSError: bundle not found'